@@ -0,0 +1,68 @@
+"""
+Benchmark for the Databricks Workspace identity index.
+Builds a synthetic workspace with 100k users and 10k groups and compares the
+indexed Workspace lookups against the previous linear list scans.
+Usage:
+    python benchmarks/databricks_identity_index.py [lookups]
+"""
+import random
+import sys
+import time
+
+from policyweaver.plugins.databricks.model import (
+    DatabricksGroup, DatabricksServicePrincipal, DatabricksUser, Workspace
+)
+
+USERS = 100_000
+GROUPS = 10_000
+SERVICE_PRINCIPALS = 1_000
+
+def build_workspace() -> Workspace:
+    users = [DatabricksUser(id=f"u{i}", name=f"user {i}", email=f"user{i}@contoso.com")
+             for i in range(USERS)]
+    service_principals = [DatabricksServicePrincipal(id=f"s{i}", name=f"spn {i}", application_id=f"app-{i}")
+                          for i in range(SERVICE_PRINCIPALS)]
+    groups = [DatabricksGroup(id=f"g{i}", name=f"group {i}", members=[])
+              for i in range(GROUPS)]
+
+    return Workspace(users=users, service_principals=service_principals, groups=groups)
+
+def linear_lookups(workspace: Workspace, emails, app_ids, group_names) -> None:
+    for email in emails:
+        list(filter(lambda u: u.email == email, workspace.users))
+    for app_id in app_ids:
+        list(filter(lambda s: s.application_id == app_id, workspace.service_principals))
+    for name in group_names:
+        list(filter(lambda g: g.name == name, workspace.groups))
+
+def indexed_lookups(workspace: Workspace, emails, app_ids, group_names) -> None:
+    for email in emails:
+        workspace.lookup_user_by_email(email)
+    for app_id in app_ids:
+        workspace.lookup_service_principal_by_id(app_id)
+    for name in group_names:
+        workspace.lookup_group_by_name(name)
+
+def timed(label: str, fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:>10.4f}s")
+    return elapsed
+
+def main(lookups: int) -> None:
+    rng = random.Random(42)
+    workspace = build_workspace()
+
+    emails = [f"user{rng.randrange(USERS)}@contoso.com" for _ in range(lookups)]
+    app_ids = [f"app-{rng.randrange(SERVICE_PRINCIPALS)}" for _ in range(lookups)]
+    group_names = [f"group {rng.randrange(GROUPS)}" for _ in range(lookups)]
+
+    print(f"{USERS} users, {GROUPS} groups, {SERVICE_PRINCIPALS} service principals, {lookups} lookups per kind")
+    linear = timed("linear scan", linear_lookups, workspace, emails, app_ids, group_names)
+    indexed = timed("indexed (incl. first build)", indexed_lookups, workspace, emails, app_ids, group_names)
+    timed("indexed (warm)", indexed_lookups, workspace, emails, app_ids, group_names)
+    print(f"speedup: {linear / indexed:.1f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,61 @@
+"""
+Benchmark for the Databricks column mask and row filter routine parser.
+Parses a corpus of column mask and row filter definitions in the shapes Unity Catalog
+returns them, repeated the way a catalog reuses a few functions across many columns,
+and compares parsing without the cache against the cached parser.
+Usage:
+    python benchmarks/databricks_routine_parser.py [definitions]
+"""
+import random
+import sys
+import time
+
+from policyweaver.plugins.databricks.parser import DatabricksRoutineParser
+
+COLUMN_MASKS = [
+    ("CASE WHEN is_account_group_member('hr_admins') THEN ssn ELSE '***-**-****' END", "ssn"),
+    ("CASE\n  WHEN is_account_group_member('finance') THEN salary\n  ELSE NULL\nEND", "salary"),
+    ("CASE WHEN IS_ACCOUNT_GROUP_MEMBER(\"contractors\") THEN '[REDACTED]' ELSE email END", "email"),
+    ("CASE WHEN is_account_group_member('support') THEN phone ELSE 'XXX-XXX-XXXX' END", "phone"),
+    ("CASE WHEN is_account_group_member('pii_readers') THEN `date_of_birth` ELSE '1900-01-01' END", "date_of_birth"),
+    ("CASE WHEN is_account_group_member('auditors') THEN sha2(account_number, 256) ELSE '****' END", "account_number"),
+]
+
+ROW_FILTERS = [
+    "IF(IS_ACCOUNT_GROUP_MEMBER('admins'), true, region = 'US')",
+    "IF(is_account_group_member('emea_sales'), region IN ('DE', 'FR', 'UK'), false)",
+    "CASE WHEN is_account_group_member('admins') THEN true\n"
+    "     WHEN is_account_group_member('emea') THEN region = 'EMEA'\n"
+    "     WHEN is_account_group_member('apac') THEN region = 'APAC'\n"
+    "     ELSE false END",
+    "CASE WHEN is_account_group_member('managers') THEN true ELSE department_id = 42 END",
+]
+
+def parse_corpus(parser: DatabricksRoutineParser, masks, row_filters) -> None:
+    for definition, column in masks:
+        parser.parse_column_mask(definition, column)
+    for definition in row_filters:
+        parser.parse_row_filter(definition)
+
+def timed(label: str, fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:>10.4f}s")
+    return elapsed
+
+def main(definitions: int) -> None:
+    rng = random.Random(42)
+    masks = [rng.choice(COLUMN_MASKS) for _ in range(definitions)]
+    row_filters = [rng.choice(ROW_FILTERS) for _ in range(definitions)]
+
+    print(f"{definitions} column masks and {definitions} row filters "
+          f"from {len(COLUMN_MASKS) + len(ROW_FILTERS)} distinct definitions")
+    uncached = timed("uncached", parse_corpus, DatabricksRoutineParser(maxsize=0), masks, row_filters)
+    cached = timed("cached", parse_corpus, DatabricksRoutineParser(), masks, row_filters)
+    print(f"uncached throughput: {2 * definitions / uncached:,.0f} definitions/s")
+    print(f"cached throughput:   {2 * definitions / cached:,.0f} definitions/s")
+    print(f"speedup: {uncached / cached:.1f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,60 @@
+"""
+Benchmark for the Snowflake masking and row access policy parser.
+Parses a corpus of policy references in the shapes ACCOUNT_USAGE.POLICY_REFERENCES returns them,
+where a few policies are attached to many columns and tables, and compares parsing without
+the cache against the cached parser.
+Usage:
+    python benchmarks/snowflake_policy_parser.py [references]
+"""
+import random
+import sys
+import time
+
+from policyweaver.plugins.snowflake.parser import SnowflakePolicyParser
+
+MASKING_POLICIES = [
+    (1, "CASE WHEN CURRENT_ROLE() IN ('HR_ADMIN', 'PAYROLL') THEN val ELSE '***-**-****' END"),
+    (2, "CASE\n  WHEN CURRENT_ROLE() IN ('FINANCE')\n  THEN val\n  ELSE NULL\nEND"),
+    (3, "case when current_role() = 'CONTRACTOR' then '[REDACTED]' else val end"),
+    (4, "CASE WHEN CURRENT_ROLE() IN ('SUPPORT', 'SUPPORT_LEAD', 'SUPPORT_ADMIN') THEN val ELSE 'XXX-XXX-XXXX' END"),
+    (5, "CASE WHEN CURRENT_ROLE() IN ('AUDITOR') THEN sha2(val) ELSE '****' END"),
+]
+
+ROW_ACCESS_POLICIES = [
+    (11, "current_role() in ('READER', 'WRITER', 'ADMIN')"),
+    (12, "CURRENT_ROLE() = ('SYSADMIN')"),
+    (13, "CASE WHEN current_role() IN ('ADMIN') THEN true\n"
+         "     WHEN current_role() IN ('EMEA_SALES', 'EMEA_MGMT') THEN region = 'EMEA'\n"
+         "     WHEN current_role() IN ('APAC_SALES') THEN region = 'APAC'\n"
+         "     ELSE false END"),
+    (14, "CASE WHEN current_role() IN ('MANAGER') THEN true ELSE department_id = 42 END"),
+]
+
+def parse_corpus(parser: SnowflakePolicyParser, masks, row_access_policies) -> None:
+    for policy_id, body in masks:
+        parser.parse_masking_policy(body, policy_id)
+    for policy_id, body in row_access_policies:
+        parser.parse_row_access_policy(body, policy_id)
+
+def timed(label: str, fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:>10.4f}s")
+    return elapsed
+
+def main(references: int) -> None:
+    rng = random.Random(42)
+    masks = [rng.choice(MASKING_POLICIES) for _ in range(references)]
+    row_access_policies = [rng.choice(ROW_ACCESS_POLICIES) for _ in range(references)]
+
+    print(f"{references} masking policy and {references} row access policy references "
+          f"to {len(MASKING_POLICIES) + len(ROW_ACCESS_POLICIES)} distinct policies")
+    uncached = timed("uncached", parse_corpus, SnowflakePolicyParser(maxsize=0), masks, row_access_policies)
+    cached = timed("cached", parse_corpus, SnowflakePolicyParser(), masks, row_access_policies)
+    print(f"uncached throughput: {2 * references / uncached:,.0f} policies/s")
+    print(f"cached throughput:   {2 * references / cached:,.0f} policies/s")
+    print(f"speedup: {uncached / cached:.1f}x")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
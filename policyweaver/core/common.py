@@ -1,11 +1,11 @@
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Tuple
 import os
 import json
 import logging
 
 from policyweaver.models.export import PolicyExport
-from policyweaver.models.config import SourceMap
+from policyweaver.models.config import FabricConfig, SourceMap
 from policyweaver.core.enum import PolicyWeaverConnectorType
 
 class classproperty(property):
@@ -59,6 +59,27 @@ class PolicyWeaverCore:
         """
         pass
 
+    def map_mirror_policies(self, policy_mapping: str = "table_based") -> List[Tuple[FabricConfig, PolicyExport]]:
+        """
+        Map policies from the configured source to the Fabric mirrors they are applied to.
+        Connectors that export several sources in one run override this to return one export per mirror.
+        Args:
+            policy_mapping (str, optional): The policy mapping, table_based or role_based. Defaults to "table_based".
+        Returns:
+            List[Tuple[FabricConfig, PolicyExport]]: The configured Fabric mirror with the export of map_policy,
+                or an empty list if there are no policies to apply.
+        """
+        policy_export = self.map_policy(policy_mapping)
+
+        return [(self.config.fabric, policy_export)] if policy_export else []
+
+    def on_sync_complete(self) -> None:
+        """
+        Called after the mapped policies were applied to Fabric successfully.
+        Connectors can override this to record the state of a successful run.
+        """
+        pass
+
 class SnapshotExport:
     """
     A class to handle the export of snapshots to a specified directory.
@@ -0,0 +1,136 @@
+from typing import Callable, Dict, Hashable, Iterable, List
+
+class TransitiveClosure:
+    """
+    Memoized, cycle-safe transitive closure over a directed graph.
+    The graph is described as an adjacency map of node -> ordered direct successors.
+    Strongly connected components are resolved with an iterative Tarjan pass, so each
+    node's closure is computed exactly once, shared subgraphs are never re-expanded and
+    cyclic nesting terminates. Nodes within the same cycle share the same closure.
+    The closure of a node lists the closure of each expandable successor followed by the
+    successor itself, in adjacency order and without duplicates.
+    Example usage:
+        closure = TransitiveClosure({"a": ["b", "x"], "b": ["c"]})
+        closure.get("a")  # ["c", "b", "x"]
+    """
+    def __init__(self, edges: Dict[Hashable, Iterable[Hashable]],
+                 expand: Callable[[Hashable], bool] = None) -> None:
+        """
+        Initializes the closure with the adjacency map of the graph.
+        Args:
+            edges (Dict[Hashable, Iterable[Hashable]]): The direct successors of each node.
+            expand (Callable[[Hashable], bool], optional): Predicate deciding whether a successor
+                is traversed further. Defaults to traversing every node present in edges.
+        """
+        self.edges = edges
+        self.expand = expand if expand else lambda node: node in self.edges
+        self.__closures = {}
+
+    def get(self, node: Hashable) -> List[Hashable]:
+        """
+        Returns the transitive successors of a node, resolving them on first access.
+        Args:
+            node (Hashable): The node to resolve.
+        Returns:
+            List[Hashable]: The ordered, de-duplicated transitive successors of the node.
+        """
+        if node not in self.__closures:
+            self.__resolve__(node)
+
+        return self.__closures[node]
+
+    def get_all(self) -> Dict[Hashable, List[Hashable]]:
+        """
+        Resolves the closure of every node in the adjacency map.
+        Returns:
+            Dict[Hashable, List[Hashable]]: A map of node -> transitive successors.
+        """
+        return {node: self.get(node) for node in self.edges}
+
+    def __successors__(self, node: Hashable) -> Iterable[Hashable]:
+        """
+        Returns the direct successors of a node.
+        Args:
+            node (Hashable): The node to look up.
+        Returns:
+            Iterable[Hashable]: The direct successors, or an empty tuple for unknown nodes.
+        """
+        return self.edges.get(node) or ()
+
+    def __resolve__(self, root: Hashable) -> None:
+        """
+        Runs an iterative Tarjan pass from the root over all unresolved reachable nodes
+        and memoizes the closure of every strongly connected component it completes.
+        Args:
+            root (Hashable): The node to start the traversal from.
+        """
+        index = {root: 0}
+        low = {root: 0}
+        stack = [root]
+        on_stack = {root}
+        work = [(root, iter(self.__successors__(root)))]
+
+        while work:
+            node, successors = work[-1]
+            descended = False
+
+            for succ in successors:
+                if succ in self.__closures or not self.expand(succ):
+                    continue
+
+                if succ not in index:
+                    index[succ] = low[succ] = len(index)
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(self.__successors__(succ))))
+                    descended = True
+                    break
+
+                if succ in on_stack:
+                    low[node] = min(low[node], index[succ])
+
+            if descended:
+                continue
+
+            work.pop()
+
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+
+                self.__close_component__(list(reversed(component)))
+
+    def __close_component__(self, component: List[Hashable]) -> None:
+        """
+        Computes and stores the shared closure of a strongly connected component.
+        All successors outside the component are already resolved at this point.
+        Args:
+            component (List[Hashable]): The nodes of the component in discovery order.
+        """
+        members = set(component)
+        closure = []
+        seen = set()
+
+        for node in component:
+            for succ in self.__successors__(node):
+                if succ not in members and self.expand(succ):
+                    for transitive in self.__closures[succ]:
+                        if transitive not in seen:
+                            seen.add(transitive)
+                            closure.append(transitive)
+
+                if succ not in seen:
+                    seen.add(succ)
+                    closure.append(succ)
+
+        for node in component:
+            self.__closures[node] = closure
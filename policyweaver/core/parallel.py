@@ -0,0 +1,68 @@
+import logging
+import multiprocessing
+import threading
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List
+
+# Set in each worker process by the pool initializer, never in the parent process.
+_worker_build = None
+
+def _init_worker(build: Callable) -> None:
+    """
+    Stores the build function in a forked worker process.
+    Args:
+        build (Callable): The function applied to each item.
+    """
+    global _worker_build
+    _worker_build = build
+
+def _run_worker_task(item):
+    """
+    Applies the build function of the worker process to an item.
+    Args:
+        item: The item to build.
+    Returns:
+        The result of the build function.
+    """
+    return _worker_build(item)
+
+def fork_map(build: Callable, items: List[Any], workers: int) -> List:
+    """
+    Applies a build function to every item across a pool of forked processes.
+    The workers inherit the state the build function reads from the fork, so it is shared
+    copy-on-write and only the items and the results cross the process boundary. Results
+    are returned in item order. The build runs serially for a single worker or item, where
+    the fork start method is not available, and while other Python threads are running in
+    the process, since forking a multi-threaded process can deadlock the workers. Threads
+    started by native libraries are not visible to this check, the interpreter warns about
+    them when the workers are forked.
+    Example usage:
+        results = fork_map(lambda name: weaver.build_policy(name), names, workers=4)
+    Args:
+        build (Callable): Builds the result of a single item. It is handed to the workers
+            through the fork and does not need to be picklable, the items and results do.
+        items (List[Any]): The items to build.
+        workers (int): The number of worker processes.
+    Returns:
+        List: The result of each item, in the order given.
+    """
+    logger = logging.getLogger("POLICY_WEAVER")
+
+    if not workers or workers <= 1 or len(items) <= 1:
+        return [build(item) for item in items]
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        logger.warning("Parallel build requires the fork start method, building serially.")
+        return [build(item) for item in items]
+
+    if threading.active_count() > 1:
+        logger.warning(f"Parallel build skipped, {threading.active_count() - 1} other threads are running. Building serially.")
+        return [build(item) for item in items]
+
+    logger.info(f"Building {len(items)} items with {workers} processes...")
+    chunksize = max(1, len(items) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"),
+                             initializer=_init_worker, initargs=(build,)) as executor:
+        return list(executor.map(_run_worker_task, items, chunksize=chunksize))
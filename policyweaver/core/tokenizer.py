@@ -0,0 +1,221 @@
+import hashlib
+import re
+import threading
+
+from collections import OrderedDict
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+_TOKEN_PATTERN = re.compile(r"""
+    \s+
+    | (?P<string>'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*")
+    | (?P<ident>`[^`]*`|[A-Za-z_][A-Za-z0-9_.]*)
+    | (?P<punct>[(),])
+    | (?P<other>[^\s'"`(),A-Za-z_]+)
+    | (?P<error>.)
+    """, re.VERBOSE)
+
+_LINE_BREAK_PATTERN = re.compile(r"[\r\n]")
+
+class Token(NamedTuple):
+    """
+    A lexical token of a SQL routine definition.
+    Attributes:
+        kind (str): The token kind (string, ident, punct or other).
+        value (str): The token text as written in the definition.
+        start (int): The offset of the token in the definition.
+        end (int): The offset just past the token in the definition.
+    """
+    kind: str
+    value: str
+    start: int
+    end: int
+
+    def is_keyword(self, keyword: str) -> bool:
+        """
+        Checks if the token is the given SQL keyword, ignoring case.
+        Args:
+            keyword (str): The upper-case keyword.
+        Returns:
+            bool: True if the token is the keyword, False otherwise.
+        """
+        return self.kind == "ident" and self.value.upper() == keyword
+
+    def is_punct(self, punct: str) -> bool:
+        """
+        Checks if the token is the given punctuation character.
+        Args:
+            punct (str): The punctuation character.
+        Returns:
+            bool: True if the token is the punctuation, False otherwise.
+        """
+        return self.kind == "punct" and self.value == punct
+
+class RoutineParseError(ValueError):
+    """
+    Raised when a routine definition does not follow a supported pattern.
+    """
+    pass
+
+class TokenStream:
+    """
+    A cursor over the tokens of a routine definition, shared by the routine and policy parsers.
+    Example usage:
+        stream = TokenStream.open("CASE WHEN is_account_group_member('hr') THEN ssn ELSE '***' END")
+        stream.expect_keyword("CASE")
+    """
+    def __init__(self, text: str, tokens: List[Token]) -> None:
+        """
+        Initializes the stream.
+        Args:
+            text (str): The normalized routine definition.
+            tokens (List[Token]): The tokens of the definition.
+        """
+        self.text = text
+        self.tokens = tokens
+        self.position = 0
+
+    @staticmethod
+    def open(sql_definition: str) -> "TokenStream":
+        """
+        Tokenizes a definition, with line breaks normalized to spaces.
+        Args:
+            sql_definition (str): The routine definition.
+        Returns:
+            TokenStream: A stream positioned at the first token.
+        """
+        text = _LINE_BREAK_PATTERN.sub(" ", sql_definition)
+        return TokenStream(text, tokenize(text))
+
+    def peek(self) -> Optional[Token]:
+        """Returns the next token without consuming it, or None at the end."""
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def next(self) -> Token:
+        """Consumes and returns the next token."""
+        token = self.peek()
+        if token is None:
+            raise RoutineParseError("Unexpected end of definition.")
+        self.position += 1
+        return token
+
+    def expect_keyword(self, keyword: str) -> Token:
+        """Consumes the next token, which must be the given keyword."""
+        token = self.next()
+        if not token.is_keyword(keyword):
+            raise RoutineParseError(f"Expected '{keyword}' but found '{token.value}'.")
+        return token
+
+    def expect_punct(self, punct: str) -> Token:
+        """Consumes the next token, which must be the given punctuation."""
+        token = self.next()
+        if not token.is_punct(punct):
+            raise RoutineParseError(f"Expected '{punct}' but found '{token.value}'.")
+        return token
+
+    def read_expression(self, is_terminator: Callable[[Token], bool]) -> List[Token]:
+        """
+        Reads the tokens of an expression up to a terminator at parenthesis depth zero.
+        The terminator itself is not consumed.
+        Args:
+            is_terminator (Callable[[Token], bool]): Decides whether a token ends the expression.
+        Returns:
+            List[Token]: The tokens of the expression.
+        """
+        expression = []
+        depth = 0
+
+        while True:
+            token = self.peek()
+            if token is None:
+                raise RoutineParseError("Unexpected end of definition.")
+            if depth == 0 and is_terminator(token):
+                break
+            if token.is_punct("("):
+                depth += 1
+            elif token.is_punct(")"):
+                depth -= 1
+            expression.append(self.next())
+
+        if not expression:
+            raise RoutineParseError("Empty expression.")
+
+        return expression
+
+    def slice(self, expression: List[Token]) -> str:
+        """
+        Returns the text of an expression as written in the definition.
+        Args:
+            expression (List[Token]): The tokens of the expression.
+        Returns:
+            str: The expression text.
+        """
+        return self.text[expression[0].start:expression[-1].end].strip()
+
+def tokenize(sql_definition: str) -> List[Token]:
+    """
+    Splits a routine definition into tokens. Whitespace is dropped.
+    Args:
+        sql_definition (str): The routine definition.
+    Returns:
+        List[Token]: The tokens of the definition.
+    Raises:
+        RoutineParseError: If the definition contains an unterminated literal.
+    """
+    tokens = []
+
+    for match in _TOKEN_PATTERN.finditer(sql_definition):
+        kind = match.lastgroup
+        if kind is None:
+            continue
+        if kind == "error":
+            raise RoutineParseError(f"Unexpected character '{match.group()}' at {match.start()}.")
+        tokens.append(Token(kind, match.group(), match.start(), match.end()))
+
+    return tokens
+
+class ParseCache:
+    """
+    A thread-safe LRU cache of parse results, shared by the routine and policy parsers.
+    Results are keyed by the caller's key and a SHA-256 hash of the parsed text, so text
+    shared by many columns or tables is parsed once. Callers receive their own deep copy
+    of a cached pydantic result.
+    Example usage:
+        cache = ParseCache(maxsize=1024)
+        result = cache.get(("row_filter",), sql_definition, lambda: parse(sql_definition))
+    """
+    def __init__(self, maxsize: int = 1024) -> None:
+        """
+        Initializes the cache.
+        Args:
+            maxsize (int, optional): The maximum number of cached results, 0 disables the cache. Defaults to 1024.
+        """
+        self.maxsize = maxsize
+        self.__cache = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key: Tuple, text: str, parse: Callable[[], object]):
+        """
+        Returns a copy of the cached parse result of a text, parsing it on a cache miss.
+        Args:
+            key (Tuple): The caller's part of the cache key, e.g. the kind of the parsed text.
+            text (str): The parsed text, hashed into the cache key.
+            parse (Callable[[], object]): Parses the text on a cache miss.
+        Returns:
+            object: A copy of the parse result.
+        """
+        key = key + (hashlib.sha256(text.encode("utf-8")).hexdigest(),)
+
+        with self.__lock:
+            result = self.__cache.get(key)
+            if result is not None:
+                self.__cache.move_to_end(key)
+
+        if result is None:
+            result = parse()
+            if self.maxsize > 0:
+                with self.__lock:
+                    self.__cache[key] = result
+                    if len(self.__cache) > self.maxsize:
+                        self.__cache.popitem(last=False)
+
+        return result.model_copy(deep=True)
@@ -54,14 +54,16 @@ class CommonBaseModel(BaseModel):
         """
         Custom __getattr__ method to handle field aliases.
         This allows accessing model fields using their aliases.
+        Private attributes are resolved directly, since they never carry an alias.
         Args:
             item (str): The name of the attribute to access.
         Returns:
             Any: The value of the attribute if it exists, otherwise raises AttributeError.
         """
-        for field, meta in self.model_fields.items():
-            if meta.alias == item:
-                return getattr(self, field)
+        if not item.startswith("_"):
+            for field, meta in self.model_fields.items():
+                if meta.alias == item:
+                    return getattr(self, field)
         return super().__getattr__(item)
 
     def _get_alias(self, item_name):
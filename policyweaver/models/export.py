@@ -36,6 +36,15 @@ class PermissionObject(CommonBaseModel):
             return self.id
         return self.id
 
+    @property
+    def key(self) -> tuple:
+        """
+        Returns a hashable key identifying the IAM entity, used to deduplicate permission objects.
+        Returns:
+            tuple: The type and lookup identifier of the object.
+        """
+        return (self.type, self.lookup_id)
+
 class Permission(CommonBaseModel):
     """
     Represents a permission in the Policy Weaver application.
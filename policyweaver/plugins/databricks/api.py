@@ -1,30 +1,50 @@
 import logging
 import json
 import os
-import re
 from pydantic.json import pydantic_encoder
 
 from databricks.sdk import (
     WorkspaceClient, AccountClient
 )
-from typing import List, Dict, Any
+from typing import Callable, Dict, List
 from databricks.sdk.errors import NotFound
 from databricks.sdk.service.catalog import SecurableType
+from databricks.sdk.service.sql import StatementParameterListItem, StatementState
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 from policyweaver.models.config import (
     SourceSchema, Source
 )
 from policyweaver.plugins.databricks.model import (
-    DatabricksColumnMask, DatabricksRowFilter, ColumnMaskExtraction, RowFilterDetails, RowFilterDetailGroup, DatabricksUser, DatabricksServicePrincipal, DatabricksGroup,
+    DatabricksColumnMask, DatabricksRowFilter, DatabricksUser, DatabricksServicePrincipal, DatabricksGroup,
     DatabricksGroupMember, Account, RowFilterFunctionInfo, TableObject, Workspace, Catalog, Schema, Table,
     Function, FunctionMap, Privilege
 )
 from policyweaver.core.enum import (
-    ColumnMaskType, RowFilterType,
     IamType
 )
 
 from policyweaver.core.auth import ServicePrincipal
+from policyweaver.core.exception import PolicyWeaverError
+from policyweaver.core.graph import TransitiveClosure
+from policyweaver.plugins.databricks.parser import DatabricksRoutineParser
+
+class DatabricksGroupClosure(TransitiveClosure):
+    """
+    Transitive closure over SCIM groups that also holds the SCIM member references
+    of the groups, indexed by member ID, so members are resolved without re-scanning the groups.
+    """
+    def __init__(self, edges: Dict[str, List[str]], expand: Callable[[str], bool], member_refs: Dict[str, dict]) -> None:
+        """
+        Initializes the closure.
+        Args:
+            edges (Dict[str, List[str]]): The direct member IDs of each group ID.
+            expand (Callable[[str], bool]): Predicate deciding whether a member group is expanded.
+            member_refs (Dict[str, dict]): The first SCIM member reference seen for each member ID.
+        """
+        super().__init__(edges, expand)
+        self.member_refs = member_refs
 
 class DatabricksAPIClient:
     """
@@ -34,6 +54,20 @@ class DatabricksAPIClient:
     This class is designed to be used within the Policy Weaver framework to gather and map policies
     from Databricks workspaces and accounts.
     """
+    dbx_max_catalog_workers = 8
+    dbx_audit_change_query = """
+        SELECT COUNT(*) AS changes
+        FROM system.access.audit
+        WHERE event_time > :since
+          AND (action_name LIKE 'create%' OR action_name LIKE 'update%' OR action_name LIKE 'delete%'
+               OR action_name LIKE 'add%' OR action_name LIKE 'remove%')
+          AND ((service_name = 'unityCatalog'
+                AND (request_params['full_name_arg'] = :catalog OR request_params['full_name_arg'] LIKE :catalog_prefix
+                     OR request_params['securable_full_name'] = :catalog OR request_params['securable_full_name'] LIKE :catalog_prefix
+                     OR request_params['catalog_name'] = :catalog OR request_params['name'] = :catalog))
+               OR service_name = 'accounts')
+    """
+
     def __init__(self):
         """
         Initializes the Databricks API Client with account and workspace clients.
@@ -54,6 +88,7 @@ class DatabricksAPIClient:
                                                 azure_client_secret=ServicePrincipal.ClientSecret)
         
         self.row_filter_func_maps = []
+        self.routine_parser = DatabricksRoutineParser()
 
     def __get_account(self) -> Account:
         """
@@ -113,61 +148,95 @@ class DatabricksAPIClient:
         return service_principals
 
     @staticmethod
-    def get_members(group_id, dbx_groups):
-        dbx_group = dbx_groups.get(group_id)
-        if not dbx_group:
-            print("Group not found")
+    def get_group_closure(dbx_groups: Dict[str, dict]) -> DatabricksGroupClosure:
+        """
+        Builds the group-closure engine for a set of SCIM groups.
+        Nested groups are expanded once and shared by every group that contains them.
+        Groups synced from Entra (with an external ID) are kept as leaf members, and
+        cyclic nesting is resolved without recursion. The SCIM member references are
+        indexed by member ID in the same pass.
+        Args:
+            dbx_groups (Dict[str, dict]): The SCIM group payloads keyed by group ID.
+        Returns:
+            DatabricksGroupClosure: The closure over group ID -> transitive member IDs.
+        """
+        edges = dict()
+        member_refs = dict()
+
+        for group_id, dbx_group in dbx_groups.items():
+            member_ids = []
+
+            for member in dbx_group.get("members", []):
+                if "Groups" in member["$ref"]:
+                    subgroup = dbx_groups.get(member["value"])
+                    if subgroup and subgroup.get("externalId"):
+                        member["externalId"] = subgroup["externalId"]
+
+                member["byGroup"] = dbx_group["displayName"]
+                member_ids.append(member["value"])
+                member_refs.setdefault(member["value"], member)
+
+            edges[group_id] = member_ids
+
+        return DatabricksGroupClosure(
+            edges,
+            expand=lambda group_id: group_id in dbx_groups and not dbx_groups[group_id].get("externalId"),
+            member_refs=member_refs
+        )
+
+    def get_members(self, group_id, dbx_groups, closure: DatabricksGroupClosure = None) -> List[dict]:
+        """
+        Returns the transitive members of a group, nested members first.
+        Args:
+            group_id (str): The ID of the group to expand.
+            dbx_groups (Dict[str, dict]): The SCIM group payloads keyed by group ID.
+            closure (DatabricksGroupClosure, optional): A closure engine shared across calls.
+                Built on demand when not provided.
+        Returns:
+            List[dict]: The SCIM member references of the group.
+        """
+        if group_id not in dbx_groups:
+            self.logger.warning(f"DBX Group {group_id} not found.")
             return []
-        members = list()
-        if not ("members" in dbx_group):
-            return members
-
-        for member in dbx_group["members"]:
-            if "Groups" in member["$ref"]:
-                subgroup_id = member["value"]
-                subgroup = dbx_groups.get(subgroup_id)
-                if subgroup.get("externalId"):
-                    member["externalId"] = subgroup["externalId"]
-                else:
-                    sub_group_members = DatabricksAPIClient.get_members(member["value"], dbx_groups)
-                    members.extend(sub_group_members)
-        
-            member["byGroup"] = dbx_group["displayName"]
-            members.append(member)
-        return members
 
-    def __get_account_groups__(self) -> List[DatabricksGroup]:
+        if not closure:
+            closure = DatabricksAPIClient.get_group_closure(dbx_groups)
+
+        # a membership cycle leads back to the group itself, which is not its own member
+        return [closure.member_refs[member_id] for member_id in closure.get(group_id) if member_id != group_id]
+
+    def __get_groups__(self, dbx_groups: Dict[str, dict]) -> List[DatabricksGroup]:
         """
-        Retrieves the list of groups in the account.
+        Maps SCIM group payloads to DatabricksGroup objects with flattened memberships.
+        Shared by the account and workspace group paths so nested groups are expanded
+        once per run.
+        Args:
+            dbx_groups (Dict[str, dict]): The SCIM group payloads keyed by group ID.
         Returns:
-            List[DatabricksGroup]: A list of DatabricksGroup objects representing the groups in the account.
+            List[DatabricksGroup]: A list of DatabricksGroup objects.
         """
         groups = []
-        dbx_groups = dict()
-        for g in self.account_client.groups.list():
-            dbx_groups[g.id] = g.as_dict()
+        closure = DatabricksAPIClient.get_group_closure(dbx_groups)
 
         for g in dbx_groups.values():
             if g.get("externalId"):
                 group = DatabricksGroup(
-                id=g["id"],
-                name=g["displayName"],
-                members=[],
-                external_id=g["externalId"]
-            )
+                    id=g["id"],
+                    name=g["displayName"],
+                    members=[],
+                    external_id=g["externalId"]
+                )
             else:
-                members = DatabricksAPIClient.get_members(g["id"], dbx_groups)
-
                 group = DatabricksGroup(
                     id=g["id"],
                     name=g["displayName"],
                     members=[]
                 )
 
-                member_ids = list()
-                for m in members:
-                    if m["value"] in member_ids:
+                for member_id in closure.get(g["id"]):
+                    if member_id == g["id"]:
                         continue
+                    m = closure.member_refs[member_id]
 
                     gm = DatabricksGroupMember(
                             id=m["value"],
@@ -183,10 +252,23 @@ class DatabricksAPIClient:
                         gm.type = IamType.GROUP
 
                     group.members.append(gm)
-                    member_ids.append(m["value"])
 
             groups.append(group)
 
+        return groups
+
+    def __get_account_groups__(self) -> List[DatabricksGroup]:
+        """
+        Retrieves the list of groups in the account.
+        Returns:
+            List[DatabricksGroup]: A list of DatabricksGroup objects representing the groups in the account.
+        """
+        dbx_groups = dict()
+        for g in self.account_client.groups.list():
+            dbx_groups[g.id] = g.as_dict()
+
+        groups = self.__get_groups__(dbx_groups)
+
         self.logger.debug(f"DBX ACCOUNT Groups: {json.dumps(groups, default=pydantic_encoder, indent=4)}")
         return groups
     
@@ -211,6 +293,39 @@ class DatabricksAPIClient:
 
 
 
+    def get_catalog_change_count(self, catalog: str, since: datetime, warehouse_id: str) -> int:
+        """
+        Counts the Unity Catalog and identity change events recorded in system.access.audit since a point in time.
+        Create, update and delete actions on the catalog or any securable within it (including grants,
+        column masks and row filters) are counted, as well as account group and principal changes.
+        Args:
+            catalog (str): The name of the catalog.
+            since (datetime): The point in time to count changes from.
+            warehouse_id (str): The ID of the SQL warehouse used to query the system tables.
+        Returns:
+            int: The number of change events since the given time.
+        Raises:
+            PolicyWeaverError: If the audit query does not complete successfully.
+        """
+        response = self.workspace_client.statement_execution.execute_statement(
+            statement=self.dbx_audit_change_query,
+            warehouse_id=warehouse_id,
+            wait_timeout="50s",
+            parameters=[
+                StatementParameterListItem(name="catalog", value=catalog),
+                StatementParameterListItem(name="catalog_prefix", value=f"{catalog}.%"),
+                StatementParameterListItem(name="since", value=since.isoformat(), type="TIMESTAMP"),
+            ])
+
+        if not response.status or response.status.state != StatementState.SUCCEEDED:
+            state = response.status.state if response.status else None
+            raise PolicyWeaverError(f"DBX audit change query did not succeed (state: {state}).")
+
+        changes = int(response.result.data_array[0][0]) if response.result and response.result.data_array else 0
+        self.logger.debug(f"DBX WORKSPACE {changes} audit change events for {catalog} since {since.isoformat()}")
+
+        return changes
+
     def get_workspace_policy_map(self, source: Source) -> tuple[Account, Workspace]:
         """
         Fetches the workspace policy map for a given source.
@@ -221,32 +336,69 @@ class DatabricksAPIClient:
         Raises:
             NotFound: If the catalog specified in the source is not found in the workspace.
         """
-        try:
-            self.__account = self.__get_account()
-            api_catalog = self.workspace_client.catalogs.get(source.name)
+        account, workspace, catalogs = self.get_workspace_policy_maps([source])
 
-            self.logger.debug(f"DBX Policy Export for {api_catalog.name}...")
+        if not catalogs:
+            return None
 
-            self.__workspace = Workspace(
-                users=self.__account.users,
-                groups=self.__account.groups,
-                service_principals=self.__account.service_principals
-            )
+        workspace.catalog = catalogs[0]
+        return (account, workspace)
+
+    def get_workspace_policy_maps(self, sources: List[Source]) -> tuple[Account, Workspace, List[Catalog]]:
+        """
+        Fetches the policy maps of several catalogs in a single pass.
+        The account identities are fetched once and shared by all catalogs, and the catalogs
+        are crawled concurrently. Catalogs that are not found in the workspace are skipped.
+        Args:
+            sources (List[Source]): The sources, one per catalog, with their optional schema filters.
+        Returns:
+            Tuple[Account, Workspace, List[Catalog]]: The account, the workspace holding the account identities,
+                and the catalogs found, in the order of the sources.
+        """
+        self.__account = self.__get_account()
+        self.__workspace = Workspace(
+            users=self.__account.users,
+            groups=self.__account.groups,
+            service_principals=self.__account.service_principals
+        )
 
-            self.__workspace.catalog = Catalog(name=api_catalog.name,
-                                               column_masks=[], tables_with_masks=[],
-                                               row_filters=[], tables_with_rls=[])
-            self.__workspace.catalog.schemas = self.__get_catalog_schemas__(api_catalog.name, source.schemas)
-            self.__workspace.catalog.privileges = self.__get_privileges__(SecurableType.CATALOG.value, api_catalog.name)
+        workers = min(len(sources), self.dbx_max_catalog_workers)
 
-            #self.__workspace.catalog.row_filters = self.__get_functions__()
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                catalogs = list(executor.map(self.__get_catalog__, sources))
+        else:
+            catalogs = [self.__get_catalog__(source) for source in sources]
 
-            self.logger.debug(f"DBX WORKSPACE Policy Map for {api_catalog.name}: {json.dumps(self.__workspace, default=pydantic_encoder, indent=4)}")
-            return (self.__account, self.__workspace)
+        return (self.__account, self.__workspace, [c for c in catalogs if c])
+
+    def __get_catalog__(self, source: Source) -> Catalog:
+        """
+        Crawls a catalog with its schemas, tables, privileges, column masks and row filters.
+        Args:
+            source (Source): The source naming the catalog, with its optional schema filters.
+        Returns:
+            Catalog: The catalog, or None if it is not found in the workspace.
+        """
+        try:
+            api_catalog = self.workspace_client.catalogs.get(source.name)
         except NotFound:
-            self.logger.error(f"DBX WORKSPACE Catalog {source.name} not found in workspace {source.url}.")
+            self.logger.error(f"DBX WORKSPACE Catalog {source.name} not found in workspace {self.workspace_client.config.host}.")
             return None
 
+        self.logger.debug(f"DBX Policy Export for {api_catalog.name}...")
+
+        catalog = Catalog(name=api_catalog.name,
+                          column_masks=[], tables_with_masks=[],
+                          row_filters=[], tables_with_rls=[])
+        catalog.schemas = self.__get_catalog_schemas__(catalog, source.schemas)
+        catalog.privileges = self.__get_privileges__(SecurableType.CATALOG.value, api_catalog.name)
+
+        #catalog.row_filters = self.__get_functions__()
+
+        self.logger.debug(f"DBX WORKSPACE Policy Map for {api_catalog.name}: {json.dumps(catalog, default=pydantic_encoder, indent=4)}")
+        return catalog
+
     def __get_workspace_users__(self) -> List[DatabricksUser]:
         """
         Retrieves the list of users in the workspace.
@@ -294,50 +446,11 @@ class DatabricksAPIClient:
         Returns:
             List[DatabricksGroup]: A list of DatabricksGroup objects representing the groups in the workspace.
         """
-        groups = []
         dbx_groups = dict()
         for g in self.workspace_client.groups.list():
             dbx_groups[g.id] = g.as_dict()
 
-        for g in dbx_groups.values():
-            if g.get("externalId"):
-                group = DatabricksGroup(
-                id=g["id"],
-                name=g["displayName"],
-                members=[],
-                external_id=g["externalId"]
-            )
-            else:
-                members = DatabricksAPIClient.get_members(g["id"], dbx_groups)
-
-                group = DatabricksGroup(
-                    id=g["id"],
-                    name=g["displayName"],
-                    members=[]
-                )
-
-                member_ids = list()
-                for m in members:
-                    if m["value"] in member_ids:
-                        continue
-                    gm = DatabricksGroupMember(
-                            id=m["value"],
-                            name=m["display"],
-                            external_id=m.get("externalId")
-                        )
-
-                    if m["$ref"].find("Users") > -1:
-                        gm.type = IamType.USER
-                    elif m["$ref"].find("ServicePrincipals") > -1:
-                        gm.type = IamType.SERVICE_PRINCIPAL
-                    else:
-                        gm.type = IamType.GROUP
-
-                    group.members.append(gm)
-                    member_ids.append(m["value"])
-
-            
-            groups.append(group)
+        groups = self.__get_groups__(dbx_groups)
 
         self.logger.debug(f"DBX WORKSPACE Groups: {json.dumps(groups, default=pydantic_encoder, indent=4)}")
         return groups
@@ -375,15 +488,16 @@ class DatabricksAPIClient:
 
         return None
 
-    def __get_catalog_schemas__(self, catalog: str, schema_filters: List[SourceSchema]) -> List[Schema]:
+    def __get_catalog_schemas__(self, workspace_catalog: Catalog, schema_filters: List[SourceSchema]) -> List[Schema]:
         """
         Retrieves the schemas for a given catalog, applying any filters specified in the schema_filters.
         Args:
-            catalog (str): The name of the catalog to retrieve schemas from.
+            workspace_catalog (Catalog): The catalog to retrieve schemas from, collecting its column masks and row filters.
             schema_filters (List[SourceSchema]): A list of SourceSchema objects containing filters for schemas.
         Returns:
             List[Schema]: A list of Schema objects representing the schemas in the catalog.
         """
+        catalog = workspace_catalog.name
         api_schemas = self.workspace_client.schemas.list(catalog_name=catalog)
 
         if schema_filters:
@@ -400,7 +514,7 @@ class DatabricksAPIClient:
                 schema_filter = self.__get_schema_from_list__(schema_filters, s.name)
 
                 tbls = self.__get_schema_tables__(
-                    catalog=catalog,
+                    workspace_catalog=workspace_catalog,
                     schema=s.name,
                     table_filters=None if not schema_filters else schema_filter.tables,
                 )
@@ -422,164 +536,6 @@ class DatabricksAPIClient:
 
         return schemas
     
-    def __extract_group_from_mask_function__(self, sql_definition: str, column_name: str) -> ColumnMaskExtraction:
-        """
-        Extracts the group name and mask pattern from a column mask function definition.
-        
-        Args:
-            sql_definition (str): The SQL definition containing is_account_group_member function
-        Returns:
-            dict: Dictionary containing 'group_name' and 'mask_pattern', or None values if not found
-        """
-        result = ColumnMaskExtraction(column_mask_type=ColumnMaskType.UNSUPPORTED)
-                
-        definition = sql_definition.replace("\n", " ").replace("\r", " ").replace(" ", "")
-        if not(definition[:8] == "CASEWHEN" and definition[8:31].lower() == "is_account_group_member"):
-            self.logger.warning("Unexpected format: does not start with 'CASE WHEN is_account_group_member'")
-            return result
-        group_name = definition[32:].split(")")[0].replace("'", "").replace('"', '')
-        index_ = 32 + len(group_name) + 3
-        if definition[index_:index_+4] != "THEN":
-            self.logger.warning("Unexpected format: 'THEN' not found where expected.")
-            return result
-        split_ = definition[index_ + 4 : ].split("ELSE")
-
-        mask = None
-        column_name_pos = None
-        assigned_value = split_[0]
-        if assigned_value[0] in ["'", '"']:
-            assigned_value = assigned_value[1:-1]
-            mask = assigned_value
-        elif column_name == assigned_value:
-            column_name_pos = 1
-
-        unassigned_value = split_[1].replace("END", "")
-        if unassigned_value[0] in ["'", '"']:
-            unassigned_value = unassigned_value[1:-1]
-            mask = unassigned_value
-        elif column_name == unassigned_value:
-            column_name_pos = 2
-
-        result.group_name = group_name
-        result.mask_pattern = mask
-        if column_name_pos == 1:
-            result.column_mask_type = ColumnMaskType.UNMASK_FOR_GROUP
-        elif column_name_pos == 2:
-            result.column_mask_type = ColumnMaskType.MASK_FOR_GROUP
-        else:
-            result.column_mask_type = ColumnMaskType.UNSUPPORTED
-
-        
-        return result
-
-    def __extract_case_when_logic_row_filter__(self,sql_definition: str) -> RowFilterDetails:
-        """
-        Parse a CASE WHEN row filter definition to extract group memberships and their values.
-        
-        Args:
-            sql_definition: The SQL CASE statement from a row filter
-            
-        Returns:
-            Dictionary containing:
-            - groups: List of dicts with 'group_name' and 'return_value'
-            - default_value: The ELSE clause value
-            - filter_type: The type of filter logic
-        """
-        result = RowFilterDetails(groups=[], default_value=None, row_filter_type=RowFilterType.EXPLICIT_GROUP_MEMBERSHIP)
-        #pattern = r"IS_ACCOUNT_GROUP_MEMBER\('([^']+)'\)THEN([^W]+?)(?:WHEN|ELSE)"
-        pattern = r"IS_ACCOUNT_GROUP_MEMBER\('([^']+)'\)\s*THEN\s*(.+?)(?=\s*WHEN|\s*ELSE)"        
-
-        matches = re.findall(pattern, sql_definition, re.IGNORECASE)
-        
-        for match in matches:
-            group_name = match[0]
-            # match[1] is string value (like 'T001'), match[2] is boolean value (true/false)
-            return_value = match[1] if match[1] else match[2]
-            if not group_name or not return_value:
-                continue
-            
-            result.groups.append(RowFilterDetailGroup(
-                group_name=group_name,
-                return_value=return_value
-            ))
-        
-        # Extract ELSE clause
-        else_pattern = r"ELSE(.+?)END"
-        else_match = re.search(else_pattern, sql_definition, re.IGNORECASE)
-        if else_match:
-            result.default_value = else_match.group(1) if else_match.group(1) else else_match.group(2)
-        
-        if not result.default_value or not result.groups:
-            self.logger.warning("Could not fully parse row filter definition.")
-            return None
-        return result
-
-    def __extract_if_logic_row_filter__(self, definition: str) -> RowFilterDetails:
-        """
-        Parse an IF row filter definition to extract group membership and their values.
-        
-        Args:
-            sql_definition: The SQL IF statement from a row filter
-        Returns:
-            Dictionary containing:
-
-        """
-        
-        group_name = definition[27:].split("'")[1]
-        start = f"IF(IS_ACCOUNT_GROUP_MEMBER('{group_name}'),"
-        if not definition.upper().startswith(start.upper()):
-            self.logger.warning("Unexpected format: does not match expected start")
-            return result
-        condition_for_group, condition_for_others = definition[len(start):].split(",")
-        condition_for_group = condition_for_group.strip()
-        condition_for_others = condition_for_others.strip()
-        if condition_for_others.endswith(")"):
-            condition_for_others = condition_for_others[:-1].strip()
-        else:
-            self.logger.warning("Unexpected format: does not match expected start")
-            return result        
-
-        result = RowFilterDetails(
-            groups=[RowFilterDetailGroup(
-                group_name=group_name,
-                return_value=condition_for_group
-            )],
-            default_value=condition_for_others,
-            row_filter_type=RowFilterType.EXPLICIT_GROUP_MEMBERSHIP
-        )
-
-        return result
-
-
-    def __extract_logic_from_row_filter__(self, sql_definition: str) -> RowFilterDetails:
-        """
-        Extracts the group name and mask pattern from a column mask function definition.
-        
-        Args:
-            sql_definition (str): The SQL definition containing is_account_group_member function
-
-        Returns:
-            ColumnMaskExtraction: An object containing the extracted group name and mask pattern
-        """
-
-        
-        result = RowFilterDetails(row_filter_type=RowFilterType.UNSUPPORTED)
-        sql_definition = sql_definition.replace("\n", " ").replace("\r", " ")
-        definition = sql_definition.replace(" ", "") 
-        if not definition.upper().startswith("IF(IS_ACCOUNT_GROUP_MEMBER(") and not definition.upper().startswith("CASEWHENIS_ACCOUNT_GROUP_MEMBER("):
-            self.logger.warning("Unexpected format: does not start with 'IF(IS_ACCOUNT_GROUP_MEMBER(' or 'CASEWHENIS_ACCOUNT_GROUP_MEMBER('")
-            return result
-
-        if definition.upper().startswith("CASEWHENIS_ACCOUNT_GROUP_MEMBER("):
-            result_ = self.__extract_case_when_logic_row_filter__(sql_definition)
-        else:
-            result_ = self.__extract_if_logic_row_filter__(definition)
-        
-        if result_:
-            return result_
-        
-        return result
-    
     def __get_column_mask__(self, catalog_name: str, schema_name: str, table_name: str, column_name: str, func_map: FunctionMap) -> DatabricksColumnMask:
         """Retrieves the column mask for a given function map.
         Args:
@@ -589,7 +545,7 @@ class DatabricksAPIClient:
             ColumnMask: A ColumnMask object representing the column mask function.
         """
         func = self.workspace_client.functions.get(func_map.name)
-        extraction = self.__extract_group_from_mask_function__(sql_definition=func.routine_definition, column_name=column_name)
+        extraction = self.routine_parser.parse_column_mask(sql_definition=func.routine_definition, column_name=column_name)
         col_mask = DatabricksColumnMask(name=func_map.name,
                               routine_definition=func.routine_definition,
                               column_name=column_name,
@@ -614,7 +570,7 @@ class DatabricksAPIClient:
             DatabricksRowFilter: A DatabricksRowFilter object representing the row filter for the table.
         """
         func = self.workspace_client.functions.get(func_map.name)
-        details = self.__extract_logic_from_row_filter__(sql_definition=func.routine_definition)
+        details = self.routine_parser.parse_row_filter(sql_definition=func.routine_definition)
         row_filter = DatabricksRowFilter(name=func_map.name,
                                          sql=func.routine_definition,
                                          catalog_name=catalog_name,
@@ -624,16 +580,17 @@ class DatabricksAPIClient:
 
         return row_filter
 
-    def __get_schema_tables__(self, catalog: str, schema: str, table_filters: List[str]) -> List[Table]:
+    def __get_schema_tables__(self, workspace_catalog: Catalog, schema: str, table_filters: List[str]) -> List[Table]:
         """
         Retrieves the tables for a given catalog and schema, applying any filters specified in the table_filters
         Args:
-            catalog (str): The name of the catalog to retrieve tables from.
+            workspace_catalog (Catalog): The catalog to retrieve tables from, collecting its column masks and row filters.
             schema (str): The name of the schema to retrieve tables from.
             table_filters (List[str]): A list of table names to filter the results.
         Returns:
             List[Table]: A list of Table objects representing the tables in the catalog and schema.
         """
+        catalog = workspace_catalog.name
         api_tables = self.workspace_client.tables.list(
             catalog_name=catalog, schema_name=schema
         )
@@ -657,15 +614,15 @@ class DatabricksAPIClient:
                                     name=t.row_filter.function_name, columns=t.row_filter.input_column_names
                                 ))
             if rlsfilter:
-                self.__workspace.catalog.row_filters.append(rlsfilter)
-                self.__workspace.catalog.tables_with_rls.append(TableObject(catalog_name=catalog,
+                workspace_catalog.row_filters.append(rlsfilter)
+                workspace_catalog.tables_with_rls.append(TableObject(catalog_name=catalog,
                                                                             schema_name=schema,
                                                                             table_name=t.name,
                                                                             columns=[c.name for c in t.columns]))
         
-            self.__workspace.catalog.column_masks.extend(cms)
+            workspace_catalog.column_masks.extend(cms)
             if cms:
-                self.__workspace.catalog.tables_with_masks.append(TableObject(catalog_name=catalog,
+                workspace_catalog.tables_with_masks.append(TableObject(catalog_name=catalog,
                                                                               schema_name=schema,
                                                                               table_name=t.name,
                                                                               columns=[c.name for c in t.columns]))
@@ -1,9 +1,12 @@
+import functools
 import json
 import os
 import re
+from datetime import datetime, timedelta, timezone
 from pydantic.json import pydantic_encoder
 
-from typing import List, Tuple
+from typing import Dict, List, Tuple
+from policyweaver.models.config import FabricConfig, Source
 from policyweaver.models.export import (
     CatalogItem, PolicyExport, Policy, Permission, PermissionObject, RolePolicy, RolePolicyExport,
     PermissionScope, ColumnConstraint, RowConstraint
@@ -17,7 +20,9 @@ from policyweaver.core.enum import (
 
 from policyweaver.core.utility import Utils
 from policyweaver.core.common import PolicyWeaverCore
+from policyweaver.core.parallel import fork_map
 from policyweaver.plugins.databricks.api import DatabricksAPIClient
+from policyweaver.plugins.databricks.privilege import PrivilegeEvaluator
 
 class DatabricksPolicyWeaver(PolicyWeaverCore):
     """
@@ -47,6 +52,15 @@ class DatabricksPolicyWeaver(PolicyWeaverCore):
         self.workspace = None
         self.account = None
         self.snapshot = {}
+        self.sync_started = None
+        self.synced_catalogs = []
+        self.privilege_evaluator = None
+        self.group_members = {}
+        self.schema_tables = {}
+        self.permission_scopes = {}
+        self.column_masks = {}
+        self.row_filters = {}
+        self.tables_with_masks = {}
         self.api_client = DatabricksAPIClient()
 
     def __init_environment(self, config:DatabricksSourceMap) -> None:
@@ -75,39 +89,196 @@ class DatabricksPolicyWeaver(PolicyWeaverCore):
         if not config.databricks.account_api_token:
             raise ValueError("Databricks account API token is required in the configuration.")
 
+        if config.databricks.change_detection and not config.databricks.warehouse_id:
+            raise ValueError("Databricks warehouse ID is required in the configuration for change detection.")
+
+        if config.databricks.audit_lookback_minutes is None or config.databricks.audit_lookback_minutes < 0:
+            raise ValueError("Databricks audit lookback must be zero or more minutes.")
+
+        if any(not catalog.name or not catalog.mirror_id for catalog in config.databricks.catalogs or []):
+            raise ValueError("Databricks catalogs require a name and the mirror ID of their Fabric mirror in the configuration.")
+
     def map_policy(self, policy_mapping: str = "table_based") -> PolicyExport:
         """
         Maps the policies from the Databricks Unity Catalog to the Policy Weaver framework.
         This method collects privileges from the workspace catalog, schemas, and tables,
-        applies the access model, and builds the export policies.
+        applies the access model, and builds the export policies of the source catalog.
+        Additional catalogs are mapped by map_mirror_policies, each to its own mirror.
+        With change detection enabled, the extraction is skipped when nothing changed since the last successful run.
         Returns:
-            PolicyExport: An object containing the source, type, and policies mapped from the Databricks Unity Catalog.
+            PolicyExport: An object containing the source, type, and policies mapped from the Databricks Unity Catalog,
+                or None if change detection found no changes.
         Raises:
             ValueError: If the source is not of type DatabricksSourceMap.
         """
-        self.account, self.workspace = self.api_client.get_workspace_policy_map(self.config.source)
-        self.__collect_privileges__(self.workspace.catalog.privileges, self.workspace.catalog.name)        
+        exports = self.__map_catalogs__([self.config.source], policy_mapping)
 
-        for schema in self.workspace.catalog.schemas:
-            self.__collect_privileges__(schema.privileges, self.workspace.catalog.name, schema.name)            
+        return exports[0][1] if exports else None
 
-            for tbl in schema.tables:
-                self.__collect_privileges__(tbl.privileges, self.workspace.catalog.name, schema.name, tbl.name)                
+    def map_mirror_policies(self, policy_mapping: str = "table_based") -> List[Tuple[FabricConfig, PolicyExport]]:
+        """
+        Maps the policies of the source catalog and of the additional catalogs, one export per catalog,
+        each paired with the Fabric mirror of the catalog. The catalogs are extracted in a single pass.
+        With change detection enabled, the extraction is skipped when no catalog changed since the last
+        successful run, otherwise every catalog is exported.
+        Args:
+            policy_mapping (str, optional): The policy mapping, table_based or role_based. Defaults to "table_based".
+        Returns:
+            List[Tuple[FabricConfig, PolicyExport]]: The Fabric mirror and the export of each catalog found,
+                or an empty list if change detection found no changes.
+        """
+        mirrors = {self.config.source.name: self.config.fabric}
 
-        self.__apply_access_model__()
+        for catalog in self.config.databricks.catalogs or []:
+            if catalog.name not in mirrors:
+                mirrors[catalog.name] = self.config.fabric.model_copy(
+                    update={"mirror_id": catalog.mirror_id, "mirror_name": catalog.mirror_name})
 
-        if policy_mapping == "role_based":
-            policies = self.__build_export_role_policies__()
-            return RolePolicyExport(
-                source=self.config.source,
-                type=self.connector_type,
-                policies=policies
-        )
-        else:
+        exports = self.__map_catalogs__(self.__get_catalog_sources__(), policy_mapping)
+
+        return [(mirrors[source.name], export) for source, export in exports]
+
+    def __map_catalogs__(self, sources: List[Source], policy_mapping: str) -> List[Tuple[Source, PolicyExport]]:
+        """
+        Extracts the catalogs of the sources in a single pass and maps the policies of each catalog
+        into its own export. Catalogs that are not found in the workspace are not exported.
+        With change detection enabled, nothing is extracted when none of the catalogs changed.
+        Args:
+            sources (List[Source]): One source per catalog.
+            policy_mapping (str): The policy mapping, table_based or role_based.
+        Returns:
+            List[Tuple[Source, PolicyExport]]: The source and the export of each catalog found, in source order.
+        """
+        self.sync_started = datetime.now(timezone.utc)
+        self.synced_catalogs = []
+
+        # evaluate every catalog, so each changed catalog is logged
+        changes = [self.__has_catalog_changes__(source.name) for source in sources]
+        if not any(changes):
+            return []
+
+        self.account, self.workspace, catalogs = self.api_client.get_workspace_policy_maps(sources)
+        catalogs_by_name = {catalog.name: catalog for catalog in catalogs}
+        exports = []
+
+        for source in sources:
+            if source.name not in catalogs_by_name:
+                continue
+
+            self.workspace.catalog = catalogs_by_name[source.name]
+            self.snapshot = {}
+            self.__index_catalog__()
+            self.__collect_privileges__(self.workspace.catalog.privileges, self.workspace.catalog.name)        
+
+            for schema in self.workspace.catalog.schemas:
+                self.__collect_privileges__(schema.privileges, self.workspace.catalog.name, schema.name)            
+
+                for tbl in schema.tables:
+                    self.__collect_privileges__(tbl.privileges, self.workspace.catalog.name, schema.name, tbl.name)                
+
+            self.__apply_access_model__()
+
+            if policy_mapping == "role_based":
+                export = RolePolicyExport(source=source, type=self.connector_type,
+                                          policies=self.__build_export_role_policies__())
+            else:
+                export = PolicyExport(source=source, type=self.connector_type,
+                                      policies=self.__build_export_policies__())
+
+            exports.append((source, export))
+            self.synced_catalogs.append(source.name)
+
+        return exports
+
+    def __get_catalog_sources__(self) -> List[Source]:
+        """
+        Returns the sources of the catalogs exported in this run: the configured source followed
+        by the additional catalogs, without duplicates. Schema filters apply to the configured source only.
+        Returns:
+            List[Source]: One source per catalog.
+        """
+        sources = [self.config.source]
+
+        for catalog in self.config.databricks.catalogs or []:
+            if catalog.name not in [s.name for s in sources]:
+                sources.append(Source(name=catalog.name))
 
-            policies = self.__build_export_policies__()
-            return PolicyExport(source=self.config.source, type=self.connector_type, policies=policies)
+        return sources
         
+    def on_sync_complete(self) -> None:
+        """
+        Records the start of the successful run as the change detection watermark of each synced catalog.
+        The watermark is moved back by audit_lookback_minutes to allow for audit log delivery latency.
+        """
+        if not self.config.databricks.change_detection or not self.sync_started:
+            return
+
+        watermarks = self.__read_watermarks__()
+        watermark = (self.sync_started - self.__get_audit_lookback__()).isoformat()
+
+        for catalog in self.synced_catalogs:
+            watermarks[catalog] = watermark
+            self.logger.debug(f"DBX Change Detection - Watermark for {catalog} set to {watermark}")
+
+        with open(self.config.databricks.watermark_file, "w") as file:
+            json.dump(watermarks, file, indent=4)
+
+    def __get_audit_lookback__(self) -> timedelta:
+        """
+        Returns how far the change detection watermark is moved back before the start of a run.
+        Returns:
+            timedelta: The configured audit_lookback_minutes.
+        """
+        return timedelta(minutes=self.config.databricks.audit_lookback_minutes)
+
+    def __read_watermarks__(self) -> Dict[str, str]:
+        """
+        Reads the change detection watermarks of the last successful runs.
+        Returns:
+            Dict[str, str]: The ISO formatted watermark of each catalog, empty if no watermark file exists.
+        """
+        try:
+            with open(self.config.databricks.watermark_file, "r") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"DBX Change Detection - Unable to read watermark file: {e}")
+            return {}
+
+    def __has_catalog_changes__(self, catalog:str) -> bool:
+        """
+        Checks system.access.audit for changes to the catalog and account identities since the watermark
+        of the last successful run. Without change detection, a watermark or a successful audit query,
+        a sync is always required.
+        Args:
+            catalog (str): The name of the catalog.
+        Returns:
+            bool: True if the catalog needs to be synced, False otherwise.
+        """
+        if not self.config.databricks.change_detection:
+            return True
+
+        watermark = self.__read_watermarks__().get(catalog)
+
+        if not watermark:
+            self.logger.info(f"DBX Change Detection - No watermark for {catalog}, running a full sync...")
+            return True
+
+        try:
+            changes = self.api_client.get_catalog_change_count(catalog, datetime.fromisoformat(watermark),
+                                                               self.config.databricks.warehouse_id)
+        except Exception as e:
+            self.logger.warning(f"DBX Change Detection - Audit query failed, running a full sync: {e}")
+            return True
+
+        if changes:
+            self.logger.info(f"DBX Change Detection - {changes} changes to {catalog} since {watermark}...")
+            return True
+
+        self.logger.info(f"DBX Change Detection - No changes to {catalog} since {watermark}, skipping sync.")
+        return False
+
     def __get_three_part_key__(self, catalog:str, schema:str=None, table:str=None) -> str:
         """
         Constructs a three-part key for the catalog, schema, and table.
@@ -193,7 +364,8 @@ class DatabricksPolicyWeaver(PolicyWeaverCore):
         Applies the access model to the snapshot by ensuring that all users, service principals, and groups
         are represented in the snapshot. It also applies privilege inheritance and group membership.
         This method ensures that all principals have a PrivilegeSnapshot and that their privileges are inherited correctly.
-        It also collects group memberships for each principal.
+        It also collects group memberships for each principal and builds the privilege evaluator
+        and the group member index over the snapshot.
         Returns:
             None
         """
@@ -232,6 +404,40 @@ class DatabricksPolicyWeaver(PolicyWeaverCore):
             self.snapshot[principal].group_membership.append(self.dbx_account_users_group)
             #self.logger.debug(f"DBX Snapshot - Principal ({principal}) - {self.snapshot[principal].model_dump_json(indent=4)}") 
 
+        self.privilege_evaluator = PrivilegeEvaluator(self.snapshot, self.__get_securable_keys__())
+        self.group_members = self.__get_group_member_index__()
+
+    def __get_group_member_index__(self) -> Dict[str, List[str]]:
+        """
+        Builds a reverse index of group name -> effective members from the group memberships in the snapshot.
+        Members are users, service principals and Entra groups, kept in workspace identity order.
+        Returns:
+            Dict[str, List[str]]: The effective members of each group.
+        """
+        group_members = {}
+
+        for identity in dict.fromkeys(self.workspace.get_workspace_identities(include_entra_groups=True)):
+            if identity in self.snapshot:
+                for group in dict.fromkeys(self.snapshot[identity].group_membership):
+                    group_members.setdefault(group, []).append(identity)
+
+        return group_members
+
+    def __get_securable_keys__(self) -> List[str]:
+        """
+        Returns the three-part keys of the workspace catalog and all of its schemas and tables.
+        Returns:
+            List[str]: The keys of every securable in the workspace catalog.
+        """
+        catalog = self.workspace.catalog
+        keys = [self.__get_three_part_key__(catalog.name)]
+
+        for schema in catalog.schemas:
+            keys.append(self.__get_three_part_key__(catalog.name, schema.name))
+            keys.extend([self.__get_three_part_key__(catalog.name, schema.name, tbl.name) for tbl in schema.tables])
+
+        return keys
+
     def __apply_privilege_inheritence__(self, privilege_snapshot:PrivilegeSnapshot) -> PrivilegeSnapshot:
         """
         Applies privilege inheritance to the given PrivilegeSnapshot.
@@ -358,18 +564,18 @@ class DatabricksPolicyWeaver(PolicyWeaverCore):
 
         return permissions
 
-    def __get_role_based_privileges__(self, permissions: List[PrivilegeItem], principal: str) -> List[CatalogItem]:
-        """Returns a list of CatalogItem objects representing the role-based privileges for a specific principal.
+    def __get_role_based_privileges__(self, permissions: List[PrivilegeItem]) -> Dict[str, List[CatalogItem]]:
+        """Groups the direct privileges by role in a single pass over the privilege items.
         Args:
-            permissions (List[PrivilegeItem]): The list of privilege items to filter.
-            principal (str): The principal (user or group) for which to retrieve role-based privileges.
+            permissions (List[PrivilegeItem]): The list of privilege items to group.
         Returns:
-            List[CatalogItem]: A list of CatalogItem objects representing the role-based privileges.
+            Dict[str, List[CatalogItem]]: The CatalogItem objects of each principal (user or group), in privilege order.
         """
-        catalog_items = []
+        catalog_items = {}
         for perm in permissions:
-            if perm.role == principal and perm.grant == "direct":
-                catalog_items.append(CatalogItem(catalog=perm.catalog, catalog_schema=perm.catalog_schema, table=perm.table))
+            if perm.grant == "direct":
+                catalog_items.setdefault(perm.role, []).append(
+                    CatalogItem(catalog=perm.catalog, catalog_schema=perm.catalog_schema, table=perm.table))
         return catalog_items
 
     def __build_export_role_policies__(self) -> List[RolePolicy]:
@@ -397,45 +603,127 @@ class DatabricksPolicyWeaver(PolicyWeaverCore):
             self.logger.info("Row level security is enabled in the config.")
             row_security = True
 
-        for principal, snapshot in self.snapshot.items():
-            policy = self.__build_role_policy(principal, snapshot.type, permissions,
-                                              column_security=column_security, row_security=row_security)
+        role_privileges = self.__get_role_based_privileges__(permissions)
+        principals = [(principal, snapshot.type, role_privileges[principal])
+                      for principal, snapshot in self.snapshot.items() if principal in role_privileges]
+
+        build = functools.partial(self.__build_role_policy, column_security=column_security, row_security=row_security)
+        workers = self.config.databricks.role_policy_workers if self.config.databricks else None
+
+        results = fork_map(lambda args: build(*args), principals, workers)
+
+        for policy in results:
             if policy:
                 policies.append(policy)
 
         return policies
-    
-    def __get_permission_scopes__(self, cat_item:CatalogItem) -> PermissionScope:
 
-        if cat_item.catalog and not cat_item.catalog_schema and not cat_item.table:
-            ps = []
-            for schema in self.workspace.catalog.schemas:
-                inherited_cat_item = CatalogItem(catalog=cat_item.catalog, catalog_schema=schema.name, table=None)
-                ps_schema = self.__get_permission_scopes__(inherited_cat_item)
-                ps.extend(ps_schema)
-            return ps
-
-        if cat_item.catalog and cat_item.catalog_schema and not cat_item.table:
-            ps = []
-            s = [s for s in self.workspace.catalog.schemas if s.name == cat_item.catalog_schema][0]
-            for table in [t  for t in s.tables]:
-                inherited_cat_item = CatalogItem(catalog=cat_item.catalog, catalog_schema=cat_item.catalog_schema, table=table.name)
-                ps_table = self.__get_permission_scopes__(inherited_cat_item)
-                ps.extend(ps_table)
-            return ps
-
-        ps = PermissionScope()
-        ps.catalog = cat_item.catalog
-        ps.catalog_schema = cat_item.catalog_schema
-        ps.table = cat_item.table
-        ps.name = PermissionType.SELECT
-        ps.state = PermissionState.GRANT
-
-        return [ps]
+    def __index_catalog__(self) -> None:
+        """
+        Indexes the structure of the workspace catalog for the role policy build.
+        Builds the schema -> table names index, indexes column masks, masked tables and row filters
+        by table and resets the cached permission scopes.
+        Returns:
+            None
+        """
+        catalog = self.workspace.catalog
+        self.schema_tables = {}
+        self.permission_scopes = {}
+
+        for schema in catalog.schemas:
+            if schema.name not in self.schema_tables:
+                self.schema_tables[schema.name] = [t.name for t in schema.tables]
+
+        self.column_masks = self.__index_by_table__(catalog.column_masks)
+        self.row_filters = self.__index_by_table__(catalog.row_filters)
+        self.tables_with_masks = {}
+
+        for t in catalog.tables_with_masks or []:
+            self.tables_with_masks.setdefault((t.catalog_name, t.schema_name, t.table_name), t)
+
+    def __index_by_table__(self, policies:list) -> Dict[Tuple[str, ...], list]:
+        """
+        Indexes column masks or row filters by the catalog, (catalog, schema) and (catalog, schema, table)
+        they apply to, keeping the original order within each key.
+        Args:
+            policies (list): The column masks or row filters of the catalog.
+        Returns:
+            Dict[Tuple[str, ...], list]: The policies applying to each catalog, schema and table.
+        """
+        index = {}
+
+        for policy in policies or []:
+            table_key = (policy.catalog_name, policy.schema_name, policy.table_name)
+
+            for i in range(1, len(table_key) + 1):
+                index.setdefault(table_key[:i], []).append(policy)
+
+        return index
+
+    def __get_table_policies__(self, index:Dict[Tuple[str, ...], list], cat_item:CatalogItem) -> Dict[Tuple[str, str, str], list]:
+        """
+        Returns the indexed policies covered by a catalog item, grouped by table in first-seen order.
+        Catalog and schema items cover the policies of every table below them.
+        Args:
+            index (Dict[Tuple[str, ...], list]): The policy index built by __index_by_table__.
+            cat_item (CatalogItem): The catalog, schema or table to look up.
+        Returns:
+            Dict[Tuple[str, str, str], list]: The matching policies of each (catalog, schema, table).
+        """
+        if cat_item.catalog_schema is None:
+            key = (cat_item.catalog,)
+        elif cat_item.table is None:
+            key = (cat_item.catalog, cat_item.catalog_schema)
+        else:
+            key = (cat_item.catalog, cat_item.catalog_schema, cat_item.table)
+
+        tables = {}
+
+        for policy in index.get(key, []):
+            tables.setdefault((policy.catalog_name, policy.schema_name, policy.table_name), []).append(policy)
+
+        return tables
+
+    def __get_permission_scopes__(self, cat_item:CatalogItem) -> Tuple[PermissionScope, ...]:
+        """
+        Expands a catalog item into the SELECT permission scopes of the tables it covers.
+        Catalog and schema items expand to every table below them. The scopes of each
+        catalog, schema and table are built once and shared across principals, so the
+        returned tuple and its scopes must not be modified.
+        Args:
+            cat_item (CatalogItem): The catalog, schema or table the permission is granted on.
+        Returns:
+            Tuple[PermissionScope, ...]: The permission scopes of the tables covered by the item.
+        """
+        return self.__get_scopes__(cat_item.catalog, cat_item.catalog_schema, cat_item.table)
+
+    def __get_scopes__(self, catalog:str, schema:str=None, table:str=None) -> Tuple[PermissionScope, ...]:
+        """
+        Returns the cached permission scopes for a catalog, schema or table, building them on first use.
+        Args:
+            catalog (str): The name of the catalog.
+            schema (str, optional): The name of the schema. Defaults to None.
+            table (str, optional): The name of the table. Defaults to None.
+        Returns:
+            Tuple[PermissionScope, ...]: The permission scopes of the tables covered.
+        """
+        scope_key = (catalog, schema, table)
+
+        if scope_key not in self.permission_scopes:
+            if catalog and not schema and not table:
+                scopes = tuple(ps for s in self.schema_tables for ps in self.__get_scopes__(catalog, s))
+            elif catalog and schema and not table:
+                scopes = tuple(ps for t in self.schema_tables.get(schema, []) for ps in self.__get_scopes__(catalog, schema, t))
+            else:
+                scopes = (PermissionScope(catalog=catalog, catalog_schema=schema, table=table,
+                                          name=PermissionType.SELECT, state=PermissionState.GRANT),)
+
+            self.permission_scopes[scope_key] = scopes
+
+        return self.permission_scopes[scope_key]
 
     def __fix_spn_name__(self, sp_name:str) -> Tuple[bool, str]:
-        overlap = [group.name for group in self.workspace.groups if group.name == sp_name]
-        if overlap:
+        if self.workspace.lookup_group_by_name(sp_name):
             sp_name = f"SPN{sp_name}"
             return True, sp_name
         return False, sp_name
@@ -445,32 +733,11 @@ class DatabricksPolicyWeaver(PolicyWeaverCore):
                                    principal:str) -> List[ColumnConstraint]:
         columnconstraints = []
 
-        for cat_item in catalog_items:
-
-
-            matching_mask_policies = [mp for mp in self.workspace.catalog.column_masks
-                                      if mp.catalog_name == cat_item.catalog and
-                                         (mp.schema_name == cat_item.catalog_schema or cat_item.catalog_schema is None) and
-                                         (mp.table_name == cat_item.table or cat_item.table is None)]
-            
-
-
-            if not matching_mask_policies:
-                continue
-
-            table_objects = [(mp.catalog_name, mp.schema_name, mp.table_name) for mp in matching_mask_policies]
-            table_objects = list(set(table_objects))
-
-            role_assignments = self.snapshot[principal].group_membership
-            role_assignments = [principal] + role_assignments
+        role_assignments = {principal, *self.snapshot[principal].group_membership}
 
-            for (catalog, schema, table) in table_objects:
-                table_w_mask = [t for t in self.workspace.catalog.tables_with_masks if t.catalog_name == catalog and
-                                                        t.schema_name == schema and
-                                                        t.table_name == table][0]
-                matching_mask_policies_per_table = [mp for mp in matching_mask_policies if mp.catalog_name == catalog and
-                                                    mp.schema_name == schema and
-                                                    mp.table_name == table]                
+        for cat_item in catalog_items:
+            for (catalog, schema, table), matching_mask_policies_per_table in self.__get_table_policies__(self.column_masks, cat_item).items():
+                table_w_mask = self.tables_with_masks[(catalog, schema, table)]
                 all_columns = table_w_mask.columns
                 columns_to_deny = []
                 for mp in matching_mask_policies_per_table:
@@ -480,10 +747,10 @@ class DatabricksPolicyWeaver(PolicyWeaverCore):
                         if self.config.constraints.columns.fallback != "grant":
                             columns_to_deny.append(mp.column_name)
                     elif mp.mask_type == ColumnMaskType.UNMASK_FOR_GROUP:
-                        if not any([role for role in role_assignments if role == mp.group_name]):
+                        if mp.group_name not in role_assignments:
                             columns_to_deny.append(mp.column_name)
                     elif mp.mask_type == ColumnMaskType.MASK_FOR_GROUP:
-                        if any([role for role in role_assignments if role == mp.group_name]):
+                        if mp.group_name in role_assignments:
                             columns_to_deny.append(mp.column_name)
                             
                 filtered_columns = [col for col in all_columns if col not in columns_to_deny]
@@ -501,27 +768,11 @@ class DatabricksPolicyWeaver(PolicyWeaverCore):
 
     def __get_row_constraints__(self, catalog_items:List[CatalogItem], principal:str):# -> List[RowConstraint]:
         rowconstraints = []
-        for cat_item in catalog_items:
-            rls = self.workspace.catalog.row_filters
-            matching_rls_policies = [rf for rf in rls
-                                      if rf.catalog_name == cat_item.catalog and
-                                         (rf.schema_name == cat_item.catalog_schema or cat_item.catalog_schema is None) and
-                                         (rf.table_name == cat_item.table or cat_item.table is None)]
-            if not matching_rls_policies:
-                continue
 
-            table_objects = [(mp.catalog_name, mp.schema_name, mp.table_name) for mp in matching_rls_policies]
-            table_objects = list(set(table_objects))
-
-            role_assignments = self.snapshot[principal].group_membership
-            role_assignments = [principal] + role_assignments
-
-            for (catalog, schema, table) in table_objects:
-
-                matching_rls_policies_per_table = [mp for mp in matching_rls_policies if mp.catalog_name == catalog and
-                                                    mp.schema_name == schema and
-                                                    mp.table_name == table]
+        role_assignments = {principal, *self.snapshot[principal].group_membership}
 
+        for cat_item in catalog_items:
+            for matching_rls_policies_per_table in self.__get_table_policies__(self.row_filters, cat_item).values():
                 for mp in matching_rls_policies_per_table:
                     if mp.details.row_filter_type == RowFilterType.UNSUPPORTED:
                         self.logger.warning(f"Unsupported row filter type for row filter policy {mp.name} on {mp.catalog_name}.{mp.schema_name}.{mp.table_name}")
@@ -551,7 +802,7 @@ class DatabricksPolicyWeaver(PolicyWeaverCore):
                     rowconstraints.append(constraint)
         return rowconstraints
 
-    def __build_role_policy(self, principal:str, iam_type:IamType, permissions:List[PrivilegeItem],
+    def __build_role_policy(self, principal:str, iam_type:IamType, cat_items:List[CatalogItem],
                             column_security:bool, row_security:bool) -> RolePolicy:
         """
         Builds a RolePolicy object from the provided principal and iam_type and catalog items.
@@ -562,7 +813,6 @@ class DatabricksPolicyWeaver(PolicyWeaverCore):
         Returns:
             RolePolicy: A RolePolicy object representing the role and its associated permissions.
         """
-        cat_items = self.__get_role_based_privileges__(permissions, principal)
         if not cat_items:
             return None
         permission_scopes = []
@@ -580,65 +830,54 @@ class DatabricksPolicyWeaver(PolicyWeaverCore):
 
         role_name = principal
         if iam_type == IamType.GROUP:
-            for group in self.workspace.groups:
-                if group.name == principal:
-                    if group.external_id:
-                        members = [group.id]
-                        role_name = group.name
-                    else:
-                        members = [member.id for member in group.members]
-                        role_name = group.name
-                    break
+            group = self.workspace.lookup_group_by_name(principal)
+            if group:
+                if group.external_id:
+                    members = [group.id]
+                else:
+                    members = [member.id for member in group.members]
+                role_name = group.name
         elif iam_type == IamType.USER:
-            for u in self.workspace.users:
-                if u.email == principal:
-                    members = [u.id]
-                    role_name = u.email
-                    break
+            u = self.workspace.lookup_user_by_email(principal)
+            if u:
+                members = [u.id]
+                role_name = u.email
         elif iam_type == IamType.SERVICE_PRINCIPAL:
-            for s in self.workspace.service_principals:
-                if s.application_id == principal:
-                    members = [s.id]
+            s = self.workspace.lookup_service_principal_by_id(principal)
+            if s:
+                members = [s.id]
 
-                    adjusted, sp_name = self.__fix_spn_name__(s.name)
-                    while adjusted:
-                        adjusted, sp_name = self.__fix_spn_name__(sp_name)
-                    
-                    role_name = sp_name
-                    break
+                adjusted, sp_name = self.__fix_spn_name__(s.name)
+                while adjusted:
+                    adjusted, sp_name = self.__fix_spn_name__(sp_name)
+                
+                role_name = sp_name
 
         permissionobjects = []
         for member_id in members:
             po = PermissionObject()
-            member = None
-            for u in self.workspace.users:
-                if u.id == member_id:
-                    member = u.id
-                    po.id = u.external_id
-                    type = IamType.USER
-                    po.email = u.email
-                    po.entra_object_id = u.external_id
-                    break
-            if not member:
-                for s in self.workspace.service_principals:
-                    if s.id == member_id:
-                        member = s.id
-                        type = IamType.SERVICE_PRINCIPAL
-                        po.id = s.external_id
-                        po.app_id = s.application_id
-                        po.entra_object_id = s.external_id
-                        break
-            if not member:
-                for g in self.workspace.groups:
-                    if g.id == member_id and g.external_id:
-                        member = g.id
-                        type = IamType.GROUP
-                        po.id = g.external_id
-                        po.entra_object_id = g.external_id
-                        break
-            if member:
-                po.type = type
-                permissionobjects.append(po)
+            u = self.workspace.lookup_user_by_id(member_id)
+            s = None if u else self.workspace.lookup_service_principal_by_object_id(member_id)
+            g = None if u or s else self.workspace.lookup_group_by_id(member_id)
+
+            if u:
+                po.id = u.external_id
+                po.type = IamType.USER
+                po.email = u.email
+                po.entra_object_id = u.external_id
+            elif s:
+                po.type = IamType.SERVICE_PRINCIPAL
+                po.id = s.external_id
+                po.app_id = s.application_id
+                po.entra_object_id = s.external_id
+            elif g and g.external_id:
+                po.type = IamType.GROUP
+                po.id = g.external_id
+                po.entra_object_id = g.external_id
+            else:
+                continue
+
+            permissionobjects.append(po)
 
         if not permissionobjects:
             return None
@@ -722,10 +961,8 @@ class DatabricksPolicyWeaver(PolicyWeaverCore):
                 po.type=IamType.USER
             else:
                 po.type=IamType.SERVICE_PRINCIPAL
-                for g in self.workspace.groups:
-                    if g.name == p:
-                        po.type=IamType.GROUP
-                        break
+                if self.workspace.lookup_group_by_name(p):
+                    po.type=IamType.GROUP
                 
             if po.type == IamType.USER:
                 u = self.workspace.lookup_user_by_email(p)
@@ -776,117 +1013,22 @@ class DatabricksPolicyWeaver(PolicyWeaverCore):
         self.logger.debug(f"DBX Policy Export - {policy.catalog}.{policy.catalog_schema}.{policy.table} - {json.dumps(policy, default=pydantic_encoder, indent=4)}")
         return policy
 
-    def __get_key_set__(self, key) -> List[str]:
-        """
-        Generates a set of keys from a given key string by splitting it on periods.
-        Args:
-            key (str): The key string to split into a set of keys.
-        Returns:
-            List[str]: A list of keys generated from the input key string.
-        """
-        keys = key.split(".")
-        key_set = []
-
-        for i in range(0, len(keys)):
-            key_set.append(".".join(keys[0:i+1]))
-
-        return key_set
-    
-    def __get_user_key_permissions__(self, principal:str, key:str) -> Tuple[bool, bool, bool]:
-        """
-        Retrieves the permissions for a user or service principal for a given key.
-        Args:
-            principal (str): The principal identifier (email or UUID).
-            key (str): The key representing the catalog, schema, or table.
-        Returns:
-            Tuple[bool, bool, bool]: A tuple containing three boolean values indicating:
-                - Whether the principal has catalog prerequisites.
-                - Whether the principal has schema prerequisites.
-                - Whether the principal has read permissions.
-        """
-        if principal in self.snapshot and key in self.snapshot[principal].maps:
-            catalog_prereq = self.snapshot[principal].maps[key].catalog_prerequisites
-            schema_prereq = self.snapshot[principal].maps[key].schema_prerequisites
-            read_permission = self.snapshot[principal].maps[key].read_permissions
-
-            self.logger.debug(f"DBX Evaluate - Principal ({principal}) Key ({key}) - {catalog_prereq}|{schema_prereq}|{read_permission}")
-            
-            if self.snapshot[principal].maps[key].catalog_all_cascade or self.snapshot[principal].maps[key].schema_all_cascade:
-                return True, True, True
-
-            return catalog_prereq, schema_prereq, read_permission
-        else:
-            return False, False, False 
-
-    def __coalesce_user_group_permissions__(self, principal:str, key:str) -> Tuple[bool, bool, bool]:
-        """
-        Coalesces the permissions of a user or service principal with their group memberships for a given key.
-        Args:
-            principal (str): The principal identifier (email or UUID).
-            key (str): The key representing the catalog, schema, or table.
-        Returns:
-            Tuple[bool, bool, bool]: A tuple containing three boolean values indicating:
-                - Whether the principal has catalog prerequisites.
-                - Whether the principal has schema prerequisites.
-                - Whether the principal has read permissions.
-        """
-        catalog_prereq = False
-        schema_prereq = False
-        read_permission = False
-
-        for member_group in self.snapshot[principal].group_membership:
-            key_set = self.__get_key_set__(key)
-            for k in key_set:
-                c, s, r = self.__get_user_key_permissions__(member_group, k)                
-
-                catalog_prereq = catalog_prereq if catalog_prereq else c
-                schema_prereq = schema_prereq if schema_prereq else s
-                read_permission = read_permission if read_permission else r
-                self.logger.debug(f"DBX Evaluate - Principal ({principal}) Group ({member_group}) Key ({k}) - {catalog_prereq}|{schema_prereq}|{read_permission}")
-
-                if catalog_prereq and schema_prereq and read_permission:
-                    break
-            
-            if catalog_prereq and schema_prereq and read_permission:
-                    break
-        
-        return catalog_prereq, schema_prereq, read_permission
-
     def __has_read_permissions__(self, principal:str, key:str) -> bool:
         """
         Checks if a user or service principal has read permissions for a given key.
+        The principal's own permissions and those inherited through its groups are resolved
+        by the privilege evaluator built in __apply_access_model__.
         Args:
             principal (str): The principal identifier (email or UUID).
             key (str): The key representing the catalog, schema, or table.
         Returns:
             bool: True if the principal has read permissions for the key, False otherwise.
         """
-        catalog_prereq, schema_prereq, read_permission = self.__get_user_key_permissions__(principal, key)
-
-        if not (catalog_prereq and schema_prereq and read_permission):
-            group_catalog_prereq, _group_schema_prereq, group_read_permission = self.__coalesce_user_group_permissions__(principal, key)
-
-            catalog_prereq = catalog_prereq if catalog_prereq else group_catalog_prereq
-            schema_prereq = schema_prereq if schema_prereq else _group_schema_prereq
-            read_permission = read_permission if read_permission else group_read_permission
+        catalog_prereq, schema_prereq, read_permission = self.privilege_evaluator.get_permissions(principal, key)
+        self.logger.debug(f"DBX Evaluate - Principal ({principal}) Key ({key}) - {catalog_prereq}|{schema_prereq}|{read_permission}")
 
         return catalog_prereq and schema_prereq and read_permission
     
-    def __is_in_group__(self, principal:str, group:str) -> bool:
-        """
-        Checks if a user or service principal is a member of a specified group.
-        Args:
-            principal (str): The principal identifier (email or UUID).
-            group (str): The name of the group to check membership against.
-        Returns:
-            bool: True if the principal is a member of the group, False otherwise.
-        """
-        if principal in self.snapshot:            
-            if group in self.snapshot[principal].group_membership:
-                return True
-
-        return False
-
     def __get_read_permissions__(self, privileges:List[Privilege], catalog:str, schema:str=None, table:str=None) -> List[Tuple[str, str]]:
         """
         Retrieves the read permissions for a given catalog, schema, and table.
@@ -897,10 +1039,12 @@ class DatabricksPolicyWeaver(PolicyWeaverCore):
             catalog (str): The name of the catalog.
             schema (str, optional): The name of the schema. Defaults to None.
             table (str, optional): The name of the table. Defaults to None.
+        Group grants are expanded to the group's effective members through the group member index.
         Returns:
-            List[str]: A list of user or service principal identifiers that have read permissions for the specified key.
+            List[Tuple[str, str]]: The de-duplicated (principal, "direct" | "indirect") pairs with read permissions for the specified key.
         """
         user_permissions = []
+        seen = set()
 
         key = self.__get_three_part_key__(catalog, schema, table)
 
@@ -908,15 +1052,14 @@ class DatabricksPolicyWeaver(PolicyWeaverCore):
             if any(p in self.dbx_read_permissions for p in r.privileges):
                 if self.__has_read_permissions__(r.principal, key):
                     if r.get_principal_type() == IamType.GROUP: 
-                        identities = self.workspace.get_workspace_identities(include_entra_groups=True)
-
-                        for identity in identities:
-                            if self.__is_in_group__(identity, r.principal):
-                                if not identity in user_permissions:
-                                    self.logger.debug(f"DBX User/Entra Group ({identity}) added by {r.principal} group for {key}...")
-                                    user_permissions.append((identity, "indirect"))
-                    if not r.principal in user_permissions:
+                        for identity in self.group_members.get(r.principal, []):
+                            if (identity, "indirect") not in seen:
+                                self.logger.debug(f"DBX User/Entra Group ({identity}) added by {r.principal} group for {key}...")
+                                seen.add((identity, "indirect"))
+                                user_permissions.append((identity, "indirect"))
+                    if (r.principal, "direct") not in seen:
                         self.logger.debug(f"DBX Principal ({r.principal}) direct add for {key}...")
+                        seen.add((r.principal, "direct"))
                         user_permissions.append((r.principal, "direct"))
                 else:
                     self.logger.debug(f"DBX Principal ({r.principal}) does not have read permissions for {key}...")
@@ -1,6 +1,7 @@
-from pydantic import Field
-from typing import Optional, List, Dict
+from pydantic import Field, PrivateAttr
+from typing import Any, Callable, Optional, List, Dict
 
+from policyweaver.core.graph import TransitiveClosure
 from policyweaver.core.utility import Utils
 from policyweaver.models.common import CommonBaseModel
 from policyweaver.models.config import SourceMap
@@ -351,6 +352,62 @@ class Workspace(BaseObject):
     groups: Optional[List[DatabricksGroup]] = Field(alias="groups", default=None)
     service_principals: Optional[List[DatabricksServicePrincipal]] = Field(alias="service_principals", default=None)
 
+    _indexes: Dict[str, Any] = PrivateAttr(default_factory=dict)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """
+        Sets an attribute, dropping the identity indexes when an identity list is replaced.
+        """
+        super().__setattr__(name, value)
+
+        if name in ("users", "groups", "service_principals"):
+            self.invalidate_indexes()
+
+    def invalidate_indexes(self) -> None:
+        """
+        Drops the identity indexes so they are rebuilt on the next lookup.
+        The indexes follow assignments of users, groups and service_principals; callers that
+        edit one of these lists in place must call this method afterwards.
+        """
+        self._indexes = {}
+
+    def __get_index__(self, name: str, items: List[Any], key: Callable[[Any], str]) -> Dict[str, Any]:
+        """
+        Returns a hash index over a list of identities, building it on first use.
+        The index keeps the first item for each key, matching a linear scan.
+        Args:
+            name (str): The name of the index.
+            items (List[Any]): The identities to index.
+            key (Callable[[Any], str]): Extracts the lookup key from an identity.
+        Returns:
+            Dict[str, Any]: The index of key -> identity.
+        """
+        def build(items: List[Any]) -> Dict[str, Any]:
+            index = {}
+            for item in items:
+                index.setdefault(key(item), item)
+
+            return index
+
+        return self.__get_cached__(name, items, build)
+
+    def __get_cached__(self, name: str, items: List[Any], build: Callable[[List[Any]], Any]) -> Any:
+        """
+        Returns a structure derived from a list of identities, building it on first use.
+        The structure is kept until the list is reassigned or invalidate_indexes is called,
+        in-place edits of the list are not detected.
+        Args:
+            name (str): The name of the cached structure.
+            items (List[Any]): The identities the structure is derived from.
+            build (Callable[[List[Any]], Any]): Builds the structure from the identities.
+        Returns:
+            Any: The cached structure.
+        """
+        if name not in self._indexes:
+            self._indexes[name] = build(items if items is not None else [])
+
+        return self._indexes[name]
+
     def get_workspace_identities(self, include_groups:bool=False, include_entra_groups:bool=False) -> List[str]:
         """
         Returns a list of identities associated with the workspace.
@@ -384,12 +441,7 @@ class Workspace(BaseObject):
         Returns:
             DatabricksUser: The user object if found, otherwise None.
         """
-        user = list(filter(lambda u: u.id == id, self.users))
-
-        if user:
-            return user[0]
-
-        return None
+        return self.__get_index__("user_id", self.users, lambda u: u.id).get(id)
 
     def lookup_service_principal_by_id(self, id: str) -> DatabricksServicePrincipal:
         """
@@ -399,13 +451,19 @@ class Workspace(BaseObject):
         Returns:
             DatabricksServicePrincipal: The service principal object if found, otherwise None.
         """
-        service_principal = list(filter(lambda s: s.application_id == id, self.service_principals))
-
-        if service_principal:
-            return service_principal[0]
-
-        return None
+        return self.__get_index__("service_principal_application_id", self.service_principals,
+                                  lambda s: s.application_id).get(id)
     
+    def lookup_service_principal_by_object_id(self, id: str) -> DatabricksServicePrincipal:
+        """
+        Looks up a service principal by its Databricks object ID in the workspace.
+        Args:
+            id (str): The Databricks ID of the service principal to look up.
+        Returns:
+            DatabricksServicePrincipal: The service principal object if found, otherwise None.
+        """
+        return self.__get_index__("service_principal_id", self.service_principals, lambda s: s.id).get(id)
+
     def lookup_user_by_email(self, email: str) -> DatabricksUser:
         """
         Looks up a user by their email address in the workspace.
@@ -414,12 +472,7 @@ class Workspace(BaseObject):
         Returns:
             DatabricksUser: The user object if found, otherwise None.
         """
-        user = list(filter(lambda u: u.email == email, self.users))
-
-        if user:
-            return user[0]
-
-        return None
+        return self.__get_index__("user_email", self.users, lambda u: u.email).get(email)
     
     def lookup_group_by_name(self, name: str) -> DatabricksGroup:
         """
@@ -427,14 +480,19 @@ class Workspace(BaseObject):
         Args:
             name (str): The name of the group to look up.
         Returns:
-            DatabricksUser: The group object if found, otherwise None.
+            DatabricksGroup: The group object if found, otherwise None.
         """
-        group = list(filter(lambda g: g.name == name, self.groups))
+        return self.__get_index__("group_name", self.groups, lambda g: g.name).get(name)
 
-        if group:
-            return group[0]
-        
-        return None
+    def lookup_group_by_id(self, id: str) -> DatabricksGroup:
+        """
+        Looks up a group by its unique identifier in the workspace.
+        Args:
+            id (str): The unique identifier of the group to look up.
+        Returns:
+            DatabricksGroup: The group object if found, otherwise None.
+        """
+        return self.__get_index__("group_id", self.groups, lambda g: g.id).get(id)
     
     def lookup_object_id(self, principal:str, type:IamType) -> str:
         """
@@ -459,65 +517,35 @@ class Workspace(BaseObject):
     def get_user_groups(self, object_id:str) -> List[str]:
         """
         Returns a list of group names that the user with the given object ID is a member of.
-        This method recursively flattens group memberships to ensure that all nested group memberships are included.
+        Group memberships are resolved from a reverse membership index built once per workspace,
+        so nested group memberships are included without rescanning every group.
         Args:
             object_id (str): The unique identifier of the user for whom to retrieve group memberships.
         Returns:
             List[str]: A list of group names that the user is a member of, including nested group memberships.
         """
-        membership = []
-        
-        for g in self.groups:
-            membership = self.__extend_with_dedup__(membership, 
-                                                    self.__flatten_group__(g.name, object_id))                  
+        membership = self.__get_membership_index__()
 
-        return list(set(membership))
-    
-    def __extend_with_dedup__(self, src, new):
-        """
-        Extends a source list with new items while ensuring no duplicates.
-        This method combines two lists and removes duplicates by converting them to a set.
-        Args:
-            src (List[str]): The source list to extend.
-            new (List[str]): The new items to add to the source list.
-        Returns:
-            List[str]: A new list containing unique items from both the source and new lists.
-        """
-        if not src or len(src) == 0:
-            return new
-
-        if not new or len(new) == 0:
-            return src
+        return list({self.lookup_group_by_id(group_id).name for group_id in membership.get(object_id)})
 
-        s = set(src)
-        s.update(new)
-
-        return list(s)
-    
-    def __flatten_group__(self, name: str, id: str) -> List[str]:
+    def __get_membership_index__(self) -> TransitiveClosure:
         """
-        Recursively flattens group memberships to find all groups that a user is a member of.
-        This method checks if a user is a member of a group and extends the membership list with nested group memberships.
-        Args:
-            name (str): The name of the group to check for membership.
-            id (str): The unique identifier of the user to check for membership.
+        Returns the reverse group membership index of the workspace, building it on first use.
+        The index maps each member ID to the IDs of the groups that contain it, directly or
+        through nested groups, and is rebuilt when the group list is reassigned.
         Returns:
-            List[str]: A list of group names that the user is a member of, including nested group memberships.
+            TransitiveClosure: The closure over member ID -> containing group IDs.
         """
-        group = self.lookup_group_by_name(name)
-        membership = []
+        def build(groups: List[DatabricksGroup]) -> TransitiveClosure:
+            parents = {}
 
-        if group:
-            for m in group.members:
-                if m.id == id:
-                    if m.name not in membership:
-                        membership.append(group.name)
-                if m.type == IamType.GROUP:
-                    membership = self.__extend_with_dedup__(
-                        membership, self.__flatten_group__(m.name, id)
-                    )
+            for g in groups:
+                for m in g.members or []:
+                    parents.setdefault(m.id, []).append(g.id)
 
-        return membership
+            return TransitiveClosure(parents)
+
+        return self.__get_cached__("group_membership", self.groups, build)
 
 class Account(BaseObject):
     """
@@ -579,6 +607,19 @@ class Account(BaseObject):
         
         return None
 
+class DatabricksCatalogMirror(CommonBaseModel):
+    """
+    Represents an additional catalog exported in the same run as the source catalog,
+    with the Fabric mirror its policies are applied to.
+    Attributes:
+        name (Optional[str]): The name of the catalog.
+        mirror_id (Optional[str]): The ID of the Fabric mirror of the catalog.
+        mirror_name (Optional[str]): The name of the Fabric mirror of the catalog.
+    """
+    name: Optional[str] = Field(alias="name", default=None)
+    mirror_id: Optional[str] = Field(alias="mirror_id", default=None)
+    mirror_name: Optional[str] = Field(alias="mirror_name", default=None)
+
 class DatabricksSourceConfig(CommonBaseModel):
     """
     Represents the configuration for a Databricks source.
@@ -587,10 +628,27 @@ class DatabricksSourceConfig(CommonBaseModel):
         workspace_url (Optional[str]): The URL of the Databricks workspace.
         account_id (Optional[str]): The unique identifier for the Databricks account.
         account_api_token (Optional[str]): The API token for accessing the Databricks account.
+        role_policy_workers (Optional[int]): The number of processes used to build role based policies.
+            Policies are built serially when unset or 1.
+        change_detection (Optional[bool]): Skip the sync when system.access.audit records no changes
+            to the catalog or account identities since the last successful run.
+        warehouse_id (Optional[str]): The SQL warehouse used to query the system tables for change detection.
+        watermark_file (Optional[str]): The file holding the watermark of the last successful run per catalog.
+        audit_lookback_minutes (Optional[int]): How far the watermark is moved back before the start of a run,
+            so audit events delivered to system.access.audit after the run are still counted. Defaults to 1440.
+        catalogs (Optional[List[DatabricksCatalogMirror]]): Additional catalogs exported in the same run as
+            the source catalog, each to its own Fabric mirror. Account identities are fetched once and
+            the catalogs are crawled concurrently.
     """
     workspace_url: Optional[str] = Field(alias="workspace_url", default=None)
     account_id: Optional[str] = Field(alias="account_id", default=None)
     account_api_token: Optional[str] = Field(alias="account_api_token", default=None)
+    role_policy_workers: Optional[int] = Field(alias="role_policy_workers", default=None)
+    change_detection: Optional[bool] = Field(alias="change_detection", default=False)
+    warehouse_id: Optional[str] = Field(alias="warehouse_id", default=None)
+    watermark_file: Optional[str] = Field(alias="watermark_file", default="policyweaver_dbx_watermark.json")
+    audit_lookback_minutes: Optional[int] = Field(alias="audit_lookback_minutes", default=1440)
+    catalogs: Optional[List[DatabricksCatalogMirror]] = Field(alias="catalogs", default=None)
 
 class DatabricksSourceMap(SourceMap):
     databricks: Optional[DatabricksSourceConfig] = Field(alias="databricks", default=None)
\ No newline at end of file
@@ -0,0 +1,198 @@
+import logging
+
+from policyweaver.core.enum import ColumnMaskType, RowFilterType
+from policyweaver.core.tokenizer import ParseCache, RoutineParseError, TokenStream
+from policyweaver.plugins.databricks.model import (
+    ColumnMaskExtraction, RowFilterDetailGroup, RowFilterDetails
+)
+
+_GROUP_MEMBER_FUNCTION = "IS_ACCOUNT_GROUP_MEMBER"
+
+class DatabricksRoutineParser:
+    """
+    Parser for the routine definitions of Databricks column mask and row filter functions.
+    Definitions are tokenized with precompiled patterns and parsed for the supported
+    is_account_group_member patterns:
+        Column masks: CASE WHEN is_account_group_member('group') THEN <value> ELSE <value> END
+        Row filters:  CASE WHEN is_account_group_member('group') THEN <condition> [WHEN ...] ELSE <condition> END
+                      IF(is_account_group_member('group'), <condition>, <condition>)
+    Parse results are held in an LRU cache keyed by a hash of the routine text, so routines
+    shared by many columns or tables are parsed once. Callers receive their own copy of a result,
+    and the cache may be shared by threads crawling several catalogs.
+    Example usage:
+        parser = DatabricksRoutineParser()
+        extraction = parser.parse_column_mask("CASE WHEN is_account_group_member('hr') THEN ssn ELSE '***' END", "ssn")
+    """
+    def __init__(self, maxsize: int = 1024) -> None:
+        """
+        Initializes the parser.
+        Args:
+            maxsize (int, optional): The maximum number of cached parse results, 0 disables the cache. Defaults to 1024.
+        """
+        self.logger = logging.getLogger("POLICY_WEAVER")
+        self.cache = ParseCache(maxsize)
+
+    def parse_column_mask(self, sql_definition: str, column_name: str) -> ColumnMaskExtraction:
+        """
+        Extracts the group name, mask pattern and mask type from a column mask function definition.
+        Args:
+            sql_definition (str): The SQL definition containing the is_account_group_member function.
+            column_name (str): The name of the masked column.
+        Returns:
+            ColumnMaskExtraction: The extraction, with an UNSUPPORTED mask type if the definition does not match.
+        """
+        return self.cache.get(("mask", column_name), sql_definition or "",
+                              lambda: self.__parse_column_mask__(sql_definition or "", column_name))
+
+    def parse_row_filter(self, sql_definition: str) -> RowFilterDetails:
+        """
+        Extracts the group memberships, their return values and the default value from a row filter definition.
+        Args:
+            sql_definition (str): The SQL definition containing the is_account_group_member function.
+        Returns:
+            RowFilterDetails: The details, with an UNSUPPORTED row filter type if the definition does not match.
+        """
+        return self.cache.get(("row_filter",), sql_definition or "",
+                              lambda: self.__parse_row_filter__(sql_definition or ""))
+
+    def __read_group_condition__(self, stream: TokenStream) -> str:
+        """
+        Reads an is_account_group_member('group') call and returns the group name.
+        Args:
+            stream (TokenStream): The token stream positioned at the call.
+        Returns:
+            str: The group name.
+        """
+        stream.expect_keyword(_GROUP_MEMBER_FUNCTION)
+        stream.expect_punct("(")
+        group = stream.next()
+        if group.kind != "string":
+            raise RoutineParseError(f"Expected a group name literal but found '{group.value}'.")
+        stream.expect_punct(")")
+
+        return group.value[1:-1]
+
+    def __parse_column_mask__(self, sql_definition: str, column_name: str) -> ColumnMaskExtraction:
+        """Parses a column mask definition, see parse_column_mask."""
+        result = ColumnMaskExtraction(column_mask_type=ColumnMaskType.UNSUPPORTED)
+
+        try:
+            stream = TokenStream.open(sql_definition)
+            stream.expect_keyword("CASE")
+            stream.expect_keyword("WHEN")
+            group_name = self.__read_group_condition__(stream)
+            stream.expect_keyword("THEN")
+            assigned = stream.read_expression(lambda t: t.is_keyword("ELSE"))
+            stream.expect_keyword("ELSE")
+            unassigned = stream.read_expression(lambda t: t.is_keyword("END"))
+            stream.expect_keyword("END")
+        except RoutineParseError as e:
+            self.logger.warning(f"Unexpected column mask format, expected 'CASE WHEN is_account_group_member(...) THEN ... ELSE ... END': {e}")
+            return result
+
+        mask = None
+        column_name_pos = None
+
+        for position, expression in ((1, assigned), (2, unassigned)):
+            if len(expression) != 1:
+                continue
+            token = expression[0]
+            if token.kind == "string":
+                mask = token.value[1:-1]
+            elif token.kind == "ident" and token.value.strip("`") == column_name:
+                column_name_pos = position
+
+        result.group_name = group_name
+        result.mask_pattern = mask
+        if column_name_pos == 1:
+            result.column_mask_type = ColumnMaskType.UNMASK_FOR_GROUP
+        elif column_name_pos == 2:
+            result.column_mask_type = ColumnMaskType.MASK_FOR_GROUP
+
+        return result
+
+    def __parse_row_filter__(self, sql_definition: str) -> RowFilterDetails:
+        """Parses a row filter definition, see parse_row_filter."""
+        result = RowFilterDetails(row_filter_type=RowFilterType.UNSUPPORTED)
+
+        try:
+            stream = TokenStream.open(sql_definition)
+            first = stream.peek()
+            if first and first.is_keyword("CASE"):
+                details = self.__parse_case_row_filter__(stream)
+            elif first and first.is_keyword("IF"):
+                details = self.__parse_if_row_filter__(stream)
+            else:
+                raise RoutineParseError("Definition does not start with 'CASE WHEN' or 'IF('.")
+        except RoutineParseError as e:
+            self.logger.warning(f"Unexpected row filter format, expected 'IF(is_account_group_member(...), ...)' or 'CASE WHEN is_account_group_member(...) ...': {e}")
+            return result
+
+        return details
+
+    def __parse_case_row_filter__(self, stream: TokenStream) -> RowFilterDetails:
+        """
+        Parses a CASE WHEN row filter. Branches whose condition is not a group membership test are skipped.
+        Args:
+            stream (TokenStream): The token stream positioned at CASE.
+        Returns:
+            RowFilterDetails: The group return values and the ELSE default value.
+        """
+        groups = []
+        stream.expect_keyword("CASE")
+        stream.expect_keyword("WHEN")
+        first_branch = True
+
+        while True:
+            condition = stream.peek()
+            is_group_condition = condition is not None and condition.is_keyword(_GROUP_MEMBER_FUNCTION)
+
+            if not is_group_condition and first_branch:
+                raise RoutineParseError("The first branch is not an is_account_group_member test.")
+
+            if is_group_condition:
+                group_name = self.__read_group_condition__(stream)
+            else:
+                stream.read_expression(lambda t: t.is_keyword("THEN"))
+
+            stream.expect_keyword("THEN")
+            value = stream.read_expression(lambda t: t.is_keyword("WHEN") or t.is_keyword("ELSE"))
+
+            if is_group_condition and group_name:
+                groups.append(RowFilterDetailGroup(group_name=group_name, return_value=stream.slice(value)))
+
+            first_branch = False
+            if stream.next().is_keyword("ELSE"):
+                break
+
+        default_value = stream.slice(stream.read_expression(lambda t: t.is_keyword("END")))
+        stream.expect_keyword("END")
+
+        if not groups:
+            raise RoutineParseError("No group membership branches found.")
+
+        return RowFilterDetails(groups=groups, default_value=default_value,
+                                row_filter_type=RowFilterType.EXPLICIT_GROUP_MEMBERSHIP)
+
+    def __parse_if_row_filter__(self, stream: TokenStream) -> RowFilterDetails:
+        """
+        Parses an IF(is_account_group_member('group'), <condition>, <condition>) row filter.
+        Args:
+            stream (TokenStream): The token stream positioned at IF.
+        Returns:
+            RowFilterDetails: The group return value and the default value.
+        """
+        stream.expect_keyword("IF")
+        stream.expect_punct("(")
+        group_name = self.__read_group_condition__(stream)
+        stream.expect_punct(",")
+        condition_for_group = stream.read_expression(lambda t: t.is_punct(","))
+        stream.expect_punct(",")
+        condition_for_others = stream.read_expression(lambda t: t.is_punct(")"))
+        stream.expect_punct(")")
+
+        return RowFilterDetails(
+            groups=[RowFilterDetailGroup(group_name=group_name, return_value=stream.slice(condition_for_group))],
+            default_value=stream.slice(condition_for_others),
+            row_filter_type=RowFilterType.EXPLICIT_GROUP_MEMBERSHIP
+        )
@@ -0,0 +1,207 @@
+from typing import Dict, Iterable, List, Tuple
+
+from policyweaver.plugins.databricks.model import DependencyMap, PrivilegeSnapshot
+
+class PrivilegeEvaluator:
+    """
+    Compiled privilege evaluation engine for Databricks Unity Catalog.
+    Principals and securables are interned to integer IDs, and the effective
+    (catalog prerequisite, schema prerequisite, read) flags of a principal are held
+    as three bitsets over the securable IDs. A principal's bitsets combine its own
+    grants on the exact securable with the grants of every group it is a member of
+    on the securable or any of its parents (catalog, schema). Group grants are
+    folded down the securable hierarchy once per group and each principal's bitsets
+    are computed once, so evaluating a grant is a constant time bit test.
+    Example usage:
+        evaluator = PrivilegeEvaluator(snapshot, ["main", "main.sales", "main.sales.orders"])
+        evaluator.has_read_permissions("analysts", "main.sales.orders")
+    """
+    def __init__(self, snapshot: Dict[str, PrivilegeSnapshot], securables: Iterable[str]) -> None:
+        """
+        Initializes the evaluator over a fully built privilege snapshot.
+        Args:
+            snapshot (Dict[str, PrivilegeSnapshot]): The privilege snapshot keyed by principal,
+                with privilege inheritance and group memberships already applied.
+            securables (Iterable[str]): The three-part keys of the securables that will be evaluated.
+        """
+        self.snapshot = snapshot
+        self.securables: Dict[str, int] = {}
+        self.principals: Dict[str, int] = {}
+        self.__descendants: Dict[str, int] = {}
+        self.__own: Dict[int, Tuple[int, int, int]] = {}
+        self.__folded: Dict[int, Tuple[int, int, int]] = {}
+        self.__effective: Dict[int, Tuple[int, int, int]] = {}
+
+        for key in securables:
+            self.__intern_securable__(key)
+
+        for principal_snapshot in snapshot.values():
+            for key in principal_snapshot.maps:
+                self.__intern_securable__(key)
+
+    @staticmethod
+    def get_key_set(key: str) -> List[str]:
+        """
+        Generates the keys of a securable and its parents by splitting the key on periods.
+        Args:
+            key (str): The key string to split into a set of keys.
+        Returns:
+            List[str]: The keys from the catalog down to the securable itself.
+        """
+        keys = key.split(".")
+
+        return [".".join(keys[0:i+1]) for i in range(0, len(keys))]
+
+    @staticmethod
+    def get_map_permissions(dependency_map: DependencyMap) -> Tuple[bool, bool, bool]:
+        """
+        Returns the effective flags of a single dependency map.
+        ALL_PRIVILEGES cascading from the catalog or schema grants every flag.
+        Args:
+            dependency_map (DependencyMap): The dependency map to evaluate.
+        Returns:
+            Tuple[bool, bool, bool]: The catalog prerequisite, schema prerequisite and read flags.
+        """
+        if dependency_map.catalog_all_cascade or dependency_map.schema_all_cascade:
+            return True, True, True
+
+        return (bool(dependency_map.catalog_prerequisites),
+                bool(dependency_map.schema_prerequisites),
+                bool(dependency_map.read_permissions))
+
+    def get_permissions(self, principal: str, key: str) -> Tuple[bool, bool, bool]:
+        """
+        Returns the effective permissions of a principal on a securable, including the
+        permissions inherited through group membership.
+        Args:
+            principal (str): The principal identifier (email, application ID or group name).
+            key (str): The three-part key of the securable.
+        Returns:
+            Tuple[bool, bool, bool]: The catalog prerequisite, schema prerequisite and read flags.
+        """
+        if key not in self.securables:
+            self.__intern_securable__(key)
+
+        bit = 1 << self.securables[key]
+        catalog_prereq, schema_prereq, read_permission = self.__get_effective__(principal)
+
+        return bool(catalog_prereq & bit), bool(schema_prereq & bit), bool(read_permission & bit)
+
+    def has_read_permissions(self, principal: str, key: str) -> bool:
+        """
+        Checks if a principal can read a securable, directly or through group membership.
+        Args:
+            principal (str): The principal identifier (email, application ID or group name).
+            key (str): The three-part key of the securable.
+        Returns:
+            bool: True if all read prerequisites are met, False otherwise.
+        """
+        return all(self.get_permissions(principal, key))
+
+    def __intern_principal__(self, principal: str) -> int:
+        """
+        Interns a principal to its integer ID.
+        Args:
+            principal (str): The principal identifier.
+        Returns:
+            int: The ID of the principal.
+        """
+        if principal not in self.principals:
+            self.principals[principal] = len(self.principals)
+
+        return self.principals[principal]
+
+    def __intern_securable__(self, key: str) -> int:
+        """
+        Interns a securable key to its bit position and registers it under each of its parents.
+        Interning a new securable invalidates the cached bitsets.
+        Args:
+            key (str): The three-part key of the securable.
+        Returns:
+            int: The bit position of the securable.
+        """
+        if key in self.securables:
+            return self.securables[key]
+
+        position = len(self.securables)
+        self.securables[key] = position
+
+        for parent in PrivilegeEvaluator.get_key_set(key):
+            self.__descendants[parent] = self.__descendants.get(parent, 0) | (1 << position)
+
+        self.__own.clear()
+        self.__folded.clear()
+        self.__effective.clear()
+
+        return position
+
+    def __get_own__(self, principal_id: int, principal: str) -> Tuple[int, int, int]:
+        """
+        Returns the bitsets of the grants held by a principal on exact securables.
+        Args:
+            principal_id (int): The ID of the principal.
+            principal (str): The principal identifier.
+        Returns:
+            Tuple[int, int, int]: The catalog prerequisite, schema prerequisite and read bitsets.
+        """
+        if principal_id not in self.__own:
+            bits = [0, 0, 0]
+
+            if principal in self.snapshot:
+                for key, dependency_map in self.snapshot[principal].maps.items():
+                    bit = 1 << self.securables[key]
+                    for flag, granted in enumerate(PrivilegeEvaluator.get_map_permissions(dependency_map)):
+                        if granted:
+                            bits[flag] |= bit
+
+            self.__own[principal_id] = tuple(bits)
+
+        return self.__own[principal_id]
+
+    def __get_folded__(self, principal_id: int, principal: str) -> Tuple[int, int, int]:
+        """
+        Returns the bitsets of a group's grants folded down to every securable below them.
+        Args:
+            principal_id (int): The ID of the group.
+            principal (str): The group name.
+        Returns:
+            Tuple[int, int, int]: The catalog prerequisite, schema prerequisite and read bitsets.
+        """
+        if principal_id not in self.__folded:
+            bits = [0, 0, 0]
+
+            if principal in self.snapshot:
+                for key, dependency_map in self.snapshot[principal].maps.items():
+                    descendants = self.__descendants[key]
+                    for flag, granted in enumerate(PrivilegeEvaluator.get_map_permissions(dependency_map)):
+                        if granted:
+                            bits[flag] |= descendants
+
+            self.__folded[principal_id] = tuple(bits)
+
+        return self.__folded[principal_id]
+
+    def __get_effective__(self, principal: str) -> Tuple[int, int, int]:
+        """
+        Returns the effective bitsets of a principal: its own grants combined with the
+        folded grants of every group it is a member of.
+        Args:
+            principal (str): The principal identifier.
+        Returns:
+            Tuple[int, int, int]: The catalog prerequisite, schema prerequisite and read bitsets.
+        """
+        principal_id = self.__intern_principal__(principal)
+
+        if principal_id not in self.__effective:
+            catalog_prereq, schema_prereq, read_permission = self.__get_own__(principal_id, principal)
+
+            if principal in self.snapshot:
+                for group in self.snapshot[principal].group_membership:
+                    c, s, r = self.__get_folded__(self.__intern_principal__(group), group)
+                    catalog_prereq |= c
+                    schema_prereq |= s
+                    read_permission |= r
+
+            self.__effective[principal_id] = (catalog_prereq, schema_prereq, read_permission)
+
+        return self.__effective[principal_id]
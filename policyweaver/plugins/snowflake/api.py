@@ -1,23 +1,24 @@
 import logging
-import re
 import os
 from pydantic.json import pydantic_encoder
 
 import snowflake.connector
 
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from snowflake.connector.errors import NotSupportedError, ProgrammingError
+
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
 
 from policyweaver.models.config import (
     SourceSchema, Source
 )
 
-from policyweaver.core.enum import ColumnMaskType, RowFilterType
-
 from policyweaver.plugins.snowflake.model import (
-    RowFilterDetailGroup,
-    RowFilterDetails,
-    SnowflakeColumnMask,
-    SnowflakeColumnMaskExtraction,
     SnowflakeConnection,
     SnowflakeGrant,
     SnowflakeMaskingPolicy,
@@ -34,6 +35,9 @@ from policyweaver.core.enum import (
 )
 
 from policyweaver.core.auth import ServicePrincipal
+from policyweaver.plugins.snowflake.parser import SnowflakePolicyParser
+from policyweaver.plugins.snowflake.pool import SnowflakeConnectionPool
+from policyweaver.plugins.snowflake.rolegraph import SnowflakeRoleGraph
 
 class SnowflakeAPIClient:
     """
@@ -42,11 +46,28 @@ class SnowflakeAPIClient:
     and retrieve users, databases, schemas, tables, and privileges.
     This class is designed to be used within the Policy Weaver framework to gather and map policies
     from Snowflake workspaces and accounts.
+    Queries share a pool of connections for the run, which is closed by close() or
+    when the client is used as a context manager.
+    By default the metadata is read from the SNOWFLAKE.ACCOUNT_USAGE views, which scale to large
+    accounts but lag by up to two hours. In live mode it is read with SHOW commands and the
+    INFORMATION_SCHEMA of the source database instead, which is current but issues queries per
+    role, schema, table and policy, so it suits small and medium databases.
     """
-    def __init__(self):
+    sf_unsupported_policy_kinds = ["AGGREGATION_POLICY", "JOIN_POLICY", "PROJECTION_POLICY"]
+    grant_privileges = None
+    sf_fetch_batch_size = 50000
+    live_mode = False
+
+    def __init__(self, max_connections: int = 4, live_mode: bool = False, grant_privileges: List[str] = None):
         """
         Initializes the Snowflake API Client with a connection to the Snowflake account.
         Sets up the logger for the client.
+        Args:
+            max_connections (int, optional): The maximum number of pooled connections. Defaults to 4.
+            live_mode (bool, optional): Read the metadata with SHOW commands and INFORMATION_SCHEMA
+                instead of ACCOUNT_USAGE. Defaults to False.
+            grant_privileges (List[str], optional): The privileges of the grants to read, other grants
+                are filtered out by the queries. Defaults to None, which reads every privilege.
         Raises:
             EnvironmentError: If required environment variables are not set.
         """
@@ -75,10 +96,28 @@ class SnowflakeAPIClient:
         self.grants = None
         self.role_assignments = None
         self.user_assignments = None
+        self.role_graph = None
         self.masking_policies = []
         self.tables_with_masks = []
+        self.row_access_policies = []
+        self.tables_with_raps = []
+        self.policy_parser = SnowflakePolicyParser()
+        self.live_mode = live_mode
+        self.grant_privileges = grant_privileges
+
+        self.pool = SnowflakeConnectionPool(self.__get_snowflake_connection__, max_size=max_connections)
 
+    def __enter__(self) -> "SnowflakeAPIClient":
+        return self
 
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the pooled connections to the Snowflake account.
+        """
+        self.pool.close()
 
     def __get_snowflake_connection__(self) -> snowflake.connector.SnowflakeConnection:
         """
@@ -102,6 +141,7 @@ class SnowflakeAPIClient:
                 'private_key_file_pwd':private_key_file_pwd,
                 'warehouse': self.connection.warehouse,
                 'disable_ocsp_checks': True,
+                'client_session_keep_alive': True,
                 'database': 'SNOWFLAKE',
                 'schema': 'ACCOUNT_USAGE'
             }
@@ -115,42 +155,96 @@ class SnowflakeAPIClient:
                 account=self.connection.account_name,
                 warehouse=self.connection.warehouse,
                 disable_ocsp_checks=True,
+                client_session_keep_alive=True,
                 database="SNOWFLAKE",
                 schema="ACCOUNT_USAGE"
             )
         
 
-    def __run_query__(self, query: str, columns: List[str]) -> List[dict]:
+    def __run_query__(self, query: str, columns: List[str], params: List = None) -> List[dict]:
         """
-        Execute a SQL query against Snowflake and return the results.
+        Execute a SQL query against Snowflake on a pooled connection and return the results.
 
         Args:
             query (str): SQL query to execute
+            params (list, optional): Values bound to the %s placeholders of the query
 
         Returns:
             list: Query results as a list of tuples
         """
-        with self.__get_snowflake_connection__() as conn:
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                results = cur.fetchall()
+        return [dict(zip(columns, row)) for row in results]
+
+    def __run_query_batches__(self, query: str, columns: List[str], params: List = None) -> Iterator[Dict[str, list]]:
+        """
+        Execute a SQL query against Snowflake on a pooled connection and stream the results batch by batch.
+        When pyarrow is installed the batches are fetched with fetch_arrow_batches, otherwise, or when
+        the connector cannot return Arrow results, the rows are fetched with fetchmany.
+
+        Args:
+            query (str): SQL query to execute
+            columns (List[str]): The names given to the result columns
+            params (list, optional): Values bound to the %s placeholders of the query
+
+        Yields:
+            dict: The values of each column of a batch
+        """
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+
+                if pyarrow is not None:
+                    try:
+                        batches = cur.fetch_arrow_batches()
+                    except (NotSupportedError, ProgrammingError) as e:
+                        self.logger.debug(f"Arrow batches are not available, fetching rows: {e}")
+                        batches = None
+
+                    if batches is not None:
+                        for batch in batches:
+                            batch = batch.rename_columns(columns)
+                            yield {column: batch[column].to_pylist() for column in columns}
+                        return
+
+                while rows := cur.fetchmany(self.sf_fetch_batch_size):
+                    yield {column: [row[i] for row in rows] for i, column in enumerate(columns)}
+
+    def __run_show__(self, command: str) -> List[dict]:
+        """
+        Execute a SHOW or DESCRIBE command against Snowflake on a pooled connection and return the results.
+        The output columns of these commands are taken from the cursor description.
+
+        Args:
+            command (str): SHOW or DESCRIBE command to execute
+
+        Returns:
+            list: Command results as a list of dicts keyed by the lower case column names
+        """
+        with self.pool.connection() as conn:
             with conn.cursor() as cur:
-                cur.execute(query)
+                cur.execute(command)
+                columns = [c[0].lower() for c in cur.description]
                 results = cur.fetchall()
         return [dict(zip(columns, row)) for row in results]
 
     def __get_database_map__(self, source: Source) -> SnowflakeDatabaseMap:
         """
         Retrieves the database map from the Snowflake account.
+        The metadata is read from ACCOUNT_USAGE or, in live mode, with SHOW commands,
+        then joined before the role hierarchy is resolved.
         Returns:
             dict: A dictionary mapping database names to their schemas.
             NotFound: If the catalog specified in the source is not found in the workspace.
         """
-        
-        # get users
-
-        self.users = self.__get_users__()
-
-        # get roles
+        if self.live_mode:
+            self.__get_live_metadata__(source)
+        else:
+            self.__get_account_usage_metadata__(source)
 
-        self.roles = self.__get_roles__()
+        self.role_graph = SnowflakeRoleGraph(self.role_assignments, self.user_assignments)
 
         # get direct and indirect members for each role
 
@@ -162,24 +256,11 @@ class SnowflakeAPIClient:
 
         # get user/role to role memberships
 
-        user_role_assignments = self.__get_user_role_assignments__()
+        roles_by_name = self.__get_roles_by_name__()
         for u in self.users:
-            u.role_assignments = user_role_assignments[u.name]
+            u.role_assignments = self.__get_user_role_assignment__(u, is_user=True, roles_by_name=roles_by_name)
         for r in self.roles:
-            r.role_assignments = user_role_assignments[r.name]
-
-        # get grants to roles and users
-
-        self.grants = self.__get_grants__(source)
-
-        # get column masks
-
-        self.__get_column_masks__(source.name)
-
-        # get row access policies
-        self.__get_row_access_policies__(source.name)
-
-        self.__get_unsupported_policies__(source.name)
+            r.role_assignments = self.__get_user_role_assignment__(r, is_user=False, roles_by_name=roles_by_name)
 
         return SnowflakeDatabaseMap(users=self.users, roles=self.roles,
                                     grants=self.grants,
@@ -190,60 +271,256 @@ class SnowflakeAPIClient:
                                     unsupported_tables=self.unsupported_tables
                                     )
 
+    def __get_account_usage_metadata__(self, source: Source) -> None:
+        """
+        Reads the users, roles, grants and policies of the source database from ACCOUNT_USAGE.
+        The queries do not depend on each other and are submitted concurrently, one per pooled connection.
+        Args:
+            source (Source): The source database, schemas and tables.
+        """
+        with ThreadPoolExecutor(max_workers=self.pool.max_size) as executor:
+            users = executor.submit(self.__get_users__)
+            roles = executor.submit(self.__get_roles__)
+            role_assignments = executor.submit(self.__get_role_assignments__)
+            user_assignments = executor.submit(self.__get_user_assignments__)
+            grants = executor.submit(self.__get_grants__, source)
+            policy_references = executor.submit(self.__get_policy_references__, source)
+
+            self.__set_policies__(policy_references.result())
+
+            # get the columns of the tables with masks or row access policies
+            tables_with_policies = executor.submit(self.__get_tables_with_policies__)
+
+            self.users = users.result()
+            self.roles = roles.result()
+            self.role_assignments = role_assignments.result()
+            self.user_assignments = user_assignments.result()
+            self.grants = grants.result()
+            tables_with_policies.result()
+
+    def __set_policies__(self, policy_references: List[dict]) -> None:
+        """
+        Dispatches the policy references by kind and builds the masking, row access and unsupported policies.
+        Args:
+            policy_references (List[dict]): The policy references with their kind and body.
+        """
+        references_by_kind = dict()
+        for reference in policy_references:
+            references_by_kind.setdefault(reference["POLICY_KIND"], []).append(reference)
 
-    def __get_unsupported_policies__(self, database: str) -> None:
+        self.__get_column_masks__(references_by_kind.get("MASKING_POLICY", []))
+        self.__get_row_access_policies__(references_by_kind.get("ROW_ACCESS_POLICY", []))
+        self.__get_unsupported_policies__([up for kind in self.sf_unsupported_policy_kinds
+                                           for up in references_by_kind.get(kind, [])])
 
-        # AGGREGATION POLICIES
-        query = f"""                            
-                SELECT
-                    rap.POLICY_BODY,
-                    pr.POLICY_ID,
-                    pr.POLICY_NAME,
-                    pr.ref_database_name,
-                    pr.ref_schema_name,
-                    pr.ref_entity_name,
-                    pr.ref_column_name
-                FROM SNOWFLAKE.ACCOUNT_USAGE.POLICY_REFERENCES pr
-                JOIN SNOWFLAKE.ACCOUNT_USAGE.AGGREGATION_POLICIES rap
-                    ON pr.POLICY_ID = rap.POLICY_ID
-                AND pr.REF_DATABASE_NAME = '{database.upper()}' AND REF_ENTITY_DOMAIN = 'TABLE' AND POLICY_STATUS = 'ACTIVE';
+    def __get_live_metadata__(self, source: Source) -> None:
+        """
+        Reads the users, roles, grants and policies of the source database with SHOW commands
+        and INFORMATION_SCHEMA table functions. The commands per role, schema, table and policy
+        are submitted concurrently, one per pooled connection.
+        Args:
+            source (Source): The source database, schemas and tables.
+        """
+        database = source.name
+
+        with ThreadPoolExecutor(max_workers=self.pool.max_size) as executor:
+            users = executor.submit(self.__get_live_users__)
+            roles = executor.submit(self.__get_live_roles__)
+            schema_tables = executor.submit(self.__get_live_tables__, source)
+            database_grants = executor.submit(self.__get_live_grants__, database)
+
+            self.roles = roles.result()
+            role_grantees = [executor.submit(self.__get_live_role_grantees__, role.name) for role in self.roles]
+
+            tables = [(schema, table) for schema, names in schema_tables.result().items() for table in names]
+            schema_grants = [executor.submit(self.__get_live_grants__, database, schema)
+                             for schema in schema_tables.result()]
+            table_grants = [executor.submit(self.__get_live_grants__, database, schema, table)
+                            for (schema, table) in tables]
+            references = [executor.submit(self.__get_live_policy_references__, database, schema, table)
+                          for (schema, table) in tables]
+
+            policy_references = [reference for r in references for reference in r.result()]
+            self.__set_policies__(self.__get_live_policy_bodies__(executor, policy_references))
+
+            # get the columns of the tables with masks or row access policies
+            tables_with_policies = executor.submit(self.__get_tables_with_policies__)
+
+            self.users = users.result()
+            self.grants = database_grants.result() + \
+                [grant for g in schema_grants for grant in g.result()] + \
+                [grant for g in table_grants for grant in g.result()]
+
+            self.role_assignments = []
+            self.user_assignments = []
+            for r in role_grantees:
+                for grantee in r.result():
+                    if grantee["granted_to"] == "ROLE":
+                        self.role_assignments.append({"NAME": grantee["role"], "GRANTEE_NAME": grantee["grantee_name"]})
+                    elif grantee["granted_to"] == "USER":
+                        self.user_assignments.append({"NAME": grantee["role"], "GRANTEE_NAME": grantee["grantee_name"]})
+
+            tables_with_policies.result()
+
+    def __get_live_users__(self) -> List[SnowflakeUser]:
+        """
+        Retrieves the enabled users of the account with SHOW USERS.
+        Returns:
+            List[SnowflakeUser]: The enabled users.
+        """
+        users = self.__run_show__("SHOW USERS")
+        return [SnowflakeUser(name=user["name"],
+                              login_name=user["login_name"],
+                              email=user["email"])
+                for user in users if str(user["disabled"]).lower() != "true"]
 
-                ;"""
+    def __get_live_roles__(self) -> List[SnowflakeRole]:
+        """
+        Retrieves the account roles with SHOW ROLES.
+        Returns:
+            List[SnowflakeRole]: The account roles.
+        """
+        return [SnowflakeRole(name=role["name"]) for role in self.__run_show__("SHOW ROLES")]
 
-        agg_policies = self.__run_query__(query, columns=["POLICY_BODY", "POLICY_ID",
-                                                        "POLICY_NAME", "ref_database_name",
-                                                        "ref_schema_name",
-                                                        "ref_entity_name",
-                                                        "ref_column_name"])
-        
-        # JOIN POLICIES
+    def __get_live_role_grantees__(self, role_name: str) -> List[dict]:
+        """
+        Retrieves the users and roles a role is granted to with SHOW GRANTS OF ROLE.
+        Args:
+            role_name (str): The name of the role.
+        Returns:
+            List[dict]: The role, granted_to (USER or ROLE) and grantee_name of each grant.
+        """
+        return self.__run_show__(f"SHOW GRANTS OF ROLE {self.__quote_identifier__(role_name)}")
 
-        query = f"""
-                SELECT
-                    rap.POLICY_BODY,
-                    pr.POLICY_ID,
-                    pr.POLICY_NAME,
-                    pr.ref_database_name,
-                    pr.ref_schema_name,
-                    pr.ref_entity_name,
-                    pr.ref_column_name
-                FROM SNOWFLAKE.ACCOUNT_USAGE.POLICY_REFERENCES pr
-                JOIN SNOWFLAKE.ACCOUNT_USAGE.JOIN_POLICIES rap
-                    ON pr.POLICY_ID = rap.POLICY_ID
-                AND pr.REF_DATABASE_NAME = '{database.upper()}' AND REF_ENTITY_DOMAIN = 'TABLE' AND POLICY_STATUS = 'ACTIVE';          
-                """
-        
-        join_policies = self.__run_query__(query, columns=["POLICY_BODY", "POLICY_ID",
-                                                        "POLICY_NAME", "ref_database_name",
-                                                        "ref_schema_name",
-                                                        "ref_entity_name",
-                                                        "ref_column_name"])
+    def __get_live_tables__(self, source: Source) -> Dict[str, List[str]]:
+        """
+        Retrieves the schemas and tables of the source database with SHOW SCHEMAS and SHOW TABLES,
+        narrowed to the schemas and tables of the source configuration. Configured schemas that
+        do not exist in the database are skipped with a warning.
+        Args:
+            source (Source): The source database, schemas and tables.
+        Returns:
+            Dict[str, List[str]]: The table names of each schema.
+        """
+        database = self.__quote_identifier__(source.name)
 
-        # PROJECTION POLICIES
+        tables_by_schema = {}
+        for table in self.__run_show__(f"SHOW TABLES IN DATABASE {database}"):
+            tables_by_schema.setdefault(table["schema_name"], []).append(table["name"])
 
-        query = f"""                            
+        schemas = [s["name"] for s in self.__run_show__(f"SHOW SCHEMAS IN DATABASE {database}")
+                   if s["name"] != "INFORMATION_SCHEMA"]
+
+        if not source.schemas:
+            return {name: tables_by_schema.get(name, []) for name in schemas}
+
+        missing = [s.name for s in source.schemas if s.name not in schemas]
+        if missing:
+            self.logger.warning(f"Schemas {', '.join(missing)} not found in database {source.name}, skipping them.")
+
+        return {s.name: [t for t in tables_by_schema.get(s.name, []) if not s.tables or t in s.tables]
+                for s in source.schemas if s.name in schemas}
+
+    def __get_live_grants__(self, database: str, schema: str = None, table: str = None) -> List[SnowflakeGrant]:
+        """
+        Retrieves the role grants on a database, schema or table with SHOW GRANTS ON,
+        keeping the grants of grant_privileges when it is set.
+        Args:
+            database (str): The name of the database.
+            schema (str, optional): The name of the schema, for schema and table grants.
+            table (str, optional): The name of the table, for table grants.
+        Returns:
+            List[SnowflakeGrant]: The grants to roles on the object.
+        """
+        if table:
+            granted_on, name = "TABLE", table
+        elif schema:
+            granted_on, name = "SCHEMA", schema
+        else:
+            granted_on, name = "DATABASE", database
+
+        object_name = ".".join(self.__quote_identifier__(n) for n in [database, schema, table] if n)
+        grants = self.__run_show__(f"SHOW GRANTS ON {granted_on} {object_name}")
+
+        return [SnowflakeGrant(privilege=grant["privilege"],
+                               granted_on=granted_on,
+                               table_catalog=database,
+                               table_schema=schema,
+                               name=name,
+                               grantee_name=grant["grantee_name"]) for grant in grants
+                if grant["granted_to"] == "ROLE" and
+                (not self.grant_privileges or grant["privilege"] in self.grant_privileges)]
+
+    def __get_live_policy_references__(self, database: str, schema: str, table: str) -> List[dict]:
+        """
+        Retrieves the active policy references of a table with the INFORMATION_SCHEMA.POLICY_REFERENCES table function.
+        Args:
+            database (str): The name of the database.
+            schema (str): The name of the schema.
+            table (str): The name of the table.
+        Returns:
+            List[dict]: The policy references of the table, with the schema and database of each policy.
+        """
+        policy_kinds = ["MASKING_POLICY", "ROW_ACCESS_POLICY"] + self.sf_unsupported_policy_kinds
+        entity_name = ".".join(self.__quote_identifier__(n) for n in [database, schema, table])
+
+        query = f"""SELECT POLICY_KIND, POLICY_DB, POLICY_SCHEMA, POLICY_NAME,
+                           REF_DATABASE_NAME, REF_SCHEMA_NAME, REF_ENTITY_NAME, REF_COLUMN_NAME
+                    FROM TABLE({self.__quote_identifier__(database)}.INFORMATION_SCHEMA.POLICY_REFERENCES(
+                        REF_ENTITY_NAME => %s, REF_ENTITY_DOMAIN => 'table'))
+                    WHERE POLICY_KIND IN ({self.__placeholders__(policy_kinds)}) AND POLICY_STATUS = 'ACTIVE';"""
+
+        return self.__run_query__(query, columns=["POLICY_KIND", "POLICY_DB", "POLICY_SCHEMA", "POLICY_NAME",
+                                                  "ref_database_name", "ref_schema_name",
+                                                  "ref_entity_name", "ref_column_name"], params=[entity_name] + policy_kinds)
+
+    def __get_live_policy_bodies__(self, executor: ThreadPoolExecutor, policy_references: List[dict]) -> List[dict]:
+        """
+        Adds the bodies of the masking and row access policies to their references, describing each policy once.
+        References to masking and row access policies without a body are dropped.
+        Args:
+            executor (ThreadPoolExecutor): The executor the DESCRIBE commands are submitted to.
+            policy_references (List[dict]): The policy references of the source tables.
+        Returns:
+            List[dict]: The policy references with their POLICY_BODY.
+        """
+        commands = {"MASKING_POLICY": "DESCRIBE MASKING POLICY", "ROW_ACCESS_POLICY": "DESCRIBE ROW ACCESS POLICY"}
+
+        policies = dict.fromkeys((r["POLICY_KIND"], r["POLICY_DB"], r["POLICY_SCHEMA"], r["POLICY_NAME"])
+                                 for r in policy_references if r["POLICY_KIND"] in commands)
+        descriptions = {policy: executor.submit(self.__run_show__, f"{commands[policy[0]]} " +
+                                                ".".join(self.__quote_identifier__(n) for n in policy[1:]))
+                        for policy in policies}
+
+        bodies = {policy: description.result()[0]["body"] if description.result() else None
+                  for policy, description in descriptions.items()}
+
+        references = []
+        for r in policy_references:
+            policy = (r["POLICY_KIND"], r["POLICY_DB"], r["POLICY_SCHEMA"], r["POLICY_NAME"])
+            if r["POLICY_KIND"] in commands and not bodies[policy]:
+                continue
+            references.append(dict(r, POLICY_BODY=bodies.get(policy), POLICY_ID=None))
+
+        return references
+
+    def __get_policy_references__(self, source: Source) -> List[dict]:
+        """
+        Retrieves the active table references of every policy kind in the source database with a
+        single scan of POLICY_REFERENCES, narrowed to the configured schemas and tables. The bodies of
+        masking and row access policies are joined in, the references are dispatched by POLICY_KIND by the caller.
+        Args:
+            source (Source): The source database, schemas and tables.
+        Returns:
+            List[dict]: The policy references with their kind and, for masking and row access policies, their body.
+        """
+        policy_kinds = ["MASKING_POLICY", "ROW_ACCESS_POLICY"] + self.sf_unsupported_policy_kinds
+        source_filter, source_params = self.__get_source_filter__(source, "pr.REF_SCHEMA_NAME", "pr.REF_ENTITY_NAME")
+
+        query = f"""
                 SELECT
-                    rap.POLICY_BODY,
+                    pr.POLICY_KIND,
+                    COALESCE(mp.POLICY_BODY, rap.POLICY_BODY) AS POLICY_BODY,
                     pr.POLICY_ID,
                     pr.POLICY_NAME,
                     pr.ref_database_name,
@@ -251,21 +528,65 @@ class SnowflakeAPIClient:
                     pr.ref_entity_name,
                     pr.ref_column_name
                 FROM SNOWFLAKE.ACCOUNT_USAGE.POLICY_REFERENCES pr
-                JOIN SNOWFLAKE.ACCOUNT_USAGE.PROJECTION_POLICIES rap
-                    ON pr.POLICY_ID = rap.POLICY_ID
-                AND pr.REF_DATABASE_NAME = '{database.upper()}' AND REF_ENTITY_DOMAIN = 'TABLE' AND POLICY_STATUS = 'ACTIVE';
+                LEFT JOIN SNOWFLAKE.ACCOUNT_USAGE.MASKING_POLICIES mp
+                    ON pr.POLICY_KIND = 'MASKING_POLICY' AND pr.POLICY_ID = mp.POLICY_ID
+                LEFT JOIN SNOWFLAKE.ACCOUNT_USAGE.ROW_ACCESS_POLICIES rap
+                    ON pr.POLICY_KIND = 'ROW_ACCESS_POLICY' AND pr.POLICY_ID = rap.POLICY_ID
+                WHERE pr.POLICY_KIND IN ({self.__placeholders__(policy_kinds)})
+                AND pr.REF_DATABASE_NAME = %s AND pr.REF_ENTITY_DOMAIN = 'TABLE' AND pr.POLICY_STATUS = 'ACTIVE'
+                AND (pr.POLICY_KIND NOT IN ('MASKING_POLICY', 'ROW_ACCESS_POLICY') OR COALESCE(mp.POLICY_BODY, rap.POLICY_BODY) IS NOT NULL)
+                {"AND " + source_filter if source_filter else ""};
+                """
 
-                ;"""
+        return self.__run_query__(query, columns=["POLICY_KIND", "POLICY_BODY", "POLICY_ID",
+                                                  "POLICY_NAME", "ref_database_name",
+                                                  "ref_schema_name",
+                                                  "ref_entity_name",
+                                                  "ref_column_name"],
+                                  params=policy_kinds + [source.name.upper()] + source_params)
 
-        projection_policies = self.__run_query__(query, columns=["POLICY_BODY", "POLICY_ID",
-                                                        "POLICY_NAME", "ref_database_name",
-                                                        "ref_schema_name",
-                                                        "ref_entity_name",
-                                                        "ref_column_name"])
+    def __get_source_filter__(self, source: Source, schema_column: str, table_column: str = None) -> Tuple[str, List[str]]:
+        """
+        Builds a SQL condition restricting a query to the schemas and tables of the source configuration.
+        Args:
+            source (Source): The source database, schemas and tables.
+            schema_column (str): The column holding the schema name.
+            table_column (str, optional): The column holding the table name. When omitted, only schemas are filtered.
+        Returns:
+            Tuple[str, List[str]]: The condition with %s placeholders and its bind parameters,
+            or an empty condition if the source is not restricted to schemas.
+        """
+        if not source.schemas:
+            return "", []
+
+        conditions, params = [], []
+        for schema in source.schemas:
+            if table_column and schema.tables:
+                conditions.append(f"({schema_column} = %s AND {table_column} IN ({self.__placeholders__(schema.tables)}))")
+                params.extend([schema.name] + list(schema.tables))
+            else:
+                conditions.append(f"{schema_column} = %s")
+                params.append(schema.name)
 
+        return f"({' OR '.join(conditions)})", params
 
-        unsupported_policies = agg_policies + join_policies + projection_policies
+    @staticmethod
+    def __placeholders__(values: List) -> str:
+        """
+        Returns the bind placeholders for a list of values.
+        Args:
+            values (List): The values to bind.
+        Returns:
+            str: One %s placeholder per value, comma separated.
+        """
+        return ", ".join(["%s"] * len(values))
 
+    def __get_unsupported_policies__(self, unsupported_policies: List[dict]) -> None:
+        """
+        Records the tables referenced by aggregation, join or projection policies, which are not supported.
+        Args:
+            unsupported_policies (List[dict]): The AGGREGATION_POLICY, JOIN_POLICY and PROJECTION_POLICY references.
+        """
         unsupported_tables = [SnowflakeTableWithPolicy(database_name=up["ref_database_name"],
                                                        schema_name=up["ref_schema_name"],
                                                        table_name=up["ref_entity_name"],
@@ -273,83 +594,61 @@ class SnowflakeAPIClient:
 
         self.unsupported_tables = unsupported_tables
 
-                                  
-
     def __get_grants__(self, source: Source) -> List[SnowflakeGrant]:
+        """
+        Retrieves the grants on the source database and on its configured schemas and tables.
+        The schema and table filters are applied in the query, so only the grants in scope are transferred,
+        as is the privilege filter when grant_privileges is set, and the results are streamed in batches.
+        Args:
+            source (Source): The source database, schemas and tables.
+        Returns:
+            List[SnowflakeGrant]: The database grants, followed by the schema and table grants.
+        """
+        schema_filter, schema_params = self.__get_source_filter__(source, "TABLE_SCHEMA")
+        table_filter, table_params = self.__get_source_filter__(source, "TABLE_SCHEMA", "NAME")
 
-        query = f"""select   "PRIVILEGE", "GRANTED_ON", "TABLE_CATALOG", "TABLE_SCHEMA", "NAME", "GRANTEE_NAME"
+        query = """select   "PRIVILEGE", "GRANTED_ON", "TABLE_CATALOG", "TABLE_SCHEMA", "NAME", "GRANTEE_NAME"
                     from     SNOWFLAKE.ACCOUNT_USAGE.GRANTS_TO_ROLES
                     where    DELETED_ON is null and
                             GRANTED_ON in ('TABLE','SCHEMA','DATABASE') and
-                            TABLE_CATALOG = '{source.name}'"""
-        
-        grants_raw = self.__run_query__(query, columns=["PRIVILEGE", "GRANTED_ON", "TABLE_CATALOG", "TABLE_SCHEMA", "NAME", "GRANTEE_NAME"]) 
-
-        database_grants = [grant for grant in grants_raw if grant["GRANTED_ON"] == "DATABASE"]
-        schema_grants = [grant for grant in grants_raw if grant["GRANTED_ON"] == "SCHEMA"]
-        table_grants = [grant for grant in grants_raw if grant["GRANTED_ON"] == "TABLE"]
+                            TABLE_CATALOG = %s"""
+        params = [source.name]
 
         if source.schemas:
-            # filter grants based on provided schemas and tables
-            schema_names = [s.name for s in source.schemas]
-            filtered_schema_grants = [grant for grant in schema_grants if grant["TABLE_SCHEMA"] in schema_names]
-            filtered_table_grants = [grant for grant in table_grants if grant["TABLE_SCHEMA"] in schema_names]
-            schema_grants = filtered_schema_grants
-            table_grants = filtered_table_grants
-
-            filtered_table_grants = []
-            for s in source.schemas:
-                if s.tables:
-                    filtered_table_grants_per_schema = [grant for grant in table_grants if grant["TABLE_SCHEMA"] == s.name and grant["NAME"] in s.tables]
-                else:
-                    filtered_table_grants_per_schema = [grant for grant in table_grants if grant["TABLE_SCHEMA"] == s.name]
-                filtered_table_grants.extend(filtered_table_grants_per_schema)
-            
-            table_grants = filtered_table_grants
-
-        grants_raw = database_grants + schema_grants + table_grants
-
-        grants = [SnowflakeGrant(privilege=grant["PRIVILEGE"],
-                                 granted_on=grant["GRANTED_ON"],
-                                 table_catalog=grant["TABLE_CATALOG"],
-                                 table_schema=grant["TABLE_SCHEMA"],
-                                 name=grant["NAME"],
-                                 grantee_name=grant["GRANTEE_NAME"]) for grant in grants_raw]
-        
-        return grants
-    
-    def __get_row_access_policies__(self, database: str) -> None:
-        """Retrieves the row access policies for a specific database.
+            query += f""" and
+                            (GRANTED_ON = 'DATABASE' or
+                             (GRANTED_ON = 'SCHEMA' and {schema_filter}) or
+                             (GRANTED_ON = 'TABLE' and {table_filter}))"""
+            params += schema_params + table_params
+
+        if self.grant_privileges:
+            query += f""" and
+                            PRIVILEGE in ({self.__placeholders__(self.grant_privileges)})"""
+            params += list(self.grant_privileges)
+
+        columns = ["PRIVILEGE", "GRANTED_ON", "TABLE_CATALOG", "TABLE_SCHEMA", "NAME", "GRANTEE_NAME"]
+        grants_by_kind = {"DATABASE": [], "SCHEMA": [], "TABLE": []}
+
+        # stream the grants and group them by object type as they arrive
+        for batch in self.__run_query_batches__(query, columns, params=params):
+            for privilege, granted_on, table_catalog, table_schema, name, grantee_name in zip(*(batch[c] for c in columns)):
+                grants_by_kind[granted_on].append(SnowflakeGrant(privilege=privilege,
+                                                                 granted_on=granted_on,
+                                                                 table_catalog=table_catalog,
+                                                                 table_schema=table_schema,
+                                                                 name=name,
+                                                                 grantee_name=grantee_name))
+
+        return grants_by_kind["DATABASE"] + grants_by_kind["SCHEMA"] + grants_by_kind["TABLE"]
+
+    def __get_row_access_policies__(self, row_access_policies: List[dict]) -> None:
+        """Builds the row access policies of a database from their policy references.
         Args:
-            database (str): The name of the database for which to retrieve row access policies.
+            row_access_policies (List[dict]): The ROW_ACCESS_POLICY references with their policy body.
         """
-    
-        query = f"""                            
-                SELECT
-                    rap.POLICY_BODY,
-                    pr.POLICY_ID,
-                    pr.POLICY_NAME,
-                    pr.ref_database_name,
-                    pr.ref_schema_name,
-                    pr.ref_entity_name,
-                    pr.ref_column_name
-                FROM SNOWFLAKE.ACCOUNT_USAGE.POLICY_REFERENCES pr
-                JOIN SNOWFLAKE.ACCOUNT_USAGE.ROW_ACCESS_POLICIES rap
-                    ON pr.POLICY_ID = rap.POLICY_ID
-                AND pr.REF_DATABASE_NAME = '{database.upper()}' AND REF_ENTITY_DOMAIN = 'TABLE' AND POLICY_STATUS = 'ACTIVE';
-
-                ;"""
-
-        row_access_policies = self.__run_query__(query, columns=["POLICY_BODY", "POLICY_ID",
-                                                        "POLICY_NAME", "ref_database_name",
-                                                        "ref_schema_name",
-                                                        "ref_entity_name",
-                                                        "ref_column_name"])
-        
         self.row_access_policies = list()
-        self.tables_with_raps = list()
         for rap in row_access_policies:
-            extraction = self.__extract_logic_from_row_filter__(rap["POLICY_BODY"])
+            extraction = self.policy_parser.parse_row_access_policy(rap["POLICY_BODY"], rap["POLICY_ID"])
             mp = SnowflakeRowFilter(id=rap["POLICY_ID"],
                                     name=rap["POLICY_NAME"],
                                     database_name=rap["ref_database_name"],
@@ -359,165 +658,15 @@ class SnowflakeAPIClient:
                                     details=extraction
                                     )
             self.row_access_policies.append(mp)
-
-            query = f"""SELECT COLUMN_NAME FROM SNOWFLAKE.ACCOUNT_USAGE.COLUMNS WHERE TABLE_CATALOG = '{mp.database_name}' AND TABLE_SCHEMA = '{mp.schema_name}' AND TABLE_NAME = '{mp.table_name}';"""
-            columns = self.__run_query__(query, columns=["COLUMN_NAME"])
-            column_names = [c["COLUMN_NAME"] for c in columns]
-            self.tables_with_raps.append(SnowflakeTableWithPolicy(
-                database_name=mp.database_name,
-                schema_name=mp.schema_name,
-                table_name=mp.table_name,
-                column_names=column_names
-            ))
-        
-    def __extract_case_when_logic_row_filter__(self,sql_definition: str) -> RowFilterDetails:
-            """
-            Parse a CASE WHEN row filter definition to extract group memberships and their values.
-            
-            Args:
-                sql_definition: The SQL CASE statement from a row filter
-                
-            Returns:
-                Dictionary containing:
-                - groups: List of dicts with 'group_name' and 'return_value'
-                - default_value: The ELSE clause value
-                - filter_type: The type of filter logic
-            """
-            result = RowFilterDetails(groups=[], default_value=None, row_filter_type=RowFilterType.EXPLICIT_GROUP_MEMBERSHIP)
-
-            # Remove CASE and END
-            content = sql_definition.replace('CASE', '').replace('END', '').strip()
-            
-            # Find all WHEN...THEN patterns
-            when_pattern = r"WHENcurrent_role\(\)in\('([^']+)'\)THEN([^W]+?)(?=WHEN|ELSE|$)"
-            when_matches = re.findall(when_pattern, content)
-            
-            # Find ELSE clause
-            else_pattern = r"ELSE(.+?)$"
-            else_match = re.search(else_pattern, content)
-                        
-            # Extract group and expression pairs
-            for group, expression in when_matches:
-                result.groups.append(RowFilterDetailGroup(group_name=group, return_value=expression.strip()))
-            
-            # Add ELSE clause if exists
-            if else_match:
-                result.default_value = else_match.group(1).strip()
-
-            return result
-            
-
-    def __extract_if_logic_row_filter__(self, definition: str) -> RowFilterDetails:
-        """
-        Parse an IF row filter definition to extract group membership and their values.
         
+    def __get_column_masks__(self, masking_policies: List[dict]) -> None:
+        """Builds the column masking policies of a database from their policy references.
         Args:
-            sql_definition: The SQL IF statement from a row filter
-        Returns:
-            Dictionary containing:
-
+            masking_policies (List[dict]): The MASKING_POLICY references with their policy body.
         """
-        
-        group_name = definition[17:].split("'")[1]
-        start_in = f"current_role()in('{group_name}'"
-        equal = definition == f"current_role()=('{group_name}')"
-        if not (definition.startswith(start_in) or equal):
-            self.logger.warning("Unexpected format: does not match expected start")
-            return result
-        
-        if equal:
-            result = RowFilterDetails(
-            groups=[RowFilterDetailGroup(
-                group_name=group_name,
-                return_value="true"
-            )],
-            default_value="false",
-            row_filter_type=RowFilterType.EXPLICIT_GROUP_MEMBERSHIP)
-            return result
-
-        result = RowFilterDetails(
-            groups=[],
-            default_value="false",
-            row_filter_type=RowFilterType.EXPLICIT_GROUP_MEMBERSHIP
-        )
-        group_names = definition[17:].split("'")
-        for i, group_name in enumerate(group_names):
-            if i % 2 == 0:
-                continue
-            else:
-                rfdg = RowFilterDetailGroup(
-                    group_name=group_name,
-                    return_value="true"
-                )
-                result.groups.append(rfdg)
-
-        return result
-
-
-    def __extract_logic_from_row_filter__(self, sql_definition: str) -> RowFilterDetails:
-        """
-        Extracts the group name and mask pattern from a column mask function definition.
-        
-        Args:
-            sql_definition (str): The SQL definition containing is_account_group_member function
-
-        Returns:
-            ColumnMaskExtraction: An object containing the extracted group name and mask pattern
-        """
-
-        result = RowFilterDetails(row_filter_type=RowFilterType.UNSUPPORTED)
-        definition = sql_definition.replace("\n", " ").replace("\r", " ").replace(" ", "") 
-
-        if definition.startswith("current_role()"):
-            result_ = self.__extract_if_logic_row_filter__(definition)
-        elif definition.startswith("CASEWHENcurrent_role()"):
-            result_ = self.__extract_case_when_logic_row_filter__(definition)
-        else:
-            result_ = None
-            
-        
-        if result_:
-            return result_
-        self.logger.warning("Unexpected format: does not start 'current_role()' or start with 'CASEWHENcurrent_role('")
-
-        return result
-    
-    def __get_column_masks__(self, database: str) -> List[SnowflakeColumnMask]:
-        """Retrieves the column masking policies for a specific database.
-        Args:
-            database (str): The name of the database for which to retrieve column masking policies.
-        Returns:
-            List[SnowflakeMaskingPolicy]: A list of SnowflakeMaskingPolicy objects representing the column masking policies.
-        """
-
-        query = f"""                            
-                SELECT
-                    mp.POLICY_BODY,
-                    pr.POLICY_ID,
-                    pr.POLICY_NAME,
-                    pr.ref_database_name,
-                    pr.ref_schema_name,
-                    pr.ref_entity_name,
-                    pr.ref_column_name
-                FROM SNOWFLAKE.ACCOUNT_USAGE.POLICY_REFERENCES pr
-                JOIN SNOWFLAKE.ACCOUNT_USAGE.MASKING_POLICIES mp
-                    ON pr.POLICY_ID = mp.POLICY_ID
-                WHERE pr.POLICY_KIND = 'MASKING_POLICY'
-                AND pr.REF_DATABASE_NAME = '{database.upper()}' AND REF_ENTITY_DOMAIN = 'TABLE' AND POLICY_STATUS = 'ACTIVE';
-
-                ;"""
-
-        masking_policies = self.__run_query__(query, columns=["POLICY_BODY", "POLICY_ID",
-                                                                   "POLICY_NAME", "ref_database_name",
-                                                                   "ref_schema_name",
-                                                                   "ref_entity_name",
-                                                                   "ref_column_name"])
-        
-        
         self.masking_policies = list()
-        self.tables_with_masks = list()
         for mp in masking_policies:
-            extraction = self.__process_masking_policy__(mp["POLICY_BODY"])
+            extraction = self.policy_parser.parse_masking_policy(mp["POLICY_BODY"], mp["POLICY_ID"])
             mp = SnowflakeMaskingPolicy(id=mp["POLICY_ID"],
                                         name=mp["POLICY_NAME"],
                                         database_name=mp["ref_database_name"],
@@ -529,115 +678,142 @@ class SnowflakeAPIClient:
                                         column_mask_type=extraction.column_mask_type
                                         )
             self.masking_policies.append(mp)
-  
-            query = f"""SELECT COLUMN_NAME FROM SNOWFLAKE.ACCOUNT_USAGE.COLUMNS WHERE TABLE_CATALOG = '{mp.database_name}' AND TABLE_SCHEMA = '{mp.schema_name}' AND TABLE_NAME = '{mp.table_name}'  AND DELETED is null;"""
-            columns = self.__run_query__(query, columns=["COLUMN_NAME"])
-            column_names = [c["COLUMN_NAME"] for c in columns]
-            self.tables_with_masks.append(SnowflakeTableWithPolicy(
-                database_name=mp.database_name,
-                schema_name=mp.schema_name,
-                table_name=mp.table_name,
-                column_names=column_names
-            ))
-             
-
-    def __process_masking_policy__(self, policy_body: str) -> SnowflakeColumnMaskExtraction:
-        """
-        Processes a masking policy dictionary to extract the mask type, group name, and mask pattern.
+
+    def __get_tables_with_policies__(self) -> None:
+        """
+        Builds the tables with masks and the tables with row access policies, one entry per table,
+        from a single bulk lookup of the columns of every referenced table.
+        """
+        masked_tables = [(mp.database_name, mp.schema_name, mp.table_name) for mp in self.masking_policies]
+        rap_tables = [(rap.database_name, rap.schema_name, rap.table_name) for rap in self.row_access_policies]
+
+        table_columns = self.__get_table_columns__(masked_tables + rap_tables)
+
+        self.tables_with_masks = [SnowflakeTableWithPolicy(database_name=database, schema_name=schema,
+                                                           table_name=table, column_names=list(table_columns[(database, schema, table)]))
+                                  for (database, schema, table) in dict.fromkeys(masked_tables)]
+        self.tables_with_raps = [SnowflakeTableWithPolicy(database_name=database, schema_name=schema,
+                                                          table_name=table, column_names=list(table_columns[(database, schema, table)]))
+                                 for (database, schema, table) in dict.fromkeys(rap_tables)]
+
+    def __get_table_columns__(self, tables: Iterable[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], List[str]]:
+        """
+        Retrieves the columns of a set of tables with one COLUMNS query per database.
+        The query is narrowed to the referenced schemas and table names and the rows are
+        grouped by table client-side. In live mode the INFORMATION_SCHEMA of the database is read.
         Args:
-            mp (dict): A dictionary representing a masking policy.
+            tables (Iterable[Tuple[str, str, str]]): The (database, schema, table) of each referenced table.
         Returns:
-            SnowflakeColumnMask: A SnowflakeColumnMask object with the extracted information.
+            Dict[Tuple[str, str, str], List[str]]: The column names of each table, in ordinal order.
         """
+        table_columns = {table: [] for table in tables}
+        tables_by_database = {}
 
-        result = SnowflakeColumnMaskExtraction(column_mask_type=ColumnMaskType.UNSUPPORTED)
+        for (database, schema, table) in table_columns:
+            tables_by_database.setdefault(database, []).append((schema, table))
 
-        definition = policy_body.replace("\n", " ").replace("\r", " ").replace(" ", "")
+        for database, refs in tables_by_database.items():
+            schemas = sorted({s for (s, _) in refs})
+            names = sorted({t for (_, t) in refs})
 
-        if not(definition[:8] == "CASEWHEN" and definition[8:24] == "CURRENT_ROLE()IN"):
-            self.logger.warning("Unexpected format: does not start with 'CASE WHEN CURRENT_ROLE() IN'")
-            return result
-        group_names = definition[25:].split(")")[0].replace("'", "").replace('"', '')
+            if self.live_mode:
+                view, deleted = f"{self.__quote_identifier__(database)}.INFORMATION_SCHEMA.COLUMNS", ""
+            else:
+                view, deleted = "SNOWFLAKE.ACCOUNT_USAGE.COLUMNS", " AND DELETED is null"
 
-        index_ = 25 + len(group_names) + 3
-        if definition[index_:index_+4] != "THEN":
-            self.logger.warning("Unexpected format: 'THEN' not found where expected.")
-            return result
-        split_ = definition[index_ + 4 : ].split("ELSE")
+            query = f"""SELECT TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME
+                        FROM {view}
+                        WHERE TABLE_CATALOG = %s AND TABLE_SCHEMA IN ({self.__placeholders__(schemas)})
+                        AND TABLE_NAME IN ({self.__placeholders__(names)}){deleted}
+                        ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION;"""
 
-        mask = None
-        column_name_pos = None
-        assigned_value = split_[0]
-        if assigned_value[0] in ["'", '"']:
-            assigned_value = assigned_value[1:-1]
-            mask = assigned_value
-        else:
-            column_name_pos = 1
+            columns = self.__run_query__(query, columns=["TABLE_CATALOG", "TABLE_SCHEMA", "TABLE_NAME", "COLUMN_NAME"],
+                                         params=[database] + schemas + names)
 
-        unassigned_value = split_[1].replace("END", "")
-        if unassigned_value[0] in ["'", '"']:
-            unassigned_value = unassigned_value[1:-1]
-            mask = unassigned_value
-        else:
-            column_name_pos = 2
-
-        result.group_names = group_names.split(",")
-        result.mask_pattern = mask
-        if column_name_pos == 1:
-            result.column_mask_type = ColumnMaskType.UNMASK_FOR_GROUP
-        elif column_name_pos == 2:
-            result.column_mask_type = ColumnMaskType.MASK_FOR_GROUP
-        else:
-            result.column_mask_type = ColumnMaskType.UNSUPPORTED
+            for c in columns:
+                key = (c["TABLE_CATALOG"], c["TABLE_SCHEMA"], c["TABLE_NAME"])
+                if key in table_columns:
+                    table_columns[key].append(c["COLUMN_NAME"])
 
-        
-        return result
+        return table_columns
 
+    @staticmethod
+    def __quote_identifier__(value: str) -> str:
+        """
+        Quotes a value as a SQL identifier, so it is matched with its exact case.
+        Args:
+            value (str): The identifier to quote.
+        Returns:
+            str: The identifier in double quotes, with embedded double quotes escaped.
+        """
+        value = value.replace('"', '""')
+        return f'"{value}"'
 
 
-    def __get_user_role_assignment__(self, user: SnowflakeUserOrRole, is_user: bool) -> List[SnowflakeRole]:
-        
+    def __get_user_role_assignment__(self, user: SnowflakeUserOrRole, is_user: bool,
+                                     roles_by_name: Dict[str, SnowflakeRole] = None) -> List[SnowflakeRole]:
+        """
+        Returns the roles granted to a user or role, directly or inherited through the granted roles.
+        Args:
+            user (SnowflakeUserOrRole): The user or role.
+            is_user (bool): True if the grantee is a user, False if it is a role.
+            roles_by_name (Dict[str, SnowflakeRole], optional): The roles indexed by name, built when not given.
+        Returns:
+            List[SnowflakeRole]: The directly granted roles followed by the inherited roles, each in the
+                row order of the GRANTS_TO_USERS and GRANTS_TO_ROLES grants.
+        """
         if is_user:
-            directly_assigned = [role["NAME"] for role in self.user_assignments if role["GRANTEE_NAME"] == user.name]
+            role_names = self.role_graph.get_user_roles(user.name)
         else:
-            directly_assigned = [role["NAME"] for role in self.role_assignments if role["GRANTEE_NAME"] == user.name]
-
-        assigned_roles = [role for role in self.roles if role.name in directly_assigned]
-
-        # Inherited assignment
-        for role in assigned_roles:
-            inherited_roles = self.__get_user_role_assignment__(role, is_user=False)
-            assigned_roles.extend(inherited_roles)
+            role_names = self.role_graph.get_inherited_roles(user.name)
 
-        return assigned_roles
-
-    def __get_user_role_assignments__(self) -> dict[str, List[SnowflakeRole]]:
-        user_role_assignments = dict()
-        for user in self.users:
-            user_role_assignments[user.name] = self.__get_user_role_assignment__(user, is_user=True)
-
-        for role in self.roles:
-            user_role_assignments[role.name] = self.__get_user_role_assignment__(role, is_user=False)
-
-        return user_role_assignments
+        if roles_by_name is None:
+            roles_by_name = self.__get_roles_by_name__()
+        return [roles_by_name[name] for name in role_names if name in roles_by_name]
 
     def __get_role_membership__(self, role_name) -> Tuple[List[str], List[str]]:
+        """
+        Returns the users and roles a role is granted to, directly or through other roles.
+        Args:
+            role_name (str): The name of the role.
+        Returns:
+            Tuple[List[str], List[str]]: The names of the member users and member roles.
+        """
+        return self.role_graph.get_member_users(role_name), self.role_graph.get_member_roles(role_name)
 
-        users = [user["GRANTEE_NAME"] for user in self.user_assignments if user["NAME"] == role_name]
-        roles = list()
-
-        for role_ass in self.role_assignments:
-            if role_ass["NAME"] == role_name:
-                roles.append(role_ass["GRANTEE_NAME"])
+    @staticmethod
+    def __get_positions_by_name__(items: List[SnowflakeUserOrRole]) -> Dict[str, int]:
+        """
+        Returns the position of the users or roles indexed by name, keeping the first of each name.
+        Args:
+            items (List[SnowflakeUserOrRole]): The users or roles.
+        Returns:
+            Dict[str, int]: The index of name -> position in items.
+        """
+        positions = dict()
+        for position, item in enumerate(items):
+            positions.setdefault(item.name, position)
 
-                users_, roles_ = self.__get_role_membership__(role_name=role_ass["GRANTEE_NAME"])
-                users.extend(users_)
-                roles.extend(roles_)
+        return positions
 
-        return users, roles
+    def __get_roles_by_name__(self) -> Dict[str, SnowflakeRole]:
+        """
+        Returns the roles of the account indexed by name, keeping the first role of each name.
+        Returns:
+            Dict[str, SnowflakeRole]: The index of role name -> role.
+        """
+        roles_by_name = dict()
+        for role in self.roles:
+            roles_by_name.setdefault(role.name, role)
 
-    def __get_role_memberships__(self) -> dict[str, SnowflakeRoleMemberMap]:
+        return roles_by_name
 
+    def __get_role_assignments__(self) -> List[dict]:
+        """
+        Retrieves the grants of roles to roles.
+        Returns:
+            List[dict]: The granted role NAME and the GRANTEE_NAME role of each grant.
+        """
         role_query = f"""select  "NAME", GRANTEE_NAME
                     from    SNOWFLAKE.ACCOUNT_USAGE.GRANTS_TO_ROLES
                     where   GRANTED_TO = 'ROLE' and
@@ -645,21 +821,36 @@ class SnowflakeAPIClient:
                             DELETED_ON is null and
                             PRIVILEGE = 'USAGE'"""
 
-        self.role_assignments = self.__run_query__(role_query, columns=["NAME", "GRANTEE_NAME"])
+        return self.__run_query__(role_query, columns=["NAME", "GRANTEE_NAME"])
 
+    def __get_user_assignments__(self) -> List[dict]:
+        """
+        Retrieves the grants of roles to users.
+        Returns:
+            List[dict]: The granted role NAME and the GRANTEE_NAME user of each grant.
+        """
         user_query = f"""select   "ROLE", GRANTEE_NAME 
                         from     SNOWFLAKE.ACCOUNT_USAGE.GRANTS_TO_USERS
                         WHERE DELETED_ON is null"""
 
-        self.user_assignments = self.__run_query__(user_query, columns=["NAME", "GRANTEE_NAME"])
+        return self.__run_query__(user_query, columns=["NAME", "GRANTEE_NAME"])
+
+    def __get_role_memberships__(self) -> dict[str, SnowflakeRoleMemberMap]:
+        """
+        Resolves the member users and roles of every role from the role graph.
+        Returns:
+            dict[str, SnowflakeRoleMemberMap]: The members of each role, in account order.
+        """
+        user_positions = self.__get_positions_by_name__(self.users)
+        role_positions = self.__get_positions_by_name__(self.roles)
 
         role_memberships = dict()
         for role in self.roles:
             role_name = role.name
             users, roles = self.__get_role_membership__(role_name)
 
-            member_users = [user for user in self.users if user.name in users]
-            member_roles = [role for role in self.roles if role.name in roles]
+            member_users = [self.users[p] for p in sorted(user_positions[u] for u in users if u in user_positions)]
+            member_roles = [self.roles[p] for p in sorted(role_positions[r] for r in roles if r in role_positions)]
 
             role_memberships[role_name] = SnowflakeRoleMemberMap(
                 role_name=role_name,
@@ -1,12 +1,13 @@
+import functools
 import json
 import logging
 import os
 from pydantic.json import pydantic_encoder
 
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 from policyweaver.core.common import PolicyWeaverCore
-from policyweaver.plugins.snowflake.model import SnowflakeGrant, SnowflakeMaskingPolicy, SnowflakeRole, SnowflakeSourceMap, SnowflakeUser
+from policyweaver.plugins.snowflake.model import SnowflakeGrant, SnowflakeMaskingPolicy, SnowflakeRole, SnowflakeRowFilter, SnowflakeSourceMap, SnowflakeUser
 
 from policyweaver.models.export import (
     PermissionScope, PolicyExport, Policy, Permission, PermissionObject, RolePolicy, RolePolicyExport, ColumnConstraint, RowConstraint
@@ -18,6 +19,7 @@ from policyweaver.core.enum import (
 
 from policyweaver.core.utility import Utils
 from policyweaver.core.common import PolicyWeaverCore
+from policyweaver.core.parallel import fork_map
 from policyweaver.plugins.snowflake.api import SnowflakeAPIClient
 
 class SnowflakePolicyWeaver(PolicyWeaverCore):
@@ -29,6 +31,8 @@ class SnowflakePolicyWeaver(PolicyWeaverCore):
     sf_read_permissions = ["SELECT", "OWNERSHIP"]
     sf_database_read_prereqs = ["USAGE", "OWNERSHIP"]
     sf_schema_read_prereqs = ["USAGE", "OWNERSHIP"]
+    # Every privilege evaluated above, the API client reads only the grants of these privileges.
+    sf_evaluated_privileges = list(dict.fromkeys(sf_read_permissions + sf_database_read_prereqs + sf_schema_read_prereqs))
 
     def __init__(self, config:SnowflakeSourceMap) -> None:
         """
@@ -46,7 +50,15 @@ class SnowflakePolicyWeaver(PolicyWeaverCore):
         self.workspace = None
         self.account = None
         self.snapshot = {}
-        self.api_client = SnowflakeAPIClient()
+        self.grant_index = {}
+        self.roles_by_name = {}
+        self.users_by_name = {}
+        self.permission_objects = {}
+        self.column_constraints = {}
+        self.row_constraints = {}
+        self.api_client = SnowflakeAPIClient(max_connections=config.snowflake.max_connections or 4,
+                                             live_mode=config.snowflake.live_mode or False,
+                                             grant_privileges=self.sf_evaluated_privileges)
 
     def __init_environment(self, config:SnowflakeSourceMap) -> None:
         os.environ["SNOWFLAKE_ACCOUNT"] = config.snowflake.account_name
@@ -79,26 +91,80 @@ class SnowflakePolicyWeaver(PolicyWeaverCore):
 
         if not config.snowflake.warehouse:
             raise ValueError("Snowflake warehouse is required in the configuration.")
+
+        if config.snowflake.max_connections is not None and config.snowflake.max_connections < 1:
+            raise ValueError("Snowflake max connections must be at least 1.")
     
+    @staticmethod
+    def __grant_object__(granted_on: str, table_catalog: str, table_schema: str, name: str):
+        """
+        Returns the object a grant applies to, as used in the grant index.
+        Tables are qualified by database and schema, databases and schemas are matched by name.
+        Args:
+            granted_on (str): The object type of the grant.
+            table_catalog (str): The database of the object.
+            table_schema (str): The schema of the object.
+            name (str): The name of the object.
+        Returns:
+            The object key of the grant.
+        """
+        if granted_on == "TABLE":
+            return (table_catalog, table_schema, name)
+        return name
+
+    def __build_grant_index__(self) -> None:
+        """
+        Indexes the grants, roles and users of the database map once per run, so grant
+        validation is a handful of dictionary lookups instead of scans of the grants list,
+        and resets the permission objects cached for the previous run.
+        """
+        self.grant_index = {}
+        self.permission_objects = {}
+        self.__index_grants__(self.map.grants)
+
+        self.roles_by_name = {}
+        for role in self.map.roles:
+            self.roles_by_name.setdefault(role.name, role)
+
+        self.users_by_name = {}
+        for user in self.map.users:
+            self.users_by_name.setdefault(user.name, user)
+
+    def __index_grants__(self, grants: List[SnowflakeGrant]) -> None:
+        """
+        Adds grants to the (grantee, granted_on, object) -> privileges index.
+        Args:
+            grants (List[SnowflakeGrant]): The grants to index.
+        """
+        for grant in grants:
+            key = (grant.grantee_name, grant.granted_on,
+                   self.__grant_object__(grant.granted_on, grant.table_catalog, grant.table_schema, grant.name))
+            self.grant_index.setdefault(key, set()).add(grant.privilege)
+
+    def __has_privilege__(self, grantee_name: str, granted_on: str, grant_object, privileges: List[str]) -> bool:
+        """
+        Checks whether a grantee holds any of the privileges on an object through a direct grant.
+        Args:
+            grantee_name (str): The name of the user or role.
+            granted_on (str): The object type.
+            grant_object: The object key, see __grant_object__.
+            privileges (List[str]): The accepted privileges.
+        Returns:
+            bool: True if any of the privileges is granted.
+        """
+        granted = self.grant_index.get((grantee_name, granted_on, grant_object))
+        return bool(granted) and not granted.isdisjoint(privileges)
+
     def __validate_table_grant__(self, grant_to_validate: SnowflakeGrant, role: SnowflakeRole):
 
-        role_grants = [g for g in self.map.grants if g.grantee_name == role.name
-                and g.granted_on == "TABLE"
-                and g.name == grant_to_validate.name
-                and g.table_schema == grant_to_validate.table_schema
-                and g.table_catalog == grant_to_validate.table_catalog]
-        if any(g.privilege in self.sf_read_permissions for g in role_grants):
+        table = self.__grant_object__("TABLE", grant_to_validate.table_catalog,
+                                      grant_to_validate.table_schema, grant_to_validate.name)
+
+        if self.__has_privilege__(role.name, "TABLE", table, self.sf_read_permissions):
             return False
-                
-        for role_assignment in role.role_assignments:
-            role_grants = [g for g in self.map.grants if g.grantee_name == role_assignment.name 
-                           and g.granted_on == "TABLE"
-                           and g.name == grant_to_validate.name
-                           and g.table_schema == grant_to_validate.table_schema
-                           and g.table_catalog == grant_to_validate.table_catalog]
-            if any(g.privilege in self.sf_read_permissions for g in role_grants):
-                return True
-        return False
+
+        return any(self.__has_privilege__(role_assignment.name, "TABLE", table, self.sf_read_permissions)
+                   for role_assignment in role.role_assignments)
 
 
     def __validate_grant__(self, grant_to_validate: SnowflakeGrant):
@@ -107,43 +173,19 @@ class SnowflakePolicyWeaver(PolicyWeaverCore):
         database = grant_to_validate.table_catalog
         schema = grant_to_validate.table_schema
 
-        role_user = [role for role in self.map.roles if role.name == grantee_name]
-        if not role_user:
-            role_user = [user for user in self.map.users if user.name == grantee_name]
+        role_user = self.roles_by_name.get(grantee_name) or self.users_by_name.get(grantee_name)
         if not role_user:
             return False
-        role_user = role_user[0]
-
-        # Check if the grantee has usage permission on database
-        db_grants = [grant for grant in self.map.grants if grant.grantee_name == grantee_name 
-                     and grant.granted_on == "DATABASE"
-                     and grant.name == database]
-        has_db_usage = any(grant.privilege in self.sf_database_read_prereqs for grant in db_grants)
-
-        if not has_db_usage:
-            # If not check privileges via role assignments
-            for role_assignment in role_user.role_assignments:
-                db_grants = [grant for grant in self.map.grants if grant.grantee_name == role_assignment.name
-                             and grant.granted_on == "DATABASE"
-                             and grant.name == database]
-                if any(grant.privilege in self.sf_database_read_prereqs for grant in db_grants):
-                    has_db_usage = True
-                    break
-
-        # Check if the grantee has usage permission on schema
-        schema_grants = [grant for grant in self.map.grants if grant.grantee_name == grantee_name
-                          and grant.granted_on == "SCHEMA"
-                          and grant.name == schema]
-        has_schema_usage = any(grant.privilege in self.sf_schema_read_prereqs for grant in schema_grants)
-        if not has_schema_usage:
-            # If not check privileges via role assignments
-            for role_assignment in role_user.role_assignments:
-                schema_grants = [grant for grant in self.map.grants if grant.grantee_name == role_assignment.name
-                                 and grant.granted_on == "SCHEMA"
-                                 and grant.name == schema]
-                if any(grant.privilege in self.sf_schema_read_prereqs for grant in schema_grants):
-                    has_schema_usage = True
-                    break
+
+        # Check if the grantee has usage permission on database, directly or via role assignments
+        has_db_usage = self.__has_privilege__(grantee_name, "DATABASE", database, self.sf_database_read_prereqs) or \
+            any(self.__has_privilege__(role_assignment.name, "DATABASE", database, self.sf_database_read_prereqs)
+                for role_assignment in role_user.role_assignments)
+
+        # Check if the grantee has usage permission on schema, directly or via role assignments
+        has_schema_usage = self.__has_privilege__(grantee_name, "SCHEMA", schema, self.sf_schema_read_prereqs) or \
+            any(self.__has_privilege__(role_assignment.name, "SCHEMA", schema, self.sf_schema_read_prereqs)
+                for role_assignment in role_user.role_assignments)
 
         return has_db_usage and has_schema_usage
 
@@ -158,11 +200,10 @@ class SnowflakePolicyWeaver(PolicyWeaverCore):
                                  table_schema=masking_policy.schema_name,
                                  name=masking_policy.table_name)
             for role_name in masking_policy.group_names:
-                roles = [r for r in self.map.roles if r.name == role_name]
-                if not roles:
+                role = self.roles_by_name.get(role_name)
+                if not role:
                     self.logger.warning(f"Role {role_name} not found in roles list.")
                     continue
-                role = roles[0]
                 if self.__validate_table_grant__(sfg, role):
                     special_grant = SnowflakeGrant(grantee_name=role_name,
                                                    granted_on="TABLE",
@@ -184,11 +225,10 @@ class SnowflakePolicyWeaver(PolicyWeaverCore):
                                  name=row_filter_policy.table_name)
 
             for group_ in row_filter_policy.details.groups:
-                roles = [r for r in self.map.roles if r.name == group_.group_name]
-                if not roles:
+                role = self.roles_by_name.get(group_.group_name)
+                if not role:
                     self.logger.warning(f"Role {group_.group_name} not found in roles list.")
                     continue
-                role = roles[0]
                 if self.__validate_table_grant__(sfg, role):
                     special_grant = SnowflakeGrant(grantee_name=group_.group_name,
                                                    granted_on="TABLE",
@@ -212,19 +252,12 @@ class SnowflakePolicyWeaver(PolicyWeaverCore):
             valid_grants.append(grant)
 
         filtered_grants = []
+        seen = set()
         for vg in valid_grants:
-            duplicate = False
-            for fg in filtered_grants:
-                if (vg.grantee_name == fg.grantee_name and
-                    vg.granted_on == fg.granted_on and
-                    vg.privilege == fg.privilege and
-                    vg.table_catalog == fg.table_catalog and
-                    vg.table_schema == fg.table_schema and
-                    vg.name == fg.name):
-                    duplicate = True
-                    break
-            if not duplicate:
-                filtered_grants.append(vg)
+            if vg.key in seen:
+                continue
+            seen.add(vg.key)
+            filtered_grants.append(vg)
 
         return filtered_grants
 
@@ -237,15 +270,26 @@ class SnowflakePolicyWeaver(PolicyWeaverCore):
             print(f"Invalid email format for user: {user.id} , {user.login_name}")
 
     def __get_all_permission_objects__(self, grantee_name: str) -> list[PermissionObject]:
+        """
+        Returns the permission objects of a grantee: the user itself, or the member users of a role.
+        The expansion is computed once per grantee and run, as the same role is granted on many tables.
+        Args:
+            grantee_name (str): The name of the user or role.
+        Returns:
+            list[PermissionObject]: The permission objects of the grantee.
+        Raises:
+            ValueError: If the grantee is neither a user nor a role.
+        """
+        if grantee_name in self.permission_objects:
+            return list(self.permission_objects[grantee_name])
 
-        role_user = [user for user in self.map.users if user.name == grantee_name]
+        role_user = self.users_by_name.get(grantee_name)
         is_user = True
         if not role_user:
-            role_user = [role for role in self.map.roles if role.name == grantee_name]
+            role_user = self.roles_by_name.get(grantee_name)
             is_user = False
         if not role_user:
             raise ValueError(f"Role user not found for grantee: {grantee_name}")
-        role_user = role_user[0]
 
         permission_objects = []
         if is_user:
@@ -253,136 +297,190 @@ class SnowflakePolicyWeaver(PolicyWeaverCore):
             if permission_object:
                 permission_objects.append(permission_object)
         else:
-            users_added = list()
+            users_added = set()
             for user in role_user.members_user:
                 if user.name in users_added:
                     continue
                 permission_object = self.__build_permission_object__(user)
                 if permission_object:
                     permission_objects.append(permission_object)
-                users_added.append(user.name)
+                users_added.add(user.name)
 
-        return permission_objects
+        self.permission_objects[grantee_name] = permission_objects
+        return list(permission_objects)
 
 
+    @staticmethod
+    def __index_by_table__(items: list) -> dict:
+        """
+        Groups policies or tables by the (database, schema, table) they apply to.
+        Args:
+            items (list): Objects with database_name, schema_name and table_name attributes.
+        Returns:
+            dict: The objects of each (database, schema, table), in their original order.
+        """
+        index = {}
+        for item in items:
+            index.setdefault((item.database_name, item.schema_name, item.table_name), []).append(item)
+        return index
+
+    def __build_policy_index__(self) -> None:
+        """
+        Indexes the masking policies, row access policies and policy tables of the database map
+        by table once per run, and resets the constraints cached for the previous run.
+        """
+        self.masking_policies_by_table = self.__index_by_table__(self.map.masking_policies)
+        self.tables_with_masks_by_table = self.__index_by_table__(self.map.tables_with_masks)
+        self.row_access_policies_by_table = self.__index_by_table__(self.map.row_access_policies)
+        self.unsupported_tables_by_table = self.__index_by_table__(self.map.unsupported_tables)
+        self.column_constraints = {}
+        self.row_constraints = {}
+
     def __get_column_constraints__(self, role_assignments: List[SnowflakeRole],
                                    grants: List[SnowflakeGrant]):
 
+        role_names = {role.name for role in role_assignments}
+
         columnconstraints = []
         for grant in grants:
-            table_catalog = grant.table_catalog
-            table_schema = grant.table_schema
-            table_name = grant.name
-            matching_mask_policies = [mp for mp in self.map.masking_policies
-                                        if mp.database_name == table_catalog and
-                                            mp.schema_name == table_schema and
-                                            mp.table_name == table_name]
+            table = (grant.table_catalog, grant.table_schema, grant.name)
+            matching_mask_policies = self.masking_policies_by_table.get(table)
 
             if not matching_mask_policies:
                 continue
 
-        
-            table_w_mask = [t for t in self.map.tables_with_masks if t.database_name == table_catalog and
-                                                        t.schema_name == table_schema and
-                                                        t.table_name == table_name][0]
-            all_columns = table_w_mask.column_names
-            columns_to_deny = []
-
-            for mp in matching_mask_policies:
-                if mp.column_mask_type == ColumnMaskType.UNSUPPORTED:
-                    self.logger.warning(f"Unsupported column mask type for masking policy {mp.name} on {mp.database_name}.{mp.schema_name}.{mp.table_name}.{mp.column_name}.")
-                    self.logger.warning(f"Using fallback: {self.config.constraints.columns.fallback}")
-                    if self.config.constraints.columns.fallback != "grant":
-                        columns_to_deny.append(mp.column_name)
-                elif mp.column_mask_type == ColumnMaskType.UNMASK_FOR_GROUP:
-                    if not any([role for role in role_assignments if role.name in mp.group_names]):
-                        columns_to_deny.append(mp.column_name)
-                elif mp.column_mask_type == ColumnMaskType.MASK_FOR_GROUP:
-                    if any([role for role in role_assignments if role.name in mp.group_names]):
-                        columns_to_deny.append(mp.column_name)
-                        
-            filtered_columns = [col for col in all_columns if col not in columns_to_deny]        
-            if len(filtered_columns) == len(all_columns):
-                continue
-            constraint = ColumnConstraint(catalog_name=mp.database_name,
-                                            schema_name=mp.schema_name,
-                                            table_name=mp.table_name,
-                                            column_names=filtered_columns,
-                                            column_effect=PermissionState.GRANT,
-                                            column_actions=[PermissionType.SELECT])
-            columnconstraints.append(constraint)
+            # Only the roles named by the table's policies affect the result, so grantees
+            # with the same roles for this table share the computed constraint.
+            signature = (table, frozenset(name for mp in matching_mask_policies
+                                          for name in mp.group_names or [] if name in role_names))
+            if signature not in self.column_constraints:
+                self.column_constraints[signature] = self.__get_table_column_constraint__(
+                    table, matching_mask_policies, signature[1])
+
+            constraint = self.column_constraints[signature]
+            if constraint:
+                columnconstraints.append(constraint)
 
         return columnconstraints
 
+    def __get_table_column_constraint__(self, table: Tuple[str, str, str],
+                                        matching_mask_policies: List[SnowflakeMaskingPolicy],
+                                        role_names: frozenset) -> ColumnConstraint:
+        """
+        Computes the column constraint of a table for a set of roles.
+        Args:
+            table (Tuple[str, str, str]): The database, schema and name of the table.
+            matching_mask_policies (List[SnowflakeMaskingPolicy]): The masking policies of the table.
+            role_names (frozenset): The names of the effective roles of the grantee.
+        Returns:
+            ColumnConstraint: The columns the roles can read, or None if every column is readable.
+        """
+        table_w_mask = self.tables_with_masks_by_table[table][0]
+        all_columns = table_w_mask.column_names
+        columns_to_deny = []
+
+        for mp in matching_mask_policies:
+            if mp.column_mask_type == ColumnMaskType.UNSUPPORTED:
+                self.logger.warning(f"Unsupported column mask type for masking policy {mp.name} on {mp.database_name}.{mp.schema_name}.{mp.table_name}.{mp.column_name}.")
+                self.logger.warning(f"Using fallback: {self.config.constraints.columns.fallback}")
+                if self.config.constraints.columns.fallback != "grant":
+                    columns_to_deny.append(mp.column_name)
+            elif mp.column_mask_type == ColumnMaskType.UNMASK_FOR_GROUP:
+                if role_names.isdisjoint(mp.group_names or []):
+                    columns_to_deny.append(mp.column_name)
+            elif mp.column_mask_type == ColumnMaskType.MASK_FOR_GROUP:
+                if not role_names.isdisjoint(mp.group_names or []):
+                    columns_to_deny.append(mp.column_name)
+
+        filtered_columns = [col for col in all_columns if col not in columns_to_deny]
+        if len(filtered_columns) == len(all_columns):
+            return None
+
+        table_catalog, table_schema, table_name = table
+        return ColumnConstraint(catalog_name=table_catalog,
+                                schema_name=table_schema,
+                                table_name=table_name,
+                                column_names=filtered_columns,
+                                column_effect=PermissionState.GRANT,
+                                column_actions=[PermissionType.SELECT])
+
     def __get_row_constraints__(self, role_assignments: List[SnowflakeRole], grants: List[SnowflakeGrant]):
+
+        role_names = {role.name for role in role_assignments}
+
         rowconstraints = []
         for grant in grants:
-            table_catalog = grant.table_catalog
-            table_schema = grant.table_schema
-            table_name = grant.name
-            matching_raps = [rap for rap in self.map.row_access_policies
-                                    if rap.database_name == table_catalog and
-                                        rap.schema_name == table_schema and
-                                        rap.table_name == table_name]
-            
-            matching_unsupported_tables = [rap for rap in self.map.unsupported_tables
-                                            if rap.database_name == table_catalog and
-                                                rap.schema_name == table_schema and
-                                                rap.table_name == table_name]
-            
+            table = (grant.table_catalog, grant.table_schema, grant.name)
+            matching_raps = self.row_access_policies_by_table.get(table)
+
             if not matching_raps:
                 continue
 
-            table_objects = [(mp.database_name, mp.schema_name, mp.table_name) for mp in matching_raps]
-            table_objects = list(set(table_objects))
-
-            for (catalog, schema, table) in table_objects:
-
-                matching_rls_policies_per_table = [mp for mp in matching_raps if mp.database_name == catalog and
-                                                    mp.schema_name == schema and
-                                                    mp.table_name == table]
-                
-                matching_unsupported_tables_per_table = [ut for ut in matching_unsupported_tables if ut.database_name == catalog and
-                                                            ut.schema_name == schema and
-                                                            ut.table_name == table]
-                if matching_unsupported_tables_per_table:
-                    self.logger.warning(f"Detecting unsupported policies like aggregation, join or projection policy on: {catalog}.{schema}.{table} . Using fallback: {self.config.constraints.rows.fallback}")
-                                            
-                    if self.config.constraints.rows.fallback != "grant":
-                        constraint = RowConstraint(catalog_name=catalog,
-                                                schema_name=schema,
-                                                table_name=table,
-                                                filter_condition="DENYALL")
-                        rowconstraints.append(constraint)
+            # Only the roles named by the table's policies affect the result, so grantees
+            # with the same roles for this table share the computed constraints.
+            signature = (table, frozenset(group.group_name for rap in matching_raps if rap.details
+                                          for group in rap.details.groups or [] if group.group_name in role_names))
+            if signature not in self.row_constraints:
+                self.row_constraints[signature] = self.__get_table_row_constraints__(
+                    table, matching_raps, signature[1])
+
+            rowconstraints.extend(self.row_constraints[signature])
+
+        return rowconstraints
+
+    def __get_table_row_constraints__(self, table: Tuple[str, str, str],
+                                      matching_raps: List[SnowflakeRowFilter],
+                                      role_names: frozenset) -> List[RowConstraint]:
+        """
+        Computes the row constraints of a table for a set of roles.
+        Args:
+            table (Tuple[str, str, str]): The database, schema and name of the table.
+            matching_raps (List[SnowflakeRowFilter]): The row access policies of the table.
+            role_names (frozenset): The names of the effective roles of the grantee.
+        Returns:
+            List[RowConstraint]: The row constraints of the table.
+        """
+        catalog, schema, table_name = table
+        rowconstraints = []
+
+        if table in self.unsupported_tables_by_table:
+            self.logger.warning(f"Detecting unsupported policies like aggregation, join or projection policy on: {catalog}.{schema}.{table_name} . Using fallback: {self.config.constraints.rows.fallback}")
+
+            if self.config.constraints.rows.fallback != "grant":
+                constraint = RowConstraint(catalog_name=catalog,
+                                           schema_name=schema,
+                                           table_name=table_name,
+                                           filter_condition="DENYALL")
+                rowconstraints.append(constraint)
+            return rowconstraints
+
+        for mp in matching_raps:
+            if mp.details.row_filter_type == RowFilterType.UNSUPPORTED:
+                self.logger.warning(f"Unsupported row filter type for row filter policy {mp.name} on {mp.database_name}.{mp.schema_name}.{mp.table_name}")
+                self.logger.warning(f"Using fallback: {self.config.constraints.rows.fallback}")
+                if self.config.constraints.rows.fallback != "grant":
+                    filter_condition = "DENYALL"  # Deny all
+                else:
                     continue
+            elif mp.details.row_filter_type == RowFilterType.EXPLICIT_GROUP_MEMBERSHIP:
+                filter_condition = None
+                for group in mp.details.groups:
+                    if group.group_name in role_names:
+                        filter_condition = group.return_value
+                        break
+                if not filter_condition:
+                    filter_condition = mp.details.default_value
+                if filter_condition == "false":
+                    filter_condition = "DENYALL"
+                if filter_condition == "true":
+                    continue
+
+            constraint = RowConstraint(catalog_name=mp.database_name,
+                                       schema_name=mp.schema_name,
+                                       table_name=mp.table_name,
+                                       filter_condition=filter_condition)
+            rowconstraints.append(constraint)
 
-                for mp in matching_rls_policies_per_table:
-                    if mp.details.row_filter_type == RowFilterType.UNSUPPORTED:
-                        self.logger.warning(f"Unsupported row filter type for row filter policy {mp.name} on {mp.database_name}.{mp.schema_name}.{mp.table_name}")
-                        self.logger.warning(f"Using fallback: {self.config.constraints.rows.fallback}")
-                        if self.config.constraints.rows.fallback != "grant":
-                            filter_condition = "DENYALL"  # Deny all
-                        else:
-                            continue
-                    elif mp.details.row_filter_type == RowFilterType.EXPLICIT_GROUP_MEMBERSHIP:
-                        filter_condition = None
-                        for group in mp.details.groups:
-                            if group.group_name in [role.name for role in role_assignments]:
-                                filter_condition = group.return_value
-                                break
-                        if not filter_condition:
-                            filter_condition = mp.details.default_value
-                        if filter_condition == "false":
-                            filter_condition = "DENYALL"
-                        if filter_condition == "true":
-                            continue
-
-
-                    constraint = RowConstraint(catalog_name=mp.database_name,
-                                            schema_name=mp.schema_name,
-                                            table_name=mp.table_name,
-                                            filter_condition=filter_condition)
-                    rowconstraints.append(constraint)
         return rowconstraints
 
 
@@ -404,10 +502,9 @@ class SnowflakePolicyWeaver(PolicyWeaverCore):
             permission_scopes.append(permission_scope)
     
 
-        roles = [role for role in self.map.roles if role.name == grantee_name]
-        if not roles:
+        role = self.roles_by_name.get(grantee_name)
+        if not role:
             return None
-        role = roles[0]
         role_assignments = [role] + role.role_assignments
 
         if column_security:
@@ -431,6 +528,35 @@ class SnowflakePolicyWeaver(PolicyWeaverCore):
                             rowconstraints=rowconstraints if rowconstraints else None)
         return policy
 
+    @staticmethod
+    def __group_grants_by_grantee__(grants: List[SnowflakeGrant]) -> Dict[str, List[SnowflakeGrant]]:
+        """
+        Groups grants by grantee in a single pass, keeping the grantees in the order of their first grant.
+        Args:
+            grants (List[SnowflakeGrant]): The grants to group.
+        Returns:
+            Dict[str, List[SnowflakeGrant]]: The grants of each grantee.
+        """
+        grants_by_grantee = {}
+        for grant in grants:
+            grants_by_grantee.setdefault(grant.grantee_name, []).append(grant)
+        return grants_by_grantee
+
+    def __build_grantee_policy__(self, grantee_name: str, grants_by_grantee: Dict[str, List[SnowflakeGrant]],
+                                 column_security: bool, row_security: bool) -> RolePolicy:
+        """
+        Builds the role policy of a grantee from the grouped grants.
+        Args:
+            grantee_name (str): The name of the grantee.
+            grants_by_grantee (Dict[str, List[SnowflakeGrant]]): The valid grants of each grantee.
+            column_security (bool): Whether column constraints are built.
+            row_security (bool): Whether row constraints are built.
+        Returns:
+            RolePolicy: The role policy of the grantee, or None.
+        """
+        return self._build_role_based_policy__(grantee_name, grants_by_grantee[grantee_name],
+                                               column_security, row_security)
+
     def __build_role_based_policy_export__(self) -> RolePolicyExport:
         policy_export = RolePolicyExport(source=self.config.source, type=self.config.type,
                                          policies=[])
@@ -449,15 +575,15 @@ class SnowflakePolicyWeaver(PolicyWeaverCore):
             self.logger.info("Row level security is enabled in the config.")
             row_security = True
 
-        # group grants by granteename
-        grants_by_grantee = {}
-        for grant in self.valid_grants:
-            if grant.grantee_name not in grants_by_grantee:
-                grants_by_grantee[grant.grantee_name] = []
-            grants_by_grantee[grant.grantee_name].append(grant)
+        grants_by_grantee = self.__group_grants_by_grantee__(self.valid_grants)
+        grantee_names = [name for name in grants_by_grantee if name in self.roles_by_name]
+
+        build = functools.partial(self.__build_grantee_policy__, grants_by_grantee=grants_by_grantee,
+                                  column_security=column_security, row_security=row_security)
+        workers = self.config.snowflake.role_policy_workers if self.config.snowflake else None
+        results = fork_map(build, grantee_names, workers)
 
-        for grantee_name, grants in grants_by_grantee.items():
-            policy = self._build_role_based_policy__(grantee_name, grants, column_security, row_security)
+        for policy in results:
             if policy:
                 policy_export.policies.append(policy)
 
@@ -467,9 +593,12 @@ class SnowflakePolicyWeaver(PolicyWeaverCore):
     @staticmethod
     def __deduplicate_permission_objects__(permission_objects: List[PermissionObject]) -> List[PermissionObject]:
         new_list = []
+        seen = set()
         for obj in permission_objects:
-            if obj.lookup_id not in [o.lookup_id for o in new_list]:
-                new_list.append(obj)
+            if obj.key in seen:
+                continue
+            seen.add(obj.key)
+            new_list.append(obj)
         return new_list
 
     def _build_table_based_policy__(self, table_catalog: str, table_schema: str, table_name: str, grants: List[SnowflakeGrant]) -> Policy:
@@ -506,10 +635,18 @@ class SnowflakePolicyWeaver(PolicyWeaverCore):
         return policy_export
 
     def map_policy(self, policy_mapping = 'role_based'):
-        self.map = self.api_client.__get_database_map__(self.config.source)
+        # the pooled connections and their threads are closed when the metadata is read,
+        # before the role based export forks its workers
+        with self.api_client:
+            self.map = self.api_client.__get_database_map__(self.config.source)
         
+        self.__build_grant_index__()
+        self.__build_policy_index__()
+
         # Build special grants based on column masking policies
-        self.map.grants.extend(self.__build_special_grants__())
+        special_grants = self.__build_special_grants__()
+        self.map.grants.extend(special_grants)
+        self.__index_grants__(special_grants)
 
         # Filter out valid grants
         self.valid_grants = self.__compute_valid_grants__()
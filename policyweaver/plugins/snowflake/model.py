@@ -70,6 +70,7 @@ class SnowflakeGrant(CommonBaseModel):
         table_schema (Optional[str]): The schema of the table.
         name (Optional[str]): The name of the object.
         grantee_name (Optional[str]): The name of the grantee (user or role).
+    The `key` property returns a hashable key for the grant based on its attributes.
     """
     
     privilege: Optional[str] = Field(alias="privilege", default=None)
@@ -79,6 +80,15 @@ class SnowflakeGrant(CommonBaseModel):
     name: Optional[str] = Field(alias="name", default=None)
     grantee_name: Optional[str] = Field(alias="grantee_name", default=None)
 
+    @property
+    def key(self) -> tuple:
+        """
+        Returns a hashable key identifying the grant, used to deduplicate grants.
+        Returns:
+            tuple: The grantee, object type, privilege, catalog, schema and name of the grant.
+        """
+        return (self.grantee_name, self.granted_on, self.privilege, self.table_catalog, self.table_schema, self.name)
+
 
 class SnowflakeTableWithPolicy(CommonBaseModel):
     """
@@ -227,12 +237,19 @@ class SnowflakeSourceConfig(CommonBaseModel):
         password (Optional[str]): The password for accessing the Snowflake account.
         warehouse (Optional[str]): The warehouse to use for the Snowflake connection.
         private_key_file (Optional[str]): The path to the private key file for accessing the Snowflake account.
+        max_connections (Optional[int]): The maximum number of connections shared by the queries of a run.
+        live_mode (Optional[bool]): Read the metadata with SHOW commands instead of the ACCOUNT_USAGE views.
+        role_policy_workers (Optional[int]): The number of processes used to build role based policies.
+            Policies are built serially when unset or 1.
     """
     account_name: Optional[str] = Field(alias="account_name", default=None)
     user_name: Optional[str] = Field(alias="user_name", default=None)
     password: Optional[str] = Field(alias="password", default=None)
     warehouse: Optional[str] = Field(alias="warehouse", default=None)
     private_key_file: Optional[str] = Field(alias="private_key_file", default=None)
+    max_connections: Optional[int] = Field(alias="max_connections", default=4)
+    live_mode: Optional[bool] = Field(alias="live_mode", default=False)
+    role_policy_workers: Optional[int] = Field(alias="role_policy_workers", default=None)
 
 class SnowflakeSourceMap(SourceMap):
     """
@@ -0,0 +1,262 @@
+import logging
+
+from typing import List
+
+from policyweaver.core.enum import ColumnMaskType, RowFilterType
+from policyweaver.core.tokenizer import ParseCache, RoutineParseError, Token, TokenStream
+from policyweaver.plugins.snowflake.model import (
+    RowFilterDetailGroup, RowFilterDetails, SnowflakeColumnMaskExtraction
+)
+
+_ROLE_FUNCTION = "CURRENT_ROLE"
+
+class SnowflakePolicyParser:
+    """
+    Parser for the bodies of Snowflake masking and row access policies.
+    Bodies are tokenized with precompiled patterns and parsed for the supported CURRENT_ROLE() patterns:
+        Masking policies:     CASE WHEN CURRENT_ROLE() IN ('role', ...) THEN <value> ELSE <value> END
+        Row access policies:  CASE WHEN CURRENT_ROLE() IN ('role', ...) THEN <condition> [WHEN ...] ELSE <condition> END
+                              CURRENT_ROLE() IN ('role', ...)
+    CURRENT_ROLE() = 'role' is accepted wherever an IN list is. Parse results are held in an LRU
+    cache keyed by the policy id and a hash of the body, so a policy referenced by many columns or
+    tables is parsed once. Callers receive their own copy of a result.
+    Example usage:
+        parser = SnowflakePolicyParser()
+        extraction = parser.parse_masking_policy("CASE WHEN CURRENT_ROLE() IN ('HR') THEN val ELSE '***' END", policy_id=1)
+    """
+    def __init__(self, maxsize: int = 1024) -> None:
+        """
+        Initializes the parser.
+        Args:
+            maxsize (int, optional): The maximum number of cached parse results, 0 disables the cache. Defaults to 1024.
+        """
+        self.logger = logging.getLogger("POLICY_WEAVER")
+        self.cache = ParseCache(maxsize)
+
+    def parse_masking_policy(self, policy_body: str, policy_id=None) -> SnowflakeColumnMaskExtraction:
+        """
+        Extracts the role names, mask pattern and mask type from a masking policy body.
+        Args:
+            policy_body (str): The body of the masking policy.
+            policy_id (optional): The id of the policy, part of the cache key.
+        Returns:
+            SnowflakeColumnMaskExtraction: The extraction, with an UNSUPPORTED mask type if the body does not match.
+        """
+        return self.cache.get(("masking_policy", policy_id), policy_body or "",
+                              lambda: self.__parse_masking_policy__(policy_body or ""))
+
+    def parse_row_access_policy(self, policy_body: str, policy_id=None) -> RowFilterDetails:
+        """
+        Extracts the role memberships, their return values and the default value from a row access policy body.
+        Args:
+            policy_body (str): The body of the row access policy.
+            policy_id (optional): The id of the policy, part of the cache key.
+        Returns:
+            RowFilterDetails: The details, with an UNSUPPORTED row filter type if the body does not match.
+        """
+        return self.cache.get(("row_access_policy", policy_id), policy_body or "",
+                              lambda: self.__parse_row_access_policy__(policy_body or ""))
+
+    @staticmethod
+    def __read_role_name__(stream: TokenStream) -> str:
+        """
+        Reads a role name literal.
+        Args:
+            stream (TokenStream): The token stream positioned at the literal.
+        Returns:
+            str: The role name.
+        """
+        token = stream.next()
+        if token.kind != "string":
+            raise RoutineParseError(f"Expected a role name literal but found '{token.value}'.")
+
+        quote = token.value[0]
+        return token.value[1:-1].replace(quote * 2, quote)
+
+    def __read_role_condition__(self, stream: TokenStream) -> List[str]:
+        """
+        Reads a CURRENT_ROLE() IN ('role', ...) or CURRENT_ROLE() = 'role' test and returns the role names.
+        Args:
+            stream (TokenStream): The token stream positioned at CURRENT_ROLE.
+        Returns:
+            List[str]: The role names.
+        """
+        stream.expect_keyword(_ROLE_FUNCTION)
+        stream.expect_punct("(")
+        stream.expect_punct(")")
+
+        operator = stream.next()
+        if operator.kind == "other" and operator.value == "=":
+            token = stream.peek()
+            if token is not None and token.is_punct("("):
+                stream.expect_punct("(")
+                role_name = self.__read_role_name__(stream)
+                stream.expect_punct(")")
+            else:
+                role_name = self.__read_role_name__(stream)
+            return [role_name]
+
+        if not operator.is_keyword("IN"):
+            raise RoutineParseError(f"Expected 'IN' or '=' but found '{operator.value}'.")
+
+        stream.expect_punct("(")
+        role_names = [self.__read_role_name__(stream)]
+        while stream.next().is_punct(","):
+            role_names.append(self.__read_role_name__(stream))
+        if not stream.tokens[stream.position - 1].is_punct(")"):
+            raise RoutineParseError("Expected ')' after the role names.")
+
+        return role_names
+
+    @staticmethod
+    def __is_role_condition__(token: Token) -> bool:
+        """Checks if a token starts a CURRENT_ROLE() test."""
+        return token is not None and token.is_keyword(_ROLE_FUNCTION)
+
+    @staticmethod
+    def __is_literal__(token: Token) -> bool:
+        """Checks if a token is a NULL, boolean or numeric literal."""
+        if token.kind == "ident":
+            return token.value.upper() in ("NULL", "TRUE", "FALSE")
+        return token.kind == "other" and token.value.lstrip("+-").replace(".", "", 1).isdigit()
+
+    @staticmethod
+    def __get_value__(stream: TokenStream, expression: List[Token]) -> str:
+        """
+        Returns the text of a return value, with the boolean literals in lower case.
+        Args:
+            stream (TokenStream): The token stream the expression was read from.
+            expression (List[Token]): The tokens of the value.
+        Returns:
+            str: The value text.
+        """
+        if len(expression) == 1 and expression[0].kind == "ident" and expression[0].value.upper() in ("TRUE", "FALSE"):
+            return expression[0].value.lower()
+        return stream.slice(expression)
+
+    def __parse_masking_policy__(self, policy_body: str) -> SnowflakeColumnMaskExtraction:
+        """Parses a masking policy body, see parse_masking_policy."""
+        result = SnowflakeColumnMaskExtraction(column_mask_type=ColumnMaskType.UNSUPPORTED)
+
+        try:
+            stream = TokenStream.open(policy_body)
+            stream.expect_keyword("CASE")
+            stream.expect_keyword("WHEN")
+            role_names = self.__read_role_condition__(stream)
+            stream.expect_keyword("THEN")
+            assigned = stream.read_expression(lambda t: t.is_keyword("ELSE"))
+            stream.expect_keyword("ELSE")
+            unassigned = stream.read_expression(lambda t: t.is_keyword("END"))
+            stream.expect_keyword("END")
+        except RoutineParseError as e:
+            self.logger.warning(f"Unexpected masking policy format, expected 'CASE WHEN CURRENT_ROLE() IN (...) THEN ... ELSE ... END': {e}")
+            return result
+
+        mask = None
+        column_positions = []
+
+        # the masked value is the policy argument: an identifier, quoted or not, on its own.
+        # string, numeric, boolean and NULL literals are mask values.
+        for position, expression in ((1, assigned), (2, unassigned)):
+            if len(expression) != 1:
+                continue
+            token = expression[0]
+            if token.kind == "string" and token.value.startswith("'"):
+                mask = token.value[1:-1]
+            elif self.__is_literal__(token):
+                mask = token.value
+            elif token.kind in ("ident", "string"):
+                column_positions.append(position)
+
+        # a column in both branches does not mask anything we can map
+        column_name_pos = column_positions[0] if len(column_positions) == 1 else None
+
+        result.group_names = role_names
+        result.mask_pattern = mask
+        if column_name_pos == 1:
+            result.column_mask_type = ColumnMaskType.UNMASK_FOR_GROUP
+        elif column_name_pos == 2:
+            result.column_mask_type = ColumnMaskType.MASK_FOR_GROUP
+
+        return result
+
+    def __parse_row_access_policy__(self, policy_body: str) -> RowFilterDetails:
+        """Parses a row access policy body, see parse_row_access_policy."""
+        result = RowFilterDetails(row_filter_type=RowFilterType.UNSUPPORTED)
+
+        try:
+            stream = TokenStream.open(policy_body)
+            first = stream.peek()
+            if first and first.is_keyword("CASE"):
+                details = self.__parse_case_row_access_policy__(stream)
+            elif self.__is_role_condition__(first):
+                details = self.__parse_role_row_access_policy__(stream)
+            else:
+                raise RoutineParseError("Body does not start with 'CASE WHEN' or 'CURRENT_ROLE()'.")
+        except RoutineParseError as e:
+            self.logger.warning(f"Unexpected row access policy format, expected 'CURRENT_ROLE() IN (...)' or 'CASE WHEN CURRENT_ROLE() IN (...) ...': {e}")
+            return result
+
+        return details
+
+    def __parse_case_row_access_policy__(self, stream: TokenStream) -> RowFilterDetails:
+        """
+        Parses a CASE WHEN row access policy. Branches whose condition is not a role test are skipped.
+        Args:
+            stream (TokenStream): The token stream positioned at CASE.
+        Returns:
+            RowFilterDetails: The role return values and the ELSE default value.
+        """
+        groups = []
+        stream.expect_keyword("CASE")
+        stream.expect_keyword("WHEN")
+        first_branch = True
+
+        while True:
+            is_role_condition = self.__is_role_condition__(stream.peek())
+
+            if not is_role_condition and first_branch:
+                raise RoutineParseError("The first branch is not a CURRENT_ROLE() test.")
+
+            if is_role_condition:
+                role_names = self.__read_role_condition__(stream)
+            else:
+                stream.read_expression(lambda t: t.is_keyword("THEN"))
+
+            stream.expect_keyword("THEN")
+            value = stream.read_expression(lambda t: t.is_keyword("WHEN") or t.is_keyword("ELSE"))
+
+            if is_role_condition:
+                return_value = self.__get_value__(stream, value)
+                groups.extend(RowFilterDetailGroup(group_name=role_name, return_value=return_value)
+                              for role_name in role_names)
+
+            first_branch = False
+            if stream.next().is_keyword("ELSE"):
+                break
+
+        default_value = self.__get_value__(stream, stream.read_expression(lambda t: t.is_keyword("END")))
+        stream.expect_keyword("END")
+
+        return RowFilterDetails(groups=groups, default_value=default_value,
+                                row_filter_type=RowFilterType.EXPLICIT_GROUP_MEMBERSHIP)
+
+    def __parse_role_row_access_policy__(self, stream: TokenStream) -> RowFilterDetails:
+        """
+        Parses a row access policy that is a single CURRENT_ROLE() test: the listed roles see every row,
+        other roles see none.
+        Args:
+            stream (TokenStream): The token stream positioned at CURRENT_ROLE.
+        Returns:
+            RowFilterDetails: The role return values and the default value.
+        """
+        role_names = self.__read_role_condition__(stream)
+
+        if stream.peek() is not None:
+            raise RoutineParseError(f"Unexpected '{stream.peek().value}' after the role test.")
+
+        return RowFilterDetails(
+            groups=[RowFilterDetailGroup(group_name=role_name, return_value="true") for role_name in role_names],
+            default_value="false",
+            row_filter_type=RowFilterType.EXPLICIT_GROUP_MEMBERSHIP
+        )
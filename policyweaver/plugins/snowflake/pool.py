@@ -0,0 +1,171 @@
+import logging
+import threading
+
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+
+import snowflake.connector
+
+class SnowflakeConnectionPool:
+    """
+    A small pool of Snowflake connections shared by the queries of a run.
+    Connections are opened lazily, up to max_size, and returned to the pool after each query,
+    so authentication, warehouse resume and session setup are paid once per connection instead
+    of once per query. Connections that were closed by the server are replaced on checkout.
+    The pool must be closed when the run is complete, or used as a context manager.
+    Threads waiting for a connection are woken whenever one is returned or a slot is freed,
+    including by close(). Connections checked out at close time are discarded when returned.
+    Example usage:
+        with SnowflakeConnectionPool(connect, max_size=4) as pool:
+            with pool.connection() as conn:
+                conn.cursor().execute("SELECT 1")
+    """
+    def __init__(self, connect: Callable[[], snowflake.connector.SnowflakeConnection], max_size: int = 1) -> None:
+        """
+        Initializes the pool.
+        Args:
+            connect (Callable[[], snowflake.connector.SnowflakeConnection]): Opens a new connection.
+            max_size (int, optional): The maximum number of open connections. Defaults to 1.
+        Raises:
+            ValueError: If max_size is less than 1.
+        """
+        if max_size < 1:
+            raise ValueError("Snowflake connection pool size must be at least 1.")
+
+        self.logger = logging.getLogger("POLICY_WEAVER")
+        self.max_size = max_size
+        self.__connect = connect
+        self.__idle: List[snowflake.connector.SnowflakeConnection] = []
+        self.__connections: List[snowflake.connector.SnowflakeConnection] = []
+        self.__opening = 0
+        self.__lock = threading.Lock()
+        self.__available = threading.Condition(self.__lock)
+
+    def __enter__(self) -> "SnowflakeConnectionPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the number of open connections.
+        Returns:
+            int: The number of connections opened by the pool and not yet closed.
+        """
+        with self.__lock:
+            return len(self.__connections)
+
+    @contextmanager
+    def connection(self) -> Iterator[snowflake.connector.SnowflakeConnection]:
+        """
+        Checks out a connection for the duration of the context and returns it to the pool afterwards.
+        Blocks while all max_size connections are in use.
+        Yields:
+            snowflake.connector.SnowflakeConnection: An open connection.
+        """
+        conn = self.__acquire__()
+
+        try:
+            yield conn
+        finally:
+            self.__release__(conn)
+
+    def close(self) -> None:
+        """
+        Closes every connection opened by the pool. The pool can be used again afterwards
+        and will open new connections on demand.
+        """
+        with self.__available:
+            connections, self.__connections = self.__connections, []
+            self.__idle.clear()
+            self.__available.notify_all()
+
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                self.logger.warning(f"Snowflake - Unable to close connection: {e}")
+
+        if connections:
+            self.logger.debug(f"Snowflake - Closed {len(connections)} pooled connections.")
+
+    def __acquire__(self) -> snowflake.connector.SnowflakeConnection:
+        """
+        Returns an idle connection, opening a new one while the pool is below max_size.
+        Waits while all max_size connections are checked out.
+        Returns:
+            snowflake.connector.SnowflakeConnection: An open connection.
+        """
+        while True:
+            with self.__available:
+                while not self.__idle and len(self.__connections) + self.__opening >= self.max_size:
+                    self.__available.wait()
+
+                if self.__idle:
+                    conn = self.__idle.pop()
+                else:
+                    conn = None
+                    self.__opening += 1
+
+            if conn is None:
+                conn = self.__open__()
+
+            if not conn.is_closed():
+                return conn
+
+            self.logger.debug("Snowflake - Replacing a closed pooled connection.")
+            self.__discard__(conn)
+
+    def __release__(self, conn: snowflake.connector.SnowflakeConnection) -> None:
+        """
+        Returns a checked out connection to the pool. Connections the pool no longer
+        owns, because it was closed while they were checked out, are discarded.
+        Args:
+            conn (snowflake.connector.SnowflakeConnection): The connection to return.
+        """
+        with self.__available:
+            if conn in self.__connections:
+                self.__idle.append(conn)
+                self.__available.notify()
+                return
+
+        if not conn.is_closed():
+            try:
+                conn.close()
+            except Exception as e:
+                self.logger.warning(f"Snowflake - Unable to close connection: {e}")
+
+    def __open__(self) -> snowflake.connector.SnowflakeConnection:
+        """
+        Opens a new connection in a slot reserved by the caller under the lock. The connection
+        is opened outside of the lock, so connections open concurrently.
+        Returns:
+            snowflake.connector.SnowflakeConnection: The new connection.
+        """
+        try:
+            conn = self.__connect()
+        except Exception:
+            with self.__available:
+                self.__opening -= 1
+                self.__available.notify()
+            raise
+
+        with self.__lock:
+            self.__opening -= 1
+            self.__connections.append(conn)
+            self.logger.debug(f"Snowflake - Opened pooled connection {len(self.__connections)} of {self.max_size}.")
+
+        return conn
+
+    def __discard__(self, conn: snowflake.connector.SnowflakeConnection) -> None:
+        """
+        Removes a connection from the pool.
+        Args:
+            conn (snowflake.connector.SnowflakeConnection): The connection to remove.
+        """
+        with self.__available:
+            if conn in self.__connections:
+                self.__connections.remove(conn)
+                self.__available.notify()
@@ -0,0 +1,106 @@
+from typing import Dict, List
+
+from policyweaver.core.graph import TransitiveClosure
+
+class SnowflakeRoleGraph:
+    """
+    Memoized, cycle-safe role hierarchy of a Snowflake account.
+    Built once from the role -> role and role -> user grants, the graph keeps adjacency maps
+    in both directions and resolves them with TransitiveClosure, so every role's inherited
+    roles and members are expanded exactly once, shared parents are never re-expanded and
+    cyclic grants terminate. A role is never reported as its own member or inherited role.
+    Example usage:
+        graph = SnowflakeRoleGraph(role_assignments, user_assignments)
+        graph.get_inherited_roles("ANALYST")  # roles granted to ANALYST, directly or indirectly
+        graph.get_member_users("READER")      # users holding READER, directly or through a role
+    """
+    def __init__(self, role_assignments: List[dict], user_assignments: List[dict]) -> None:
+        """
+        Initializes the graph from the role grants.
+        Args:
+            role_assignments (List[dict]): The grants of role NAME to role GRANTEE_NAME.
+            user_assignments (List[dict]): The grants of role NAME to user GRANTEE_NAME.
+        """
+        self.__granted_roles: Dict[str, List[str]] = {}
+        self.__grantee_roles: Dict[str, List[str]] = {}
+        self.__user_roles: Dict[str, List[str]] = {}
+        self.__role_users: Dict[str, List[str]] = {}
+        self.__member_users: Dict[str, List[str]] = {}
+
+        for assignment in role_assignments or []:
+            SnowflakeRoleGraph.__add_edge__(self.__granted_roles, assignment["GRANTEE_NAME"], assignment["NAME"])
+            SnowflakeRoleGraph.__add_edge__(self.__grantee_roles, assignment["NAME"], assignment["GRANTEE_NAME"])
+
+        for assignment in user_assignments or []:
+            SnowflakeRoleGraph.__add_edge__(self.__user_roles, assignment["GRANTEE_NAME"], assignment["NAME"])
+            SnowflakeRoleGraph.__add_edge__(self.__role_users, assignment["NAME"], assignment["GRANTEE_NAME"])
+
+        self.__inherited = TransitiveClosure(self.__granted_roles)
+        self.__members = TransitiveClosure(self.__grantee_roles)
+
+    @staticmethod
+    def __add_edge__(edges: Dict[str, List[str]], source: str, target: str) -> None:
+        """
+        Adds a directed edge to an adjacency map, ignoring duplicates.
+        Args:
+            edges (Dict[str, List[str]]): The adjacency map.
+            source (str): The source node.
+            target (str): The target node.
+        """
+        targets = edges.setdefault(source, [])
+
+        if target not in targets:
+            targets.append(target)
+
+    def get_inherited_roles(self, role_name: str) -> List[str]:
+        """
+        Returns the roles granted to a role, directly or through other roles.
+        Args:
+            role_name (str): The name of the role.
+        Returns:
+            List[str]: The names of the inherited roles.
+        """
+        return [r for r in self.__inherited.get(role_name) if r != role_name]
+
+    def get_member_roles(self, role_name: str) -> List[str]:
+        """
+        Returns the roles a role is granted to, directly or through other roles.
+        Args:
+            role_name (str): The name of the role.
+        Returns:
+            List[str]: The names of the member roles.
+        """
+        return [r for r in self.__members.get(role_name) if r != role_name]
+
+    def get_member_users(self, role_name: str) -> List[str]:
+        """
+        Returns the users a role is granted to, directly or through one of its member roles.
+        Args:
+            role_name (str): The name of the role.
+        Returns:
+            List[str]: The names of the member users.
+        """
+        if role_name not in self.__member_users:
+            users = dict.fromkeys(self.__role_users.get(role_name, []))
+
+            for member_role in self.get_member_roles(role_name):
+                users.update(dict.fromkeys(self.__role_users.get(member_role, [])))
+
+            self.__member_users[role_name] = list(users)
+
+        return self.__member_users[role_name]
+
+    def get_user_roles(self, user_name: str) -> List[str]:
+        """
+        Returns the roles granted to a user, directly or inherited through the granted roles.
+        Args:
+            user_name (str): The name of the user.
+        Returns:
+            List[str]: The names of the directly granted roles followed by the inherited roles.
+        """
+        roles = dict.fromkeys(self.__user_roles.get(user_name, []))
+
+        for role_name in list(roles):
+            roles.update(dict.fromkeys(self.get_inherited_roles(role_name)))
+
+        return list(roles)
@@ -87,17 +87,6 @@ class WeaverAgent:
             client_secret=config.service_principal.client_secret
         )
     
-        weaver = WeaverAgent(config)
-
-        if source_snapshot_hndlr:
-            weaver.set_source_snaphot_handler(source_snapshot_hndlr)
-        
-        if fabric_snaphot_hndlr:
-            weaver.set_fabric_snapshot_handler(fabric_snaphot_hndlr)
-        
-        if unmapped_policy_hndlr:
-            weaver.set_unmapped_policy_handler(unmapped_policy_hndlr)
-        
         match config.type:
             case PolicyWeaverConnectorType.UNITY_CATALOG:
                 src = DatabricksPolicyWeaver(config)
@@ -111,14 +100,27 @@ class WeaverAgent:
         logger.info(f"Running Policy Export for {config.type}: {config.source.name}...")
         policy_mapping = config.fabric.policy_mapping
 
-        policy_export = src.map_policy(policy_mapping)
+        policy_exports = src.map_mirror_policies(policy_mapping)
         
-        if policy_export:
-            weaver.source_snapshot_handler(policy_export)
-            if policy_mapping == "role_based":
-                await weaver.apply_role(policy_export)
-            else:
-                await weaver.apply(policy_export)
+        if policy_exports:
+            for fabric, policy_export in policy_exports:
+                weaver = WeaverAgent(config if fabric is config.fabric else config.model_copy(update={"fabric": fabric}))
+
+                if source_snapshot_hndlr:
+                    weaver.set_source_snaphot_handler(source_snapshot_hndlr)
+                
+                if fabric_snaphot_hndlr:
+                    weaver.set_fabric_snapshot_handler(fabric_snaphot_hndlr)
+                
+                if unmapped_policy_hndlr:
+                    weaver.set_unmapped_policy_handler(unmapped_policy_hndlr)
+
+                weaver.source_snapshot_handler(policy_export)
+                if policy_mapping == "role_based":
+                    await weaver.apply_role(policy_export)
+                else:
+                    await weaver.apply(policy_export)
+            src.on_sync_complete()
             logger.info("Policy Weaver Sync complete!")
         else:
             logger.info("No policies found to apply. Exiting...")
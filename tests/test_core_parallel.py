@@ -0,0 +1,45 @@
+import os
+import threading
+import unittest
+
+from policyweaver.core.parallel import fork_map
+
+
+class TestForkMap(unittest.TestCase):
+    def test_results_keep_item_order(self):
+        offset = 100
+        items = list(range(50))
+
+        self.assertEqual([i + offset for i in items], fork_map(lambda i: i + offset, items, workers=3))
+
+    def test_items_are_built_in_worker_processes(self):
+        parent = os.getpid()
+
+        pids = fork_map(lambda _: os.getpid(), list(range(8)), workers=2)
+
+        self.assertNotIn(parent, pids)
+
+    def test_builds_serially_while_other_threads_run(self):
+        parent = os.getpid()
+        release = threading.Event()
+        thread = threading.Thread(target=release.wait)
+        thread.start()
+
+        try:
+            pids = fork_map(lambda _: os.getpid(), list(range(8)), workers=2)
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertEqual({parent}, set(pids))
+
+    def test_single_worker_builds_serially(self):
+        built = []
+
+        fork_map(built.append, [1, 2, 3], workers=1)
+
+        self.assertEqual([1, 2, 3], built)
+
+
+if __name__ == "__main__":
+    unittest.main()
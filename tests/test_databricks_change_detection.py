@@ -0,0 +1,179 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from databricks.sdk.service.sql import ResultData, StatementResponse, StatementState, StatementStatus
+
+from policyweaver.core.exception import PolicyWeaverError
+from policyweaver.models.config import Source
+from policyweaver.plugins.databricks.api import DatabricksAPIClient
+from policyweaver.plugins.databricks.client import DatabricksPolicyWeaver
+from policyweaver.plugins.databricks.model import DatabricksSourceConfig, DatabricksSourceMap
+
+
+class _FakeAPIClient:
+    def __init__(self, changes=0, error=None):
+        self.changes = changes
+        self.error = error
+        self.calls = []
+
+    def get_catalog_change_count(self, catalog, since, warehouse_id):
+        self.calls.append((catalog, since, warehouse_id))
+        if self.error:
+            raise self.error
+        return self.changes
+
+    def get_workspace_policy_maps(self, sources):
+        raise AssertionError("The extraction should have been skipped.")
+
+
+class _FakeAuditLog:
+    def __init__(self):
+        self.event_times = []
+
+    def get_catalog_change_count(self, catalog, since, warehouse_id):
+        return len([t for t in self.event_times if t >= since])
+
+
+class _FakeStatementExecution:
+    def __init__(self, response):
+        self.response = response
+        self.kwargs = None
+
+    def execute_statement(self, **kwargs):
+        self.kwargs = kwargs
+        return self.response
+
+
+class _FakeWorkspaceClient:
+    def __init__(self, response):
+        self.statement_execution = _FakeStatementExecution(response)
+
+
+class TestDatabricksChangeDetection(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.watermark_file = os.path.join(self.directory.name, "watermark.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _weaver(self, api_client, change_detection=True, **databricks):
+        # Bypass __init__ to avoid SDK clients and environment requirements.
+        weaver = DatabricksPolicyWeaver.__new__(DatabricksPolicyWeaver)
+        weaver.logger = logging.getLogger("POLICY_WEAVER")
+        weaver.sync_started = None
+        weaver.synced_catalogs = []
+        weaver.api_client = api_client
+        weaver.config = DatabricksSourceMap(
+            source=Source(name="main"),
+            databricks=DatabricksSourceConfig(change_detection=change_detection, warehouse_id="wh-1",
+                                              watermark_file=self.watermark_file, **databricks))
+        return weaver
+
+    def _write_watermarks(self, watermarks):
+        with open(self.watermark_file, "w") as file:
+            json.dump(watermarks, file)
+
+    def test_disabled_always_syncs(self):
+        api_client = _FakeAPIClient()
+
+        self.assertTrue(self._weaver(api_client, change_detection=False).__has_catalog_changes__("main"))
+        self.assertEqual([], api_client.calls)
+
+    def test_first_run_without_watermark_syncs(self):
+        api_client = _FakeAPIClient()
+
+        self.assertTrue(self._weaver(api_client).__has_catalog_changes__("main"))
+        self.assertEqual([], api_client.calls)
+
+    def test_no_changes_skips_map_policy(self):
+        self._write_watermarks({"main": "2026-01-01T00:00:00+00:00"})
+        api_client = _FakeAPIClient(changes=0)
+
+        self.assertIsNone(self._weaver(api_client).map_policy())
+        self.assertEqual([("main", datetime(2026, 1, 1, tzinfo=timezone.utc), "wh-1")], api_client.calls)
+
+    def test_changes_or_failed_query_sync(self):
+        self._write_watermarks({"main": "2026-01-01T00:00:00+00:00"})
+
+        self.assertTrue(self._weaver(_FakeAPIClient(changes=3)).__has_catalog_changes__("main"))
+        self.assertTrue(self._weaver(_FakeAPIClient(error=PolicyWeaverError("denied"))).__has_catalog_changes__("main"))
+
+    def test_on_sync_complete_records_watermark(self):
+        self._write_watermarks({"other": "2026-01-01T00:00:00+00:00"})
+        weaver = self._weaver(_FakeAPIClient())
+        weaver.sync_started = datetime.now(timezone.utc)
+        weaver.synced_catalogs = ["main"]
+
+        weaver.on_sync_complete()
+
+        with open(self.watermark_file) as file:
+            watermarks = json.load(file)
+
+        self.assertEqual("2026-01-01T00:00:00+00:00", watermarks["other"])
+        self.assertEqual(weaver.sync_started - timedelta(days=1), datetime.fromisoformat(watermarks["main"]))
+
+    def test_late_audit_events_are_counted_by_the_next_run(self):
+        for lookback_minutes, expected in [(None, True), (180, True), (60, False)]:
+            databricks = {"audit_lookback_minutes": lookback_minutes} if lookback_minutes else {}
+            audit_log = _FakeAuditLog()
+            first_run = self._weaver(audit_log, **databricks)
+            first_run.sync_started = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+            first_run.synced_catalogs = ["main"]
+            first_run.on_sync_complete()
+
+            # a grant made two hours before the first run, delivered to the audit log after it
+            audit_log.event_times.append(first_run.sync_started - timedelta(hours=2))
+
+            self.assertEqual(expected, self._weaver(audit_log, **databricks).__has_catalog_changes__("main"),
+                             lookback_minutes)
+
+    def test_audit_lookback_must_not_be_negative(self):
+        config = DatabricksSourceMap(source=Source(name="main"), databricks=DatabricksSourceConfig(
+            workspace_url="https://adb", account_id="a", account_api_token="t", audit_lookback_minutes=-1))
+
+        with self.assertRaises(ValueError):
+            DatabricksPolicyWeaver(config)
+
+    def test_change_detection_requires_warehouse(self):
+        config = DatabricksSourceMap(source=Source(name="main"), databricks=DatabricksSourceConfig(
+            workspace_url="https://adb", account_id="a", account_api_token="t", change_detection=True))
+
+        with self.assertRaises(ValueError):
+            DatabricksPolicyWeaver(config)
+
+
+class TestDatabricksAuditChangeQuery(unittest.TestCase):
+    def _client(self, response):
+        # Bypass __init__ to avoid SDK clients and environment requirements.
+        client = DatabricksAPIClient.__new__(DatabricksAPIClient)
+        client.logger = logging.getLogger("POLICY_WEAVER")
+        client.workspace_client = _FakeWorkspaceClient(response)
+        return client
+
+    def test_counts_changes_with_bound_parameters(self):
+        client = self._client(StatementResponse(status=StatementStatus(state=StatementState.SUCCEEDED),
+                                                result=ResultData(data_array=[["4"]])))
+
+        changes = client.get_catalog_change_count("main", datetime(2026, 1, 1, tzinfo=timezone.utc), "wh-1")
+
+        kwargs = client.workspace_client.statement_execution.kwargs
+        self.assertEqual(4, changes)
+        self.assertEqual("wh-1", kwargs["warehouse_id"])
+        self.assertIn("system.access.audit", kwargs["statement"])
+        self.assertEqual({"catalog": "main", "catalog_prefix": "main.%", "since": "2026-01-01T00:00:00+00:00"},
+                         {p.name: p.value for p in kwargs["parameters"]})
+
+    def test_failed_query_raises(self):
+        client = self._client(StatementResponse(status=StatementStatus(state=StatementState.FAILED)))
+
+        with self.assertRaises(PolicyWeaverError):
+            client.get_catalog_change_count("main", datetime(2026, 1, 1, tzinfo=timezone.utc), "wh-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
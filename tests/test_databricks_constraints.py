@@ -0,0 +1,100 @@
+import logging
+import unittest
+
+from policyweaver.core.enum import ColumnMaskType, IamType, RowFilterType
+from policyweaver.models.export import CatalogItem
+from policyweaver.plugins.databricks.client import DatabricksPolicyWeaver
+from policyweaver.plugins.databricks.model import (
+    Catalog,
+    DatabricksColumnMask,
+    DatabricksRowFilter,
+    PrivilegeSnapshot,
+    RowFilterDetailGroup,
+    RowFilterDetails,
+    Schema,
+    Table,
+    TableObject,
+    Workspace,
+)
+
+
+def _mask(schema, table, column, mask_type, group):
+    return DatabricksColumnMask(name=f"mask_{column}", catalog_name="main", schema_name=schema, table_name=table,
+                                column_name=column, mask_type=mask_type, group_name=group)
+
+
+def _row_filter(schema, table, groups, default_value="false"):
+    return DatabricksRowFilter(name=f"rf_{table}", catalog_name="main", schema_name=schema, table_name=table,
+                               details=RowFilterDetails(
+                                   row_filter_type=RowFilterType.EXPLICIT_GROUP_MEMBERSHIP,
+                                   groups=[RowFilterDetailGroup(group_name=g, return_value=v) for g, v in groups],
+                                   default_value=default_value))
+
+
+class TestDatabricksConstraints(unittest.TestCase):
+    def setUp(self):
+        # Bypass __init__ to avoid SDK clients and environment requirements.
+        self.weaver = DatabricksPolicyWeaver.__new__(DatabricksPolicyWeaver)
+        self.weaver.logger = logging.getLogger("POLICY_WEAVER")
+        self.weaver.workspace = Workspace(catalog=Catalog(
+            name="main",
+            schemas=[Schema(name="sales", tables=[Table(name="orders"), Table(name="customers")]),
+                     Schema(name="hr", tables=[Table(name="employees")])],
+            column_masks=[
+                _mask("sales", "customers", "ssn", ColumnMaskType.UNMASK_FOR_GROUP, "admins"),
+                _mask("hr", "employees", "salary", ColumnMaskType.MASK_FOR_GROUP, "contractors"),
+                _mask("sales", "customers", "email", ColumnMaskType.MASK_FOR_GROUP, "contractors"),
+            ],
+            tables_with_masks=[
+                TableObject(catalog_name="main", schema_name="sales", table_name="customers",
+                            columns=["id", "ssn", "email"]),
+                TableObject(catalog_name="main", schema_name="hr", table_name="employees",
+                            columns=["id", "salary"]),
+            ],
+            row_filters=[
+                _row_filter("sales", "orders", [("admins", "true"), ("emea", "region = 'EMEA'")]),
+                _row_filter("hr", "employees", [("admins", "true")]),
+            ],
+        ))
+        self.weaver.snapshot = {
+            "ann@contoso.com": PrivilegeSnapshot(principal="ann@contoso.com", type=IamType.USER,
+                                                 group_membership=["contractors", "emea", "account users"]),
+            "admins": PrivilegeSnapshot(principal="admins", type=IamType.GROUP, group_membership=["account users"]),
+        }
+        self.weaver.__index_catalog__()
+
+    def _columns(self, constraints):
+        return [(c.schema_name, c.table_name, c.column_names) for c in constraints]
+
+    def _rows(self, constraints):
+        return [(c.schema_name, c.table_name, c.filter_condition) for c in constraints]
+
+    def test_catalog_item_covers_every_masked_table(self):
+        constraints = self.weaver.__get_column_constraints__([CatalogItem(catalog="main")], "ann@contoso.com")
+
+        self.assertEqual([("sales", "customers", ["id"]), ("hr", "employees", ["id"])], self._columns(constraints))
+
+    def test_masks_honour_role_assignments(self):
+        constraints = self.weaver.__get_column_constraints__(
+            [CatalogItem(catalog="main", catalog_schema="sales", table="customers")], "admins")
+
+        self.assertEqual([], constraints)
+
+    def test_unmasked_tables_have_no_column_constraints(self):
+        constraints = self.weaver.__get_column_constraints__(
+            [CatalogItem(catalog="main", catalog_schema="sales", table="orders")], "ann@contoso.com")
+
+        self.assertEqual([], constraints)
+
+    def test_row_filters_by_group(self):
+        schema_item = [CatalogItem(catalog="main", catalog_schema="sales")]
+
+        self.assertEqual([("sales", "orders", "region = 'EMEA'")],
+                         self._rows(self.weaver.__get_row_constraints__(schema_item, "ann@contoso.com")))
+        self.assertEqual([], self.weaver.__get_row_constraints__(schema_item, "admins"))
+        self.assertEqual([("sales", "orders", "region = 'EMEA'"), ("hr", "employees", "DENYALL")],
+                         self._rows(self.weaver.__get_row_constraints__([CatalogItem(catalog="main")], "ann@contoso.com")))
+
+
+if __name__ == "__main__":
+    unittest.main()
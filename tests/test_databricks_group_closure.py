@@ -0,0 +1,144 @@
+import logging
+import unittest
+
+from policyweaver.core.enum import IamType
+from policyweaver.core.graph import TransitiveClosure
+from policyweaver.plugins.databricks.api import DatabricksAPIClient
+
+
+def _user(user_id):
+    return {"$ref": f"Users/{user_id}", "value": user_id, "display": f"user {user_id}"}
+
+
+def _group_ref(group_id):
+    return {"$ref": f"Groups/{group_id}", "value": group_id, "display": f"group {group_id}"}
+
+
+def _group(group_id, members, external_id=None):
+    group = {"id": group_id, "displayName": f"group {group_id}", "members": members}
+    if external_id:
+        group["externalId"] = external_id
+    return group
+
+
+class _CountingEdges(dict):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.lookups = {}
+
+    def get(self, key, default=None):
+        self.lookups[key] = self.lookups.get(key, 0) + 1
+        return super().get(key, default)
+
+
+class TestTransitiveClosure(unittest.TestCase):
+    def test_nested_successors_precede_their_parent(self):
+        closure = TransitiveClosure({"a": ["b", "x"], "b": ["c"]})
+
+        self.assertEqual(["c", "b", "x"], closure.get("a"))
+
+    def test_cycle_terminates_and_shares_closure(self):
+        closure = TransitiveClosure({"a": ["b", "u1"], "b": ["a", "u2"]})
+
+        self.assertEqual({"a", "b", "u1", "u2"}, set(closure.get("a")))
+        self.assertEqual(set(closure.get("a")), set(closure.get("b")))
+
+    def test_shared_subgraph_is_expanded_once(self):
+        edges = _CountingEdges({"a": ["s"], "b": ["s"], "s": ["u1"]})
+
+        closure = TransitiveClosure(edges)
+        closure.get_all()
+
+        self.assertEqual(["u1", "s"], closure.get("b"))
+        self.assertEqual(2, edges.lookups["s"])
+
+    def test_non_expandable_successor_is_kept_as_leaf(self):
+        closure = TransitiveClosure({"a": ["b"], "b": ["c"]}, expand=lambda node: node != "b")
+
+        self.assertEqual(["b"], closure.get("a"))
+
+
+class TestDatabricksGroupClosure(unittest.TestCase):
+    def setUp(self):
+        # Bypass __init__ to avoid SDK clients and environment requirements.
+        self.client = DatabricksAPIClient.__new__(DatabricksAPIClient)
+        self.client.logger = logging.getLogger("POLICY_WEAVER")
+
+    def test_get_members_expands_nested_groups(self):
+        dbx_groups = {
+            "g1": _group("g1", [_group_ref("g2"), _user("u1")]),
+            "g2": _group("g2", [_user("u2")]),
+        }
+
+        members = self.client.get_members("g1", dbx_groups)
+
+        self.assertEqual(["u2", "g2", "u1"], [m["value"] for m in members])
+
+    def test_get_members_keeps_entra_group_as_leaf(self):
+        dbx_groups = {
+            "g1": _group("g1", [_group_ref("g2")]),
+            "g2": _group("g2", [_user("u2")], external_id="entra-g2"),
+        }
+
+        members = self.client.get_members("g1", dbx_groups)
+
+        self.assertEqual(["g2"], [m["value"] for m in members])
+        self.assertEqual("entra-g2", members[0]["externalId"])
+
+    def test_get_members_unknown_group_returns_empty(self):
+        with self.assertLogs("POLICY_WEAVER", level="WARNING"):
+            self.assertEqual([], self.client.get_members("missing", {}))
+
+    def test_get_members_reuses_the_member_refs_of_the_closure(self):
+        dbx_groups = {
+            "g1": _group("g1", [_group_ref("g2"), _user("u1")]),
+            "g2": _group("g2", [_user("u2")]),
+        }
+        closure = DatabricksAPIClient.get_group_closure(dbx_groups)
+        dbx_groups["g1"]["members"] = []
+
+        members = self.client.get_members("g1", dbx_groups, closure)
+
+        self.assertEqual(["u2", "g2", "u1"], [m["value"] for m in members])
+        self.assertIs(closure.member_refs["u1"], members[2])
+
+    def test_cyclic_groups_terminate(self):
+        dbx_groups = {
+            "g1": _group("g1", [_group_ref("g2"), _user("u1")]),
+            "g2": _group("g2", [_group_ref("g1"), _user("u2")]),
+        }
+
+        groups = {g.id: g for g in self.client.__get_groups__(dbx_groups)}
+
+        self.assertEqual({"g2", "u1", "u2"}, {m.id for m in groups["g1"].members})
+        self.assertEqual({"g1", "u1", "u2"}, {m.id for m in groups["g2"].members})
+
+    def test_get_members_excludes_the_group_from_a_cycle(self):
+        dbx_groups = {
+            "g1": _group("g1", [_group_ref("g2")]),
+            "g2": _group("g2", [_group_ref("g1"), _user("u2")]),
+        }
+
+        members = self.client.get_members("g1", dbx_groups)
+
+        self.assertEqual({"g2", "u2"}, {m["value"] for m in members})
+
+    def test_groups_are_deduplicated_and_typed(self):
+        dbx_groups = {
+            "g1": _group("g1", [_group_ref("g2"), _group_ref("g3"), _user("u1")]),
+            "g2": _group("g2", [_user("u1")]),
+            "g3": _group("g3", [_user("u1"), _group_ref("g2")]),
+            "g4": _group("g4", [], external_id="entra-g4"),
+        }
+
+        groups = {g.id: g for g in self.client.__get_groups__(dbx_groups)}
+
+        self.assertEqual(["u1", "g2", "g3"], [m.id for m in groups["g1"].members])
+        self.assertEqual(IamType.USER, groups["g1"].members[0].type)
+        self.assertEqual(IamType.GROUP, groups["g1"].members[1].type)
+        self.assertEqual([], groups["g4"].members)
+        self.assertEqual("entra-g4", groups["g4"].external_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from policyweaver.core.enum import IamType
+from policyweaver.plugins.databricks.model import (
+    DatabricksGroup,
+    DatabricksGroupMember,
+    DatabricksUser,
+    Workspace,
+)
+
+
+def _member(member_id, member_type=IamType.USER):
+    return DatabricksGroupMember(id=member_id, name=member_id, type=member_type)
+
+
+class TestDatabricksWorkspaceGroupMembership(unittest.TestCase):
+    def setUp(self):
+        self.workspace = Workspace(
+            users=[DatabricksUser(id="u1", email="ann@contoso.com"),
+                   DatabricksUser(id="u2", email="bob@contoso.com")],
+            service_principals=[],
+            groups=[
+                DatabricksGroup(id="g1", name="analysts",
+                                members=[_member("u1"), _member("g2", IamType.GROUP)]),
+                DatabricksGroup(id="g2", name="finance", members=[_member("u2")]),
+                DatabricksGroup(id="g3", name="everyone",
+                                members=[_member("g1", IamType.GROUP)]),
+                DatabricksGroup(id="g4", name="entra-readers", members=[], external_id="entra-4"),
+            ],
+        )
+
+    def test_direct_membership(self):
+        self.assertEqual(["everyone"], self.workspace.get_user_groups("g1"))
+        self.assertEqual([], self.workspace.get_user_groups("g3"))
+
+    def test_nested_membership_is_transitive(self):
+        self.assertEqual(["analysts", "everyone"], sorted(self.workspace.get_user_groups("u1")))
+        self.assertEqual(["analysts", "everyone", "finance"], sorted(self.workspace.get_user_groups("u2")))
+        self.assertEqual(["analysts", "everyone"], sorted(self.workspace.get_user_groups("g2")))
+
+    def test_unknown_member_has_no_groups(self):
+        self.assertEqual([], self.workspace.get_user_groups("u9"))
+
+    def test_cyclic_groups_terminate(self):
+        self.workspace.groups.append(
+            DatabricksGroup(id="g5", name="loop-a", members=[_member("g6", IamType.GROUP), _member("u1")]))
+        self.workspace.groups.append(
+            DatabricksGroup(id="g6", name="loop-b", members=[_member("g5", IamType.GROUP)]))
+
+        self.assertEqual(["analysts", "everyone", "loop-a", "loop-b"],
+                         sorted(self.workspace.get_user_groups("u1")))
+
+    def test_returned_list_is_independent_of_index(self):
+        groups = self.workspace.get_user_groups("u1")
+        groups.append("account users")
+
+        self.assertNotIn("account users", self.workspace.get_user_groups("u1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+from policyweaver.core.enum import IamType
+from policyweaver.plugins.databricks.model import (
+    DatabricksGroup,
+    DatabricksServicePrincipal,
+    DatabricksUser,
+    Workspace,
+)
+
+
+class TestDatabricksWorkspaceIdentityIndex(unittest.TestCase):
+    def setUp(self):
+        self.workspace = Workspace(
+            users=[
+                DatabricksUser(id="u1", name="Ann", email="ann@contoso.com"),
+                DatabricksUser(id="u2", name="Bob", email="bob@contoso.com"),
+                DatabricksUser(id="u3", name="Ann (dup)", email="ann@contoso.com"),
+            ],
+            service_principals=[
+                DatabricksServicePrincipal(id="s1", name="etl", application_id="app-1"),
+            ],
+            groups=[
+                DatabricksGroup(id="g1", name="analysts", members=[]),
+                DatabricksGroup(id="g2", name="engineers", members=[]),
+            ],
+        )
+
+    def test_lookups_resolve_by_each_key(self):
+        self.assertEqual("u2", self.workspace.lookup_user_by_email("bob@contoso.com").id)
+        self.assertEqual("Bob", self.workspace.lookup_user_by_id("u2").name)
+        self.assertEqual("s1", self.workspace.lookup_service_principal_by_id("app-1").id)
+        self.assertEqual("g2", self.workspace.lookup_group_by_name("engineers").id)
+        self.assertEqual("analysts", self.workspace.lookup_group_by_id("g1").name)
+
+    def test_missing_identity_returns_none(self):
+        self.assertIsNone(self.workspace.lookup_user_by_email("eve@contoso.com"))
+        self.assertIsNone(self.workspace.lookup_service_principal_by_id("app-2"))
+        self.assertIsNone(self.workspace.lookup_group_by_name("nobody"))
+
+    def test_duplicate_keys_keep_first_match(self):
+        self.assertEqual("u1", self.workspace.lookup_user_by_email("ann@contoso.com").id)
+
+    def test_index_rebuilds_when_identities_are_reassigned(self):
+        self.assertIsNone(self.workspace.lookup_group_by_name("admins"))
+
+        self.workspace.groups = self.workspace.groups + [DatabricksGroup(id="g3", name="admins", members=[])]
+
+        self.assertEqual("g3", self.workspace.lookup_group_by_name("admins").id)
+
+    def test_index_rebuilds_when_invalidated_after_in_place_edit(self):
+        self.assertEqual("analysts", self.workspace.lookup_group_by_id("g1").name)
+
+        self.workspace.groups[0] = DatabricksGroup(id="g1", name="admins", members=[])
+        self.workspace.invalidate_indexes()
+
+        self.assertEqual("admins", self.workspace.lookup_group_by_id("g1").name)
+
+    def test_lookup_object_id_uses_principal_type(self):
+        self.assertEqual("u1", self.workspace.lookup_object_id("ann@contoso.com", IamType.USER))
+        self.assertEqual("app-1", self.workspace.lookup_object_id("app-1", IamType.SERVICE_PRINCIPAL))
+        self.assertEqual("g1", self.workspace.lookup_object_id("analysts", IamType.GROUP))
+
+    def test_indexes_are_not_serialized(self):
+        self.workspace.lookup_user_by_email("ann@contoso.com")
+
+        self.assertNotIn("_indexes", self.workspace.model_dump())
+
+
+if __name__ == "__main__":
+    unittest.main()
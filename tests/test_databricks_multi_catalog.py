@@ -0,0 +1,152 @@
+import logging
+import unittest
+
+from policyweaver.core.enum import IamType
+from policyweaver.models.config import ConstraintsConfig, FabricConfig, Source
+from policyweaver.plugins.databricks.client import DatabricksPolicyWeaver
+from policyweaver.plugins.databricks.model import (
+    Catalog,
+    DatabricksCatalogMirror,
+    DatabricksGroup,
+    DatabricksGroupMember,
+    DatabricksSourceConfig,
+    DatabricksSourceMap,
+    DatabricksUser,
+    Privilege,
+    Schema,
+    Table,
+    Workspace,
+)
+
+READ = ["USE_CATALOG", "USE_SCHEMA", "SELECT"]
+
+
+def _catalog(name, privileges):
+    return Catalog(name=name, privileges=privileges,
+                   schemas=[Schema(name="sales", privileges=[], tables=[Table(name="orders", privileges=[])])],
+                   column_masks=[], tables_with_masks=[], row_filters=[], tables_with_rls=[])
+
+
+class _FakeAPIClient:
+    def __init__(self, catalogs, changes=None):
+        self.catalogs = catalogs
+        self.changes = changes or {}
+        self.sources = None
+
+    def get_catalog_change_count(self, catalog, since, warehouse_id):
+        return self.changes.get(catalog, 0)
+
+    def get_workspace_policy_maps(self, sources):
+        self.sources = sources
+        workspace = Workspace(
+            users=[DatabricksUser(id="u1", email="ann@contoso.com", external_id="entra-u1")],
+            service_principals=[],
+            groups=[DatabricksGroup(id="g1", name="readers", external_id="entra-g1",
+                                    members=[DatabricksGroupMember(id="u1", type=IamType.USER)])],
+        )
+        return None, workspace, [self.catalogs[s.name] for s in sources if s.name in self.catalogs]
+
+
+def _weaver(api_client, catalogs, **databricks):
+    # Bypass __init__ to avoid SDK clients and environment requirements.
+    weaver = DatabricksPolicyWeaver.__new__(DatabricksPolicyWeaver)
+    weaver.logger = logging.getLogger("POLICY_WEAVER")
+    weaver.connector_type = None
+    weaver.api_client = api_client
+    weaver.config = DatabricksSourceMap(
+        source=Source(name="main"), constraints=ConstraintsConfig(),
+        fabric=FabricConfig(workspace_id="ws-1", mirror_id="mirror-main"),
+        databricks=DatabricksSourceConfig(
+            catalogs=[DatabricksCatalogMirror(name=c, mirror_id=f"mirror-{c}") for c in catalogs], **databricks))
+    return weaver
+
+
+def _scopes(policy):
+    return [(ps.catalog, ps.catalog_schema, ps.table) for ps in policy.permissionscopes]
+
+
+class TestDatabricksMultiCatalog(unittest.TestCase):
+    def test_each_catalog_is_exported_to_its_own_mirror(self):
+        api_client = _FakeAPIClient({
+            "main": _catalog("main", [Privilege(principal="readers", privileges=READ)]),
+            "finance": _catalog("finance", [Privilege(principal="readers", privileges=READ),
+                                            Privilege(principal="ann@contoso.com", privileges=READ)]),
+        })
+
+        exports = _weaver(api_client, ["finance", "main"]).map_mirror_policies("role_based")
+
+        self.assertEqual(["main", "finance"], [s.name for s in api_client.sources])
+        self.assertEqual([("mirror-main", "main"), ("mirror-finance", "finance")],
+                         [(fabric.mirror_id, export.source.name) for fabric, export in exports])
+        self.assertEqual(["ws-1", "ws-1"], [fabric.workspace_id for fabric, _ in exports])
+
+        main, finance = ({p.name: p for p in export.policies} for _, export in exports)
+        self.assertEqual({"readers": [("main", "sales", "orders")]}, {n: _scopes(p) for n, p in main.items()})
+        self.assertEqual({"readers": [("finance", "sales", "orders")], "ann@contoso.com": [("finance", "sales", "orders")]},
+                         {n: _scopes(p) for n, p in finance.items()})
+
+    def test_table_policies_are_split_by_catalog(self):
+        api_client = _FakeAPIClient({
+            "main": _catalog("main", [Privilege(principal="readers", privileges=READ)]),
+            "finance": _catalog("finance", [Privilege(principal="readers", privileges=READ)]),
+        })
+
+        exports = _weaver(api_client, ["finance"]).map_mirror_policies()
+
+        self.assertEqual([{"main"}, {"finance"}], [{p.catalog for p in export.policies} for _, export in exports])
+
+    def test_map_policy_exports_the_source_catalog(self):
+        api_client = _FakeAPIClient({
+            "main": _catalog("main", [Privilege(principal="readers", privileges=READ)]),
+            "finance": _catalog("finance", [Privilege(principal="readers", privileges=READ)]),
+        })
+
+        export = _weaver(api_client, ["finance"]).map_policy()
+
+        self.assertEqual(["main"], [s.name for s in api_client.sources])
+        self.assertEqual({"main"}, {p.catalog for p in export.policies})
+
+    def test_missing_catalogs_are_not_exported(self):
+        api_client = _FakeAPIClient({"main": _catalog("main", [Privilege(principal="readers", privileges=READ)])})
+        weaver = _weaver(api_client, ["finance"])
+
+        exports = weaver.map_mirror_policies()
+
+        self.assertEqual(["mirror-main"], [fabric.mirror_id for fabric, _ in exports])
+        self.assertEqual(["main"], weaver.synced_catalogs)
+
+    def test_every_catalog_is_synced_when_one_changed(self):
+        api_client = _FakeAPIClient({
+            "main": _catalog("main", [Privilege(principal="readers", privileges=READ)]),
+            "finance": _catalog("finance", [Privilege(principal="readers", privileges=READ)]),
+        }, changes={"finance": 2})
+        weaver = _weaver(api_client, ["finance"], change_detection=True, warehouse_id="wh-1")
+        weaver.__read_watermarks__ = lambda: {"main": "2026-01-01T00:00:00+00:00",
+                                              "finance": "2026-01-01T00:00:00+00:00"}
+
+        exports = weaver.map_mirror_policies()
+
+        self.assertEqual(["main", "finance"], weaver.synced_catalogs)
+        self.assertEqual(["mirror-main", "mirror-finance"], [fabric.mirror_id for fabric, _ in exports])
+
+    def test_sync_is_skipped_when_no_catalog_changed(self):
+        api_client = _FakeAPIClient({}, changes={})
+        weaver = _weaver(api_client, ["finance"], change_detection=True, warehouse_id="wh-1")
+        weaver.__read_watermarks__ = lambda: {"main": "2026-01-01T00:00:00+00:00",
+                                              "finance": "2026-01-01T00:00:00+00:00"}
+
+        self.assertEqual([], weaver.map_mirror_policies())
+        self.assertIsNone(api_client.sources)
+        self.assertEqual([], weaver.synced_catalogs)
+
+    def test_catalogs_require_a_mirror(self):
+        config = DatabricksSourceMap(source=Source(name="main"), databricks=DatabricksSourceConfig(
+            workspace_url="https://adb", account_id="a", account_api_token="t",
+            catalogs=[DatabricksCatalogMirror(name="finance")]))
+
+        with self.assertRaises(ValueError):
+            DatabricksPolicyWeaver(config)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from policyweaver.core.enum import PermissionState, PermissionType
+from policyweaver.models.export import CatalogItem
+from policyweaver.plugins.databricks.client import DatabricksPolicyWeaver
+from policyweaver.plugins.databricks.model import Catalog, Schema, Table, Workspace
+
+
+class TestDatabricksPermissionScopes(unittest.TestCase):
+    def setUp(self):
+        # Bypass __init__ to avoid SDK clients and environment requirements.
+        self.weaver = DatabricksPolicyWeaver.__new__(DatabricksPolicyWeaver)
+        self.weaver.workspace = Workspace(catalog=Catalog(name="main", schemas=[
+            Schema(name="sales", tables=[Table(name="orders"), Table(name="customers")]),
+            Schema(name="hr", tables=[Table(name="employees")]),
+            Schema(name="empty", tables=[]),
+        ]))
+        self.weaver.__index_catalog__()
+
+    def _paths(self, scopes):
+        return [(ps.catalog, ps.catalog_schema, ps.table) for ps in scopes]
+
+    def test_catalog_expands_to_every_table(self):
+        scopes = self.weaver.__get_permission_scopes__(CatalogItem(catalog="main"))
+
+        self.assertEqual([("main", "sales", "orders"), ("main", "sales", "customers"), ("main", "hr", "employees")],
+                         self._paths(scopes))
+        self.assertTrue(all(ps.name == PermissionType.SELECT and ps.state == PermissionState.GRANT for ps in scopes))
+
+    def test_schema_expands_to_its_tables(self):
+        scopes = self.weaver.__get_permission_scopes__(CatalogItem(catalog="main", catalog_schema="hr"))
+
+        self.assertEqual([("main", "hr", "employees")], self._paths(scopes))
+        self.assertEqual((), self.weaver.__get_permission_scopes__(CatalogItem(catalog="main", catalog_schema="empty")))
+        self.assertEqual((), self.weaver.__get_permission_scopes__(CatalogItem(catalog="main", catalog_schema="missing")))
+
+    def test_table_scope(self):
+        scopes = self.weaver.__get_permission_scopes__(CatalogItem(catalog="main", catalog_schema="sales", table="orders"))
+
+        self.assertEqual([("main", "sales", "orders")], self._paths(scopes))
+
+    def test_scopes_are_shared_across_calls(self):
+        catalog_scopes = self.weaver.__get_permission_scopes__(CatalogItem(catalog="main"))
+        table_scopes = self.weaver.__get_permission_scopes__(CatalogItem(catalog="main", catalog_schema="hr", table="employees"))
+
+        self.assertIs(catalog_scopes, self.weaver.__get_permission_scopes__(CatalogItem(catalog="main")))
+        self.assertIs(table_scopes[0], catalog_scopes[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+import logging
+import random
+import unittest
+
+from policyweaver.core.enum import IamType
+from policyweaver.plugins.databricks.client import DatabricksPolicyWeaver
+from policyweaver.plugins.databricks.model import (
+    Catalog,
+    DatabricksGroup,
+    DatabricksGroupMember,
+    DatabricksServicePrincipal,
+    DatabricksUser,
+    Privilege,
+    Schema,
+    Table,
+    Workspace,
+)
+from policyweaver.plugins.databricks.privilege import PrivilegeEvaluator
+
+
+PRIVILEGES = ["SELECT", "USE_CATALOG", "USE_SCHEMA", "ALL_PRIVILEGES", "MODIFY"]
+
+
+class _ReferenceEvaluator:
+    """The per-call evaluation DatabricksPolicyWeaver used before the bitset engine."""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def get_key_set(self, key):
+        keys = key.split(".")
+        key_set = []
+
+        for i in range(0, len(keys)):
+            key_set.append(".".join(keys[0:i+1]))
+
+        return key_set
+
+    def get_user_key_permissions(self, principal, key):
+        if principal in self.snapshot and key in self.snapshot[principal].maps:
+            catalog_prereq = self.snapshot[principal].maps[key].catalog_prerequisites
+            schema_prereq = self.snapshot[principal].maps[key].schema_prerequisites
+            read_permission = self.snapshot[principal].maps[key].read_permissions
+
+            if self.snapshot[principal].maps[key].catalog_all_cascade or self.snapshot[principal].maps[key].schema_all_cascade:
+                return True, True, True
+
+            return catalog_prereq, schema_prereq, read_permission
+        else:
+            return False, False, False
+
+    def coalesce_user_group_permissions(self, principal, key):
+        catalog_prereq = False
+        schema_prereq = False
+        read_permission = False
+
+        for member_group in self.snapshot[principal].group_membership:
+            for k in self.get_key_set(key):
+                c, s, r = self.get_user_key_permissions(member_group, k)
+
+                catalog_prereq = catalog_prereq if catalog_prereq else c
+                schema_prereq = schema_prereq if schema_prereq else s
+                read_permission = read_permission if read_permission else r
+
+                if catalog_prereq and schema_prereq and read_permission:
+                    break
+
+            if catalog_prereq and schema_prereq and read_permission:
+                break
+
+        return catalog_prereq, schema_prereq, read_permission
+
+    def has_read_permissions(self, principal, key):
+        catalog_prereq, schema_prereq, read_permission = self.get_user_key_permissions(principal, key)
+
+        if not (catalog_prereq and schema_prereq and read_permission):
+            group_catalog_prereq, group_schema_prereq, group_read_permission = \
+                self.coalesce_user_group_permissions(principal, key)
+
+            catalog_prereq = catalog_prereq if catalog_prereq else group_catalog_prereq
+            schema_prereq = schema_prereq if schema_prereq else group_schema_prereq
+            read_permission = read_permission if read_permission else group_read_permission
+
+        return bool(catalog_prereq and schema_prereq and read_permission)
+
+
+def _random_privileges(rng, principals):
+    return [Privilege(principal=p, privileges=rng.sample(PRIVILEGES, rng.randint(1, 3)))
+            for p in rng.sample(principals, rng.randint(0, 4))]
+
+
+def _random_workspace(rng):
+    users = [DatabricksUser(id=f"u{i}", name=f"user {i}", email=f"user{i}@contoso.com") for i in range(12)]
+    service_principals = [
+        DatabricksServicePrincipal(id=f"s{i}", name=f"spn {i}",
+                                   application_id=f"0000000{i}-0000-0000-0000-000000000000")
+        for i in range(3)
+    ]
+    groups = []
+
+    for i in range(8):
+        members = [DatabricksGroupMember(id=u.id, name=u.name, type=IamType.USER)
+                   for u in rng.sample(users, rng.randint(0, 4))]
+        members += [DatabricksGroupMember(id=s.id, name=s.name, type=IamType.SERVICE_PRINCIPAL)
+                    for s in rng.sample(service_principals, rng.randint(0, 1))]
+        members += [DatabricksGroupMember(id=f"g{j}", name=f"group {j}", type=IamType.GROUP)
+                    for j in rng.sample(range(8), rng.randint(0, 2)) if j != i]
+        groups.append(DatabricksGroup(id=f"g{i}", name=f"group {i}", members=members))
+
+    principals = [u.email for u in users] + [s.application_id for s in service_principals] + \
+        [g.name for g in groups] + ["account users"]
+
+    # Mixed-case names exercise the lower-cased DependencyMap keys.
+    schemas = []
+    for s in range(3):
+        tables = [Table(name=f"Tbl{t}" if t == 0 else f"tbl{t}", privileges=_random_privileges(rng, principals))
+                  for t in range(3)]
+        schemas.append(Schema(name=f"sch{s}", privileges=_random_privileges(rng, principals), tables=tables))
+
+    catalog = Catalog(name="main", privileges=_random_privileges(rng, principals), schemas=schemas,
+                      column_masks=[], tables_with_masks=[], row_filters=[], tables_with_rls=[])
+
+    return Workspace(catalog=catalog, users=users, groups=groups, service_principals=service_principals)
+
+
+def _build_weaver(workspace):
+    # Bypass __init__ to avoid SDK clients and environment requirements.
+    weaver = DatabricksPolicyWeaver.__new__(DatabricksPolicyWeaver)
+    weaver.logger = logging.getLogger("POLICY_WEAVER")
+    weaver.workspace = workspace
+    weaver.snapshot = {}
+    weaver.__index_catalog__()
+
+    catalog = workspace.catalog
+    weaver.__collect_privileges__(catalog.privileges, catalog.name)
+    for schema in catalog.schemas:
+        weaver.__collect_privileges__(schema.privileges, catalog.name, schema.name)
+        for tbl in schema.tables:
+            weaver.__collect_privileges__(tbl.privileges, catalog.name, schema.name, tbl.name)
+
+    weaver.__apply_access_model__()
+
+    return weaver
+
+
+class TestDatabricksPrivilegeEvaluation(unittest.TestCase):
+    def test_matches_reference_evaluation(self):
+        rng = random.Random(7)
+
+        for _ in range(40):
+            weaver = _build_weaver(_random_workspace(rng))
+            reference = _ReferenceEvaluator(weaver.snapshot)
+            keys = weaver.__get_securable_keys__()
+
+            for principal in weaver.snapshot:
+                for key in keys:
+                    self.assertEqual(reference.has_read_permissions(principal, key),
+                                     weaver.__has_read_permissions__(principal, key),
+                                     f"{principal} on {key}")
+
+    def test_group_grant_on_catalog_is_inherited(self):
+        workspace = Workspace(
+            catalog=Catalog(name="main",
+                            privileges=[Privilege(principal="readers", privileges=["USE_CATALOG", "USE_SCHEMA", "SELECT"])],
+                            schemas=[Schema(name="sales", privileges=[], tables=[Table(name="orders", privileges=[])])]),
+            users=[DatabricksUser(id="u1", email="ann@contoso.com")],
+            service_principals=[],
+            groups=[DatabricksGroup(id="g1", name="readers",
+                                    members=[DatabricksGroupMember(id="u1", type=IamType.USER)])],
+        )
+
+        weaver = _build_weaver(workspace)
+
+        self.assertTrue(weaver.__has_read_permissions__("ann@contoso.com", "main.sales.orders"))
+        self.assertFalse(weaver.__has_read_permissions__("nobody@contoso.com", "main.sales.orders"))
+
+    def test_unknown_securable_is_evaluated(self):
+        evaluator = PrivilegeEvaluator({}, ["main"])
+
+        self.assertEqual((False, False, False), evaluator.get_permissions("ann@contoso.com", "main.other"))
+        self.assertIn("main.other", evaluator.securables)
+
+    def test_key_set(self):
+        self.assertEqual(["a", "a.b", "a.b.c"], PrivilegeEvaluator.get_key_set("a.b.c"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import random
+import unittest
+
+from policyweaver.core.enum import IamType
+from policyweaver.plugins.databricks.model import (
+    Catalog,
+    DatabricksGroup,
+    DatabricksGroupMember,
+    DatabricksUser,
+    Privilege,
+    Schema,
+    Table,
+    Workspace,
+)
+from tests.test_databricks_privilege_evaluation import _build_weaver, _random_workspace
+
+
+def _reference_read_permissions(weaver, privileges, key):
+    """The identity scan __get_read_permissions__ used before the group member index, de-duplicated."""
+    user_permissions = []
+
+    for r in privileges:
+        if any(p in weaver.dbx_read_permissions for p in r.privileges):
+            if weaver.__has_read_permissions__(r.principal, key):
+                if r.get_principal_type() == IamType.GROUP:
+                    for identity in weaver.workspace.get_workspace_identities(include_entra_groups=True):
+                        if identity in weaver.snapshot and r.principal in weaver.snapshot[identity].group_membership:
+                            if (identity, "indirect") not in user_permissions:
+                                user_permissions.append((identity, "indirect"))
+                if (r.principal, "direct") not in user_permissions:
+                    user_permissions.append((r.principal, "direct"))
+
+    return user_permissions
+
+
+class TestDatabricksReadPermissions(unittest.TestCase):
+    def test_matches_identity_scan(self):
+        rng = random.Random(11)
+
+        for _ in range(40):
+            weaver = _build_weaver(_random_workspace(rng))
+            catalog = weaver.workspace.catalog
+
+            for schema in catalog.schemas:
+                for tbl in schema.tables:
+                    privileges = catalog.privileges + schema.privileges + tbl.privileges
+                    key = f"{catalog.name}.{schema.name}.{tbl.name}"
+
+                    self.assertEqual(_reference_read_permissions(weaver, privileges, key),
+                                     weaver.__get_read_permissions__(privileges, catalog.name, schema.name, tbl.name))
+
+    def test_group_grants_are_deduplicated(self):
+        grant = ["SELECT"]
+        workspace = Workspace(
+            catalog=Catalog(name="main",
+                            privileges=[Privilege(principal="account users", privileges=["USE_CATALOG", "USE_SCHEMA"])],
+                            schemas=[Schema(name="sales", privileges=[], tables=[Table(
+                                name="orders",
+                                privileges=[Privilege(principal="readers", privileges=grant),
+                                            Privilege(principal="analysts", privileges=grant),
+                                            Privilege(principal="ann@contoso.com", privileges=grant)])])]),
+            users=[DatabricksUser(id="u1", email="ann@contoso.com"), DatabricksUser(id="u2", email="bob@contoso.com")],
+            service_principals=[],
+            groups=[
+                DatabricksGroup(id="g1", name="readers", members=[DatabricksGroupMember(id="u1", type=IamType.USER)]),
+                DatabricksGroup(id="g2", name="analysts", members=[DatabricksGroupMember(id="u1", type=IamType.USER),
+                                                                   DatabricksGroupMember(id="u2", type=IamType.USER)]),
+            ],
+        )
+
+        weaver = _build_weaver(workspace)
+        tbl = workspace.catalog.schemas[0].tables[0]
+
+        self.assertEqual([("ann@contoso.com", "indirect"), ("readers", "direct"),
+                          ("bob@contoso.com", "indirect"), ("analysts", "direct"),
+                          ("ann@contoso.com", "direct")],
+                         weaver.__get_read_permissions__(tbl.privileges, "main", "sales", "orders"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import random
+import unittest
+
+from policyweaver.core.enum import IamType
+from policyweaver.models.config import ConstraintsConfig
+from policyweaver.plugins.databricks.model import (
+    Catalog,
+    DatabricksGroup,
+    DatabricksGroupMember,
+    DatabricksServicePrincipal,
+    DatabricksSourceConfig,
+    DatabricksSourceMap,
+    DatabricksUser,
+    Privilege,
+    Schema,
+    Table,
+    Workspace,
+)
+from tests.test_databricks_privilege_evaluation import _build_weaver, _random_workspace
+
+READ = ["USE_CATALOG", "USE_SCHEMA", "SELECT"]
+
+
+def _export(weaver, workers=None):
+    weaver.config = DatabricksSourceMap(databricks=DatabricksSourceConfig(role_policy_workers=workers),
+                                        constraints=ConstraintsConfig())
+    return [p.model_dump() for p in weaver.__build_export_role_policies__()]
+
+
+class TestDatabricksRolePolicies(unittest.TestCase):
+    def test_policies_for_users_groups_and_service_principals(self):
+        app_id = "00000001-0000-0000-0000-000000000000"
+        workspace = Workspace(
+            catalog=Catalog(name="main",
+                            privileges=[Privilege(principal="readers", privileges=READ),
+                                        Privilege(principal=app_id, privileges=READ)],
+                            schemas=[Schema(name="sales", privileges=[], tables=[Table(
+                                name="orders", privileges=[Privilege(principal="ann@contoso.com", privileges=READ)])])],
+                            column_masks=[], tables_with_masks=[], row_filters=[], tables_with_rls=[]),
+            users=[DatabricksUser(id="u1", email="ann@contoso.com", external_id="entra-u1")],
+            service_principals=[DatabricksServicePrincipal(id="s1", name="readers", application_id=app_id,
+                                                           external_id="entra-s1")],
+            groups=[DatabricksGroup(id="g1", name="readers", members=[
+                DatabricksGroupMember(id="u1", type=IamType.USER),
+                DatabricksGroupMember(id="s1", type=IamType.SERVICE_PRINCIPAL)])],
+        )
+
+        policies = {p["name"]: p for p in _export(_build_weaver(workspace))}
+
+        self.assertEqual(["SPNreaders", "ann@contoso.com", "readers"], sorted(policies))
+        self.assertEqual([("entra-u1", IamType.USER), ("entra-s1", IamType.SERVICE_PRINCIPAL)],
+                         [(po["id"], po["type"]) for po in policies["readers"]["permissionobjects"]])
+        self.assertEqual(app_id, policies["SPNreaders"]["permissionobjects"][0]["app_id"])
+        self.assertEqual([("main", "sales", "orders")],
+                         [(ps["catalog"], ps["catalog_schema"], ps["table"]) for ps in policies["ann@contoso.com"]["permissionscopes"]])
+
+    def test_parallel_build_matches_serial_order(self):
+        rng = random.Random(5)
+
+        for _ in range(3):
+            weaver = _build_weaver(_random_workspace(rng))
+
+            serial = _export(weaver)
+            self.assertEqual(serial, _export(weaver, workers=2))
+
+
+if __name__ == "__main__":
+    unittest.main()
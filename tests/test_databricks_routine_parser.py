@@ -0,0 +1,109 @@
+import unittest
+from unittest.mock import patch
+
+from policyweaver.core.enum import ColumnMaskType, RowFilterType
+from policyweaver.core.tokenizer import RoutineParseError, tokenize
+from policyweaver.plugins.databricks.parser import DatabricksRoutineParser
+
+
+class TestDatabricksColumnMaskParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = DatabricksRoutineParser()
+
+    def test_unmask_for_group(self):
+        extraction = self.parser.parse_column_mask(
+            "CASE WHEN is_account_group_member('hr') THEN ssn ELSE '***-**-****' END", "ssn")
+
+        self.assertEqual("hr", extraction.group_name)
+        self.assertEqual("***-**-****", extraction.mask_pattern)
+        self.assertEqual(ColumnMaskType.UNMASK_FOR_GROUP, extraction.column_mask_type)
+
+    def test_mask_for_group_across_lines(self):
+        extraction = self.parser.parse_column_mask(
+            'CASE\n  WHEN IS_ACCOUNT_GROUP_MEMBER("contractors")\r\n  THEN \'XX XX\'\n  ELSE `email`\nEND', "email")
+
+        self.assertEqual("contractors", extraction.group_name)
+        self.assertEqual("XX XX", extraction.mask_pattern)
+        self.assertEqual(ColumnMaskType.MASK_FOR_GROUP, extraction.column_mask_type)
+
+    def test_expression_values_are_unsupported(self):
+        extraction = self.parser.parse_column_mask(
+            "CASE WHEN is_account_group_member('hr') THEN sha2(ssn, 256) ELSE '***' END", "ssn")
+
+        self.assertEqual("hr", extraction.group_name)
+        self.assertEqual(ColumnMaskType.UNSUPPORTED, extraction.column_mask_type)
+
+    def test_unexpected_format_is_unsupported(self):
+        for definition in ["ssn", "CASE WHEN current_user() = 'a' THEN ssn ELSE '*' END",
+                           "CASE WHEN is_account_group_member('hr') THEN ssn END",
+                           "CASE WHEN is_account_group_member('hr THEN ssn ELSE '*' END", None]:
+            extraction = self.parser.parse_column_mask(definition, "ssn")
+
+            self.assertEqual(ColumnMaskType.UNSUPPORTED, extraction.column_mask_type, definition)
+            self.assertIsNone(extraction.group_name)
+
+
+class TestDatabricksRowFilterParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = DatabricksRoutineParser()
+
+    def test_case_when(self):
+        details = self.parser.parse_row_filter(
+            "CASE WHEN is_account_group_member('admins') THEN true "
+            "WHEN is_account_group_member('emea') THEN region = 'EMEA' ELSE false END")
+
+        self.assertEqual(RowFilterType.EXPLICIT_GROUP_MEMBERSHIP, details.row_filter_type)
+        self.assertEqual([("admins", "true"), ("emea", "region = 'EMEA'")],
+                         [(g.group_name, g.return_value) for g in details.groups])
+        self.assertEqual("false", details.default_value)
+
+    def test_case_when_skips_non_group_branches(self):
+        details = self.parser.parse_row_filter(
+            "CASE WHEN is_account_group_member('admins') THEN true WHEN current_user() = 'x' THEN true ELSE false END")
+
+        self.assertEqual([("admins", "true")], [(g.group_name, g.return_value) for g in details.groups])
+
+    def test_if(self):
+        details = self.parser.parse_row_filter("IF(IS_ACCOUNT_GROUP_MEMBER('admins'), true, region IN ('US', 'CA'))")
+
+        self.assertEqual([("admins", "true")], [(g.group_name, g.return_value) for g in details.groups])
+        self.assertEqual("region IN ('US', 'CA')", details.default_value)
+
+    def test_unexpected_format_is_unsupported(self):
+        for definition in ["region = 'EMEA'", "IF(is_account_group_member('admins'), true)",
+                           "CASE WHEN region = 'EMEA' THEN true ELSE false END"]:
+            details = self.parser.parse_row_filter(definition)
+
+            self.assertEqual(RowFilterType.UNSUPPORTED, details.row_filter_type, definition)
+
+
+class TestDatabricksRoutineParserCache(unittest.TestCase):
+    def test_results_are_cached_and_copied(self):
+        parser = DatabricksRoutineParser()
+        definition = "IF(is_account_group_member('admins'), true, false)"
+
+        first = parser.parse_row_filter(definition)
+        first.groups.append(None)
+        second = parser.parse_row_filter(definition)
+
+        self.assertEqual(1, len(second.groups))
+        self.assertIsNot(first, second)
+
+    def test_cache_is_bounded(self):
+        parser = DatabricksRoutineParser(maxsize=2)
+        definitions = [f"IF(is_account_group_member('{g}'), true, false)" for g in ["a", "b", "a", "c", "b"]]
+
+        with patch.object(DatabricksRoutineParser, "__parse_row_filter__",
+                          autospec=True, side_effect=DatabricksRoutineParser.__parse_row_filter__) as parse:
+            for definition in definitions:
+                parser.parse_row_filter(definition)
+
+        self.assertEqual(["a", "b", "c", "b"], [c.args[1].split("'")[1] for c in parse.call_args_list])
+
+    def test_tokenize_rejects_unterminated_literal(self):
+        with self.assertRaises(RoutineParseError):
+            tokenize("'abc")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import logging
+import unittest
+
+from snowflake.connector.errors import NotSupportedError, ProgrammingError
+
+from policyweaver.models.config import Source
+from policyweaver.plugins.snowflake import api
+from policyweaver.plugins.snowflake.api import SnowflakeAPIClient
+from policyweaver.plugins.snowflake.client import SnowflakePolicyWeaver
+from policyweaver.plugins.snowflake.pool import SnowflakeConnectionPool
+
+COLUMNS = ["PRIVILEGE", "GRANTED_ON", "TABLE_CATALOG", "TABLE_SCHEMA", "NAME", "GRANTEE_NAME"]
+ROWS = [("SELECT", "TABLE", "DB", "SALES", "ORDERS", "READER"),
+        ("USAGE", "TABLE", "DB", "SALES", "ORDERS", "WRITER"),
+        ("USAGE", "SCHEMA", "DB", "SALES", "SALES", "READER"),
+        ("USAGE", "DATABASE", "DB", None, "DB", "READER"),
+        ("OWNERSHIP", "TABLE", "DB", "SALES", "ITEMS", "ADMIN")]
+
+
+class _FakeCursor:
+    def __init__(self, rows, arrow, arrow_error=NotSupportedError):
+        self.rows = list(rows)
+        self.arrow = arrow
+        self.arrow_error = arrow_error
+        self.fetches = 0
+        self.query = None
+        self.params = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, query, params=None):
+        self.query = query
+        self.params = params
+
+    def fetch_arrow_batches(self):
+        if not self.arrow:
+            raise self.arrow_error()
+        return iter([api.pyarrow.table({f"C{j}": [row[j] for row in self.rows[i:i + 2]] for j in range(len(COLUMNS))})
+                     for i in range(0, len(self.rows), 2)])
+
+    def fetchmany(self, size):
+        self.fetches += 1
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+
+class _FakeConnection:
+    def __init__(self, cursor):
+        self.cur = cursor
+
+    def cursor(self):
+        return self.cur
+
+    def is_closed(self):
+        return False
+
+
+def _client(cursor):
+    # Bypass __init__ to avoid environment requirements.
+    client = SnowflakeAPIClient.__new__(SnowflakeAPIClient)
+    client.logger = logging.getLogger("POLICY_WEAVER")
+    client.pool = SnowflakeConnectionPool(lambda: _FakeConnection(cursor), max_size=1)
+    client.sf_fetch_batch_size = 2
+    return client
+
+
+class TestSnowflakeBatchFetch(unittest.TestCase):
+    def test_rows_are_streamed_in_batches(self):
+        cursor = _FakeCursor(ROWS, arrow=False)
+
+        batches = list(_client(cursor).__run_query_batches__("SELECT", COLUMNS))
+
+        self.assertEqual(4, cursor.fetches)
+        self.assertEqual([["READER", "WRITER"], ["READER", "READER"], ["ADMIN"]], [b["GRANTEE_NAME"] for b in batches])
+
+    def test_rows_are_fetched_when_arrow_results_are_not_available(self):
+        for error in (NotSupportedError, ProgrammingError):
+            cursor = _FakeCursor(ROWS, arrow=False, arrow_error=error)
+
+            batches = list(_client(cursor).__run_query_batches__("SELECT", COLUMNS))
+
+            self.assertEqual(4, cursor.fetches, error)
+            self.assertEqual(5, sum(len(b["GRANTEE_NAME"]) for b in batches), error)
+
+    def test_grants_are_grouped_by_object_type(self):
+        grants = _client(_FakeCursor(ROWS, arrow=False)).__get_grants__(Source(name="DB"))
+
+        self.assertEqual([("DATABASE", "USAGE"), ("SCHEMA", "USAGE"), ("TABLE", "SELECT"), ("TABLE", "USAGE"),
+                          ("TABLE", "OWNERSHIP")],
+                         [(g.granted_on, g.privilege) for g in grants])
+
+    def test_privileges_are_filtered_in_the_query(self):
+        cursor = _FakeCursor([], arrow=False)
+        client = _client(cursor)
+        client.grant_privileges = SnowflakePolicyWeaver.sf_evaluated_privileges
+
+        client.__get_grants__(Source(name="DB"))
+
+        self.assertIn("PRIVILEGE in (%s, %s, %s)", cursor.query)
+        self.assertEqual(["DB", "SELECT", "OWNERSHIP", "USAGE"], cursor.params)
+
+    def test_privileges_are_not_filtered_by_default(self):
+        cursor = _FakeCursor([], arrow=False)
+
+        _client(cursor).__get_grants__(Source(name="DB"))
+
+        self.assertNotIn("PRIVILEGE in", cursor.query)
+        self.assertEqual(["DB"], cursor.params)
+
+    @unittest.skipIf(api.pyarrow is None, "pyarrow is not installed")
+    def test_arrow_batches_are_converted_column_wise(self):
+        cursor = _FakeCursor(ROWS, arrow=True)
+
+        batches = list(_client(cursor).__run_query_batches__("SELECT", COLUMNS))
+
+        self.assertEqual(0, cursor.fetches)
+        self.assertEqual([["READER", "WRITER"], ["READER", "READER"], ["ADMIN"]], [b["GRANTEE_NAME"] for b in batches])
+        self.assertEqual([["SELECT", "USAGE"], ["USAGE", "USAGE"], ["OWNERSHIP"]], [b["PRIVILEGE"] for b in batches])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import threading
+import unittest
+
+from policyweaver.plugins.snowflake.api import SnowflakeAPIClient
+from policyweaver.plugins.snowflake.pool import SnowflakeConnectionPool
+
+
+class _FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, query, params=None):
+        self.connection.queries.append(query)
+
+    def fetchall(self):
+        return [("ACCOUNTADMIN", 1)]
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.queries = []
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+
+class _Connector:
+    def __init__(self):
+        self.opened = []
+
+    def __call__(self):
+        conn = _FakeConnection()
+        self.opened.append(conn)
+        return conn
+
+
+class TestSnowflakeConnectionPool(unittest.TestCase):
+    def test_sequential_queries_share_one_connection(self):
+        connector = _Connector()
+        # Bypass __init__ to avoid environment requirements.
+        client = SnowflakeAPIClient.__new__(SnowflakeAPIClient)
+        client.pool = SnowflakeConnectionPool(connector, max_size=4)
+
+        with client:
+            for _ in range(5):
+                self.assertEqual([{"NAME": "ACCOUNTADMIN", "ID": 1}], client.__run_query__("SELECT 1", ["NAME", "ID"]))
+
+        self.assertEqual(1, len(connector.opened))
+        self.assertEqual(5, len(connector.opened[0].queries))
+        self.assertTrue(connector.opened[0].closed)
+        self.assertEqual(0, client.pool.size)
+
+    def test_concurrent_checkouts_are_bounded(self):
+        connector = _Connector()
+        pool = SnowflakeConnectionPool(connector, max_size=2)
+        barrier = threading.Barrier(2)
+        in_use = []
+
+        def work():
+            with pool.connection() as conn:
+                in_use.append(conn)
+                barrier.wait(timeout=5)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=10)
+
+        self.assertEqual(2, len(connector.opened))
+        self.assertEqual(4, len(in_use))
+        pool.close()
+
+    def test_closed_connections_are_replaced(self):
+        connector = _Connector()
+        pool = SnowflakeConnectionPool(connector, max_size=1)
+
+        with pool.connection() as conn:
+            conn.closed = True
+
+        with pool.connection() as conn:
+            self.assertFalse(conn.closed)
+
+        self.assertEqual(2, len(connector.opened))
+        self.assertEqual(1, pool.size)
+
+    def test_close_discards_checked_out_connections(self):
+        connector = _Connector()
+        pool = SnowflakeConnectionPool(connector, max_size=1)
+
+        with pool.connection() as conn:
+            pool.close()
+
+        with pool.connection() as reopened:
+            self.assertIsNot(conn, reopened)
+            self.assertFalse(reopened.closed)
+
+        self.assertTrue(conn.closed)
+        self.assertEqual(1, pool.size)
+
+    def test_close_wakes_waiting_threads(self):
+        connector = _Connector()
+        pool = SnowflakeConnectionPool(connector, max_size=1)
+        acquired = []
+
+        def work():
+            with pool.connection() as conn:
+                acquired.append(conn)
+
+        with pool.connection() as held:
+            waiter = threading.Thread(target=work)
+            waiter.start()
+            waiter.join(timeout=0.1)
+            pool.close()
+            waiter.join(timeout=5)
+
+            self.assertFalse(waiter.is_alive())
+
+        self.assertEqual(1, len(acquired))
+        self.assertIsNot(held, acquired[0])
+        self.assertTrue(held.closed)
+
+    def test_close_while_threads_wait_and_acquire(self):
+        connector = _Connector()
+        pool = SnowflakeConnectionPool(connector, max_size=2)
+        stop = threading.Event()
+        acquired = []
+
+        def wait():
+            with pool.connection() as conn:
+                acquired.append(conn)
+
+        def churn():
+            while not stop.is_set():
+                with pool.connection():
+                    pass
+
+        with pool.connection(), pool.connection():
+            waiters = [threading.Thread(target=wait, daemon=True) for _ in range(4)]
+            churners = [threading.Thread(target=churn, daemon=True) for _ in range(4)]
+            for t in waiters + churners:
+                t.start()
+            for t in waiters:
+                t.join(timeout=0.1)
+
+            pool.close()
+
+            # acquiring right after close must not take the wake up of a waiting thread
+            with pool.connection():
+                for t in waiters:
+                    t.join(timeout=5)
+
+                self.assertFalse(any(t.is_alive() for t in waiters))
+
+            stop.set()
+            for t in churners:
+                t.join(timeout=5)
+
+            self.assertFalse(any(t.is_alive() for t in churners))
+
+        pool.close()
+
+        self.assertEqual(4, len(acquired))
+        self.assertEqual(0, pool.size)
+        self.assertTrue(all(conn.closed for conn in connector.opened))
+
+    def test_pool_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            SnowflakeConnectionPool(_Connector(), max_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
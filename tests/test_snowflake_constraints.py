@@ -0,0 +1,90 @@
+import logging
+import unittest
+
+from policyweaver.core.enum import ColumnMaskType, RowFilterType
+from policyweaver.models.config import ColumnConstraintsConfig, ConstraintsConfig, RowConstraintsConfig, Source
+from policyweaver.plugins.snowflake.client import SnowflakePolicyWeaver
+from policyweaver.plugins.snowflake.model import (
+    RowFilterDetailGroup, RowFilterDetails, SnowflakeDatabaseMap, SnowflakeGrant, SnowflakeMaskingPolicy,
+    SnowflakeRole, SnowflakeRowFilter, SnowflakeSourceMap, SnowflakeTableWithPolicy
+)
+
+
+def _grant(table):
+    return SnowflakeGrant(grantee_name="ANY", granted_on="TABLE", privilege="SELECT",
+                          table_catalog="DB", table_schema="SALES", name=table)
+
+
+def _mask(table, column, mask_type, groups):
+    return SnowflakeMaskingPolicy(name=f"MASK_{column}", database_name="DB", schema_name="SALES", table_name=table,
+                                  column_name=column, column_mask_type=mask_type, group_names=groups)
+
+
+def _row_filter(table, groups, default_value="false", row_filter_type=RowFilterType.EXPLICIT_GROUP_MEMBERSHIP):
+    return SnowflakeRowFilter(name=f"RAP_{table}", database_name="DB", schema_name="SALES", table_name=table,
+                              details=RowFilterDetails(
+                                  row_filter_type=row_filter_type,
+                                  groups=[RowFilterDetailGroup(group_name=g, return_value=v) for g, v in groups],
+                                  default_value=default_value))
+
+
+def _table(table, columns=None):
+    return SnowflakeTableWithPolicy(database_name="DB", schema_name="SALES", table_name=table, column_names=columns)
+
+
+class TestSnowflakeConstraints(unittest.TestCase):
+    def setUp(self):
+        # Bypass __init__ to avoid the Snowflake connection and environment requirements.
+        self.weaver = SnowflakePolicyWeaver.__new__(SnowflakePolicyWeaver)
+        self.weaver.logger = logging.getLogger("POLICY_WEAVER")
+        self.weaver.config = SnowflakeSourceMap(
+            source=Source(name="DB"),
+            constraints=ConstraintsConfig(columns=ColumnConstraintsConfig(columnlevelsecurity=True),
+                                          rows=RowConstraintsConfig(rowlevelsecurity=True)))
+        self.weaver.map = SnowflakeDatabaseMap(
+            masking_policies=[_mask("CUSTOMERS", "SSN", ColumnMaskType.UNMASK_FOR_GROUP, ["ADMIN"]),
+                              _mask("CUSTOMERS", "EMAIL", ColumnMaskType.MASK_FOR_GROUP, ["CONTRACTOR"])],
+            tables_with_masks=[_table("CUSTOMERS", ["ID", "SSN", "EMAIL"])],
+            row_access_policies=[_row_filter("ORDERS", [("ADMIN", "true"), ("EMEA", "REGION = 'EMEA'")]),
+                                 _row_filter("RETURNS", [("ADMIN", "true")])],
+            unsupported_tables=[_table("RETURNS")])
+        self.weaver.__build_policy_index__()
+
+    def _roles(self, *names):
+        return [SnowflakeRole(name=name) for name in names]
+
+    def test_column_constraints_follow_mask_groups(self):
+        analyst = self.weaver.__get_column_constraints__(self._roles("ANALYST", "PUBLIC"), [_grant("CUSTOMERS"), _grant("ORDERS")])
+        admin = self.weaver.__get_column_constraints__(self._roles("ADMIN"), [_grant("CUSTOMERS")])
+        contractor = self.weaver.__get_column_constraints__(self._roles("ADMIN", "CONTRACTOR"), [_grant("CUSTOMERS")])
+
+        self.assertEqual([["ID", "EMAIL"]], [c.column_names for c in analyst])
+        self.assertEqual([], admin)
+        self.assertEqual([["ID", "SSN"]], [c.column_names for c in contractor])
+
+    def test_row_constraints_follow_group_membership_and_fallback(self):
+        emea = self.weaver.__get_row_constraints__(self._roles("SALES", "EMEA"),
+                                                   [_grant("ORDERS"), _grant("RETURNS"), _grant("CUSTOMERS")])
+        admin = self.weaver.__get_row_constraints__(self._roles("ADMIN", "EMEA"), [_grant("ORDERS")])
+        other = self.weaver.__get_row_constraints__(self._roles("SALES"), [_grant("ORDERS")])
+
+        self.assertEqual([("ORDERS", "REGION = 'EMEA'"), ("RETURNS", "DENYALL")],
+                         [(c.table_name, c.filter_condition) for c in emea])
+        self.assertEqual([], admin)
+        self.assertEqual(["DENYALL"], [c.filter_condition for c in other])
+
+    def test_constraints_are_shared_by_roles_with_the_same_policy_groups(self):
+        calls = []
+        compute = self.weaver.__get_table_column_constraint__
+        self.weaver.__get_table_column_constraint__ = lambda *args: calls.append(args[0]) or compute(*args)
+
+        first = self.weaver.__get_column_constraints__(self._roles("ANALYST"), [_grant("CUSTOMERS")])
+        second = self.weaver.__get_column_constraints__(self._roles("READER", "PUBLIC"), [_grant("CUSTOMERS")])
+        self.weaver.__get_column_constraints__(self._roles("ADMIN"), [_grant("CUSTOMERS")])
+
+        self.assertEqual(2, len(calls))
+        self.assertIs(first[0], second[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
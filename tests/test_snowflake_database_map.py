@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+import unittest
+
+from policyweaver.models.config import Source, SourceSchema
+from policyweaver.plugins.snowflake.api import SnowflakeAPIClient
+from policyweaver.plugins.snowflake.model import SnowflakeRole, SnowflakeUser
+from policyweaver.plugins.snowflake.parser import SnowflakePolicyParser
+from policyweaver.plugins.snowflake.pool import SnowflakeConnectionPool
+from policyweaver.plugins.snowflake.rolegraph import SnowflakeRoleGraph
+
+
+class _FakeAccountUsage:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        self.queries = []
+        self.params = []
+
+    def __call__(self, query, columns, params=None):
+        with self.lock:
+            self.queries.append(query)
+            self.params.append(params)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+        try:
+            time.sleep(self.delay)
+            return [dict(zip(columns, row)) for row in self.rows(query)]
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def batches(self, query, columns, params=None):
+        rows = self(query, columns, params)
+        if "PRIVILEGE in" in query:
+            rows = [row for row in rows if row["PRIVILEGE"] in params]
+        yield {column: [row[column] for row in rows] for column in columns}
+
+    def rows(self, query):
+        if "ACCOUNT_USAGE.USERS" in query:
+            return [(1, "ANN", "ann@contoso.com", "ann@contoso.com")]
+        if "ACCOUNT_USAGE.ROLES" in query:
+            return [(10, "ANALYST"), (11, "READER")]
+        if "GRANTS_TO_USERS" in query:
+            return [("ANALYST", "ANN")]
+        if "GRANTED_ON = 'ROLE'" in query:
+            return [("READER", "ANALYST")]
+        if "GRANTS_TO_ROLES" in query:
+            return [("USAGE", "DATABASE", "DB", None, "DB", "READER"),
+                    ("SELECT", "TABLE", "DB", "SALES", "ORDERS", "READER"),
+                    ("INSERT", "TABLE", "DB", "SALES", "ORDERS", "READER")]
+        if "ACCOUNT_USAGE.COLUMNS" in query:
+            return [("DB", "SALES", "ORDERS", "ID")]
+        if "POLICY_REFERENCES" in query:
+            return [("JOIN_POLICY", None, 3, "JP", "DB", "SALES", "ORDERS", None),
+                    ("ROW_ACCESS_POLICY", "current_role() in ('READER')", 4, "RAP", "DB", "SALES", "ORDERS", None)]
+        return []
+
+
+class TestSnowflakeDatabaseMap(unittest.TestCase):
+    def test_queries_run_concurrently_and_are_joined(self):
+        account_usage = _FakeAccountUsage()
+        # Bypass __init__ to avoid environment requirements.
+        client = SnowflakeAPIClient.__new__(SnowflakeAPIClient)
+        client.logger = logging.getLogger("POLICY_WEAVER")
+        client.policy_parser = SnowflakePolicyParser()
+        client.pool = SnowflakeConnectionPool(lambda: None, max_size=4)
+        client.__run_query__ = account_usage
+        client.__run_query_batches__ = account_usage.batches
+        client.grant_privileges = ["SELECT", "OWNERSHIP", "USAGE"]
+
+        database_map = client.__get_database_map__(Source(name="DB"))
+
+        self.assertGreater(account_usage.max_active, 1)
+        self.assertLessEqual(account_usage.max_active, 4)
+        self.assertEqual(["ANN"], [u.name for u in database_map.users])
+        self.assertEqual(["ANALYST", "READER"], [r.name for r in database_map.users[0].role_assignments])
+        self.assertEqual(["ANN"], [u.name for u in database_map.roles[1].members_user])
+        self.assertEqual(2, len(database_map.grants))
+        self.assertEqual([("DB", "SALES", "ORDERS")],
+                         [(t.database_name, t.schema_name, t.table_name) for t in database_map.unsupported_tables])
+        self.assertEqual(["RAP"], [rap.name for rap in database_map.row_access_policies])
+        self.assertEqual([["ID"]], [t.column_names for t in database_map.tables_with_raps])
+        self.assertEqual([], database_map.masking_policies)
+        self.assertEqual(1, len([q for q in account_usage.queries if "POLICY_REFERENCES" in q]))
+
+    def test_grants_are_narrowed_to_source_schemas_and_tables(self):
+        account_usage = _FakeAccountUsage(delay=0)
+        # Bypass __init__ to avoid environment requirements.
+        client = SnowflakeAPIClient.__new__(SnowflakeAPIClient)
+        client.__run_query__ = account_usage
+        client.__run_query_batches__ = account_usage.batches
+
+        client.__get_grants__(Source(name="DB", schemas=[SourceSchema(name="SALES", tables=["ORDERS"]),
+                                                         SourceSchema(name="HR")]))
+
+        query, params = account_usage.queries[0], account_usage.params[0]
+        self.assertNotIn("SALES", query)
+        self.assertEqual(["DB", "SALES", "HR", "SALES", "ORDERS", "HR"], params)
+        self.assertEqual(len(params), query.count("%s"))
+
+    def test_role_members_keep_account_order(self):
+        # Bypass __init__ to avoid environment requirements.
+        client = SnowflakeAPIClient.__new__(SnowflakeAPIClient)
+        client.users = [SnowflakeUser(name=n) for n in ["ANN", "BOB", "CAL"]]
+        client.roles = [SnowflakeRole(name=n) for n in ["ADMIN", "ANALYST", "READER"]]
+        client.role_graph = SnowflakeRoleGraph(
+            [{"NAME": "READER", "GRANTEE_NAME": "ANALYST"}, {"NAME": "READER", "GRANTEE_NAME": "ADMIN"}],
+            [{"NAME": "ANALYST", "GRANTEE_NAME": "CAL"}, {"NAME": "READER", "GRANTEE_NAME": "BOB"},
+             {"NAME": "ADMIN", "GRANTEE_NAME": "ANN"}, {"NAME": "READER", "GRANTEE_NAME": "GONE"}])
+
+        memberships = client.__get_role_memberships__()
+
+        self.assertEqual(["ANN", "BOB", "CAL"], [u.name for u in memberships["READER"].users])
+        self.assertEqual(["ADMIN", "ANALYST"], [r.name for r in memberships["READER"].roles])
+        self.assertEqual(["CAL"], [u.name for u in memberships["ANALYST"].users])
+
+
+if __name__ == "__main__":
+    unittest.main()
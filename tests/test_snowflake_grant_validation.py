@@ -0,0 +1,115 @@
+import logging
+import random
+import unittest
+
+from policyweaver.core.enum import IamType
+from policyweaver.models.export import PermissionObject
+from policyweaver.plugins.snowflake.client import SnowflakePolicyWeaver
+from policyweaver.plugins.snowflake.model import SnowflakeDatabaseMap, SnowflakeGrant, SnowflakeRole, SnowflakeUser
+
+
+def _grant(grantee, granted_on, privilege, name, schema=None, catalog="DB"):
+    return SnowflakeGrant(grantee_name=grantee, granted_on=granted_on, privilege=privilege,
+                          table_catalog=catalog, table_schema=schema, name=name)
+
+
+def _weaver(database_map):
+    # Bypass __init__ to avoid the Snowflake connection and environment requirements.
+    weaver = SnowflakePolicyWeaver.__new__(SnowflakePolicyWeaver)
+    weaver.logger = logging.getLogger("POLICY_WEAVER")
+    weaver.map = database_map
+    weaver.__build_grant_index__()
+    return weaver
+
+
+def _linear_validate_grant(database_map, grant):
+    # The previous list-scan validation, used as the reference.
+    role_user = [r for r in database_map.roles if r.name == grant.grantee_name] or \
+        [u for u in database_map.users if u.name == grant.grantee_name]
+    if not role_user:
+        return False
+    names = [grant.grantee_name] + [r.name for r in role_user[0].role_assignments]
+
+    def has(granted_on, name, privileges):
+        return any(g.grantee_name in names and g.granted_on == granted_on and g.name == name
+                   and g.privilege in privileges for g in database_map.grants)
+
+    return has("DATABASE", grant.table_catalog, ["USAGE", "OWNERSHIP"]) and \
+        has("SCHEMA", grant.table_schema, ["USAGE", "OWNERSHIP"])
+
+
+class TestSnowflakeGrantValidation(unittest.TestCase):
+    def test_privileges_are_inherited_through_role_assignments(self):
+        reader = SnowflakeRole(name="READER")
+        analyst = SnowflakeRole(name="ANALYST", role_assignments=[reader])
+        weaver = _weaver(SnowflakeDatabaseMap(
+            roles=[reader, analyst],
+            grants=[_grant("READER", "DATABASE", "USAGE", "DB"),
+                    _grant("ANALYST", "SCHEMA", "USAGE", "SALES", catalog="DB"),
+                    _grant("READER", "TABLE", "SELECT", "ORDERS", "SALES")]))
+
+        self.assertTrue(weaver.__validate_grant__(_grant("ANALYST", "TABLE", "SELECT", "ORDERS", "SALES")))
+        self.assertFalse(weaver.__validate_grant__(_grant("READER", "TABLE", "SELECT", "ORDERS", "SALES")))
+        self.assertFalse(weaver.__validate_grant__(_grant("UNKNOWN", "TABLE", "SELECT", "ORDERS", "SALES")))
+
+    def test_table_grant_only_counts_inherited_read_privileges(self):
+        reader = SnowflakeRole(name="READER")
+        analyst = SnowflakeRole(name="ANALYST", role_assignments=[reader])
+        weaver = _weaver(SnowflakeDatabaseMap(
+            roles=[reader, analyst],
+            grants=[_grant("READER", "TABLE", "SELECT", "ORDERS", "SALES"),
+                    _grant("READER", "TABLE", "INSERT", "ITEMS", "SALES"),
+                    _grant("ANALYST", "TABLE", "SELECT", "RETURNS", "SALES")]))
+
+        self.assertTrue(weaver.__validate_table_grant__(_grant(None, None, None, "ORDERS", "SALES"), analyst))
+        self.assertFalse(weaver.__validate_table_grant__(_grant(None, None, None, "ITEMS", "SALES"), analyst))
+        self.assertFalse(weaver.__validate_table_grant__(_grant(None, None, None, "RETURNS", "SALES"), analyst))
+        self.assertFalse(weaver.__validate_table_grant__(_grant(None, None, None, "ORDERS", "OTHER"), analyst))
+
+    def test_matches_linear_validation_on_random_grants(self):
+        rng = random.Random(11)
+        roles = [SnowflakeRole(name=f"ROLE_{i}") for i in range(20)]
+        for role in roles:
+            role.role_assignments = rng.sample(roles, 3)
+        users = [SnowflakeUser(name=f"USER_{i}", role_assignments=rng.sample(roles, 2)) for i in range(10)]
+        grantees = [r.name for r in roles] + [u.name for u in users] + ["GHOST"]
+        schemas = ["S1", "S2", "S3"]
+
+        grants = [_grant(rng.choice(grantees), "DATABASE", rng.choice(["USAGE", "MONITOR"]), "DB") for _ in range(15)]
+        grants += [_grant(rng.choice(grantees), "SCHEMA", rng.choice(["USAGE", "OWNERSHIP", "MODIFY"]), rng.choice(schemas))
+                   for _ in range(40)]
+        grants += [_grant(rng.choice(grantees), "TABLE", "SELECT", f"T{i}", rng.choice(schemas)) for i in range(200)]
+        database_map = SnowflakeDatabaseMap(roles=roles, users=users, grants=grants)
+        weaver = _weaver(database_map)
+
+        for grant in grants:
+            self.assertEqual(_linear_validate_grant(database_map, grant), weaver.__validate_grant__(grant))
+
+    def test_valid_grants_are_deduplicated_in_order(self):
+        reader = SnowflakeRole(name="READER")
+        weaver = _weaver(SnowflakeDatabaseMap(
+            roles=[reader],
+            grants=[_grant("READER", "DATABASE", "USAGE", "DB"),
+                    _grant("READER", "SCHEMA", "USAGE", "SALES"),
+                    _grant("READER", "TABLE", "SELECT", "ORDERS", "SALES"),
+                    _grant("READER", "TABLE", "OWNERSHIP", "ORDERS", "SALES"),
+                    _grant("READER", "TABLE", "SELECT", "ITEMS", "SALES"),
+                    _grant("READER", "TABLE", "SELECT", "ORDERS", "SALES")]))
+
+        valid_grants = weaver.__compute_valid_grants__()
+
+        self.assertEqual([("SELECT", "ORDERS"), ("OWNERSHIP", "ORDERS"), ("SELECT", "ITEMS")],
+                         [(g.privilege, g.name) for g in valid_grants])
+
+    def test_permission_objects_are_deduplicated_by_key(self):
+        objects = [PermissionObject(id="1", email="ann@contoso.com", type=IamType.USER),
+                   PermissionObject(id="2", email="bob@contoso.com", type=IamType.USER),
+                   PermissionObject(id="3", email="ann@contoso.com", type=IamType.USER)]
+
+        deduplicated = SnowflakePolicyWeaver.__deduplicate_permission_objects__(objects)
+
+        self.assertEqual(["1", "2"], [o.id for o in deduplicated])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import logging
+import threading
+import time
+import unittest
+
+from policyweaver.models.config import Source, SourceSchema
+from policyweaver.plugins.snowflake.api import SnowflakeAPIClient
+from policyweaver.plugins.snowflake.parser import SnowflakePolicyParser
+from policyweaver.plugins.snowflake.pool import SnowflakeConnectionPool
+
+
+class _FakeLiveAccount:
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        self.commands = []
+
+    def __enter__(self):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+
+    def __exit__(self, *args):
+        with self.lock:
+            self.active -= 1
+
+    def run_show(self, command):
+        with self:
+            self.commands.append(command)
+            return self.show(command)
+
+    def run_query(self, query, columns, params=None):
+        with self:
+            self.commands.append(query)
+            return [dict(zip(columns, row)) for row in self.select(query, params or [])]
+
+    def show(self, command):
+        if command == "SHOW USERS":
+            return [{"name": "ANN", "login_name": "ann@contoso.com", "email": "ann@contoso.com", "disabled": "false"},
+                    {"name": "BOB", "login_name": "bob@contoso.com", "email": "bob@contoso.com", "disabled": "true"}]
+        if command == "SHOW ROLES":
+            return [{"name": "ANALYST"}, {"name": "READER"}]
+        if command == 'SHOW GRANTS OF ROLE "READER"':
+            return [{"role": "READER", "granted_to": "ROLE", "grantee_name": "ANALYST"}]
+        if command == 'SHOW GRANTS OF ROLE "ANALYST"':
+            return [{"role": "ANALYST", "granted_to": "USER", "grantee_name": "ANN"}]
+        if command == 'SHOW TABLES IN DATABASE "DB"':
+            return [{"name": "ORDERS", "schema_name": "SALES"}, {"name": "ITEMS", "schema_name": "SALES"},
+                    {"name": "STAFF", "schema_name": "HR"}]
+        if command == 'SHOW SCHEMAS IN DATABASE "DB"':
+            return [{"name": "SALES"}, {"name": "HR"}, {"name": "INFORMATION_SCHEMA"}]
+        if command == 'SHOW GRANTS ON DATABASE "DB"':
+            return [{"privilege": "USAGE", "granted_to": "ROLE", "grantee_name": "READER"},
+                    {"privilege": "USAGE", "granted_to": "SHARE", "grantee_name": "PARTNER"}]
+        if command == 'SHOW GRANTS ON SCHEMA "DB"."SALES"':
+            return [{"privilege": "USAGE", "granted_to": "ROLE", "grantee_name": "READER"}]
+        if command == 'SHOW GRANTS ON TABLE "DB"."SALES"."ORDERS"':
+            return [{"privilege": "SELECT", "granted_to": "ROLE", "grantee_name": "READER"},
+                    {"privilege": "INSERT", "granted_to": "ROLE", "grantee_name": "WRITER"}]
+        if command == 'DESCRIBE ROW ACCESS POLICY "DB"."POLICIES"."RAP"':
+            return [{"name": "RAP", "body": "current_role() in ('READER')"}]
+        return []
+
+    def select(self, query, params):
+        if "POLICY_REFERENCES" in query and '"DB"."SALES"."ORDERS"' in params:
+            return [("ROW_ACCESS_POLICY", "DB", "POLICIES", "RAP", "DB", "SALES", "ORDERS", None),
+                    ("MASKING_POLICY", "DB", "POLICIES", "DROPPED", "DB", "SALES", "ORDERS", "ID")]
+        if "INFORMATION_SCHEMA.COLUMNS" in query:
+            return [("DB", "SALES", "ORDERS", "ID"), ("DB", "SALES", "ORDERS", "REGION")]
+        return []
+
+
+def _client(account):
+    # Bypass __init__ to avoid environment requirements.
+    client = SnowflakeAPIClient.__new__(SnowflakeAPIClient)
+    client.logger = logging.getLogger("POLICY_WEAVER")
+    client.policy_parser = SnowflakePolicyParser()
+    client.pool = SnowflakeConnectionPool(lambda: None, max_size=4)
+    client.live_mode = True
+    client.grant_privileges = ["SELECT", "OWNERSHIP", "USAGE"]
+    client.__run_show__ = account.run_show
+    client.__run_query__ = account.run_query
+    return client
+
+
+class TestSnowflakeLiveMode(unittest.TestCase):
+    def test_live_mode_reads_show_commands_concurrently(self):
+        account = _FakeLiveAccount()
+
+        database_map = _client(account).__get_database_map__(Source(name="DB", schemas=[SourceSchema(name="SALES")]))
+
+        self.assertGreater(account.max_active, 1)
+        self.assertFalse([c for c in account.commands if "ACCOUNT_USAGE" in c])
+        self.assertFalse([c for c in account.commands if '"HR"' in c])
+        self.assertEqual(["ANN"], [u.name for u in database_map.users])
+        self.assertEqual(["ANALYST", "READER"], [r.name for r in database_map.users[0].role_assignments])
+        self.assertEqual(["ANN"], [u.name for u in database_map.roles[1].members_user])
+        self.assertEqual([("DATABASE", "DB", None, "DB"), ("SCHEMA", "DB", "SALES", "SALES"),
+                          ("TABLE", "DB", "SALES", "ORDERS")],
+                         [(g.granted_on, g.table_catalog, g.table_schema, g.name) for g in database_map.grants])
+        self.assertEqual(["RAP"], [rap.name for rap in database_map.row_access_policies])
+        self.assertEqual(["READER"], [g.group_name for g in database_map.row_access_policies[0].details.groups])
+        self.assertEqual([], database_map.masking_policies)
+        self.assertEqual([["ID", "REGION"]], [t.column_names for t in database_map.tables_with_raps])
+
+    def test_missing_schemas_are_skipped(self):
+        account = _FakeLiveAccount(delay=0)
+
+        with self.assertLogs("POLICY_WEAVER", level="WARNING") as logs:
+            tables = _client(account).__get_live_tables__(
+                Source(name="DB", schemas=[SourceSchema(name="SALES", tables=["ORDERS"]), SourceSchema(name="ARCHIVE")]))
+
+        self.assertEqual({"SALES": ["ORDERS"]}, tables)
+        self.assertIn("ARCHIVE", logs.output[0])
+
+    def test_live_grants_are_filtered_by_privilege(self):
+        grants = _client(_FakeLiveAccount(delay=0)).__get_live_grants__("DB", "SALES", "ORDERS")
+
+        self.assertEqual([("SELECT", "READER")], [(g.privilege, g.grantee_name) for g in grants])
+
+
+if __name__ == "__main__":
+    unittest.main()
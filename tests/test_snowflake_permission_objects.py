@@ -0,0 +1,59 @@
+import logging
+import unittest
+
+from policyweaver.models.config import ConstraintsConfig, Source
+from policyweaver.plugins.snowflake.client import SnowflakePolicyWeaver
+from policyweaver.plugins.snowflake.model import (
+    SnowflakeDatabaseMap, SnowflakeGrant, SnowflakeRole, SnowflakeSourceMap, SnowflakeUser
+)
+
+
+def _weaver(database_map):
+    # Bypass __init__ to avoid the Snowflake connection and environment requirements.
+    weaver = SnowflakePolicyWeaver.__new__(SnowflakePolicyWeaver)
+    weaver.logger = logging.getLogger("POLICY_WEAVER")
+    weaver.config = SnowflakeSourceMap(source=Source(name="DB"), constraints=ConstraintsConfig())
+    weaver.map = database_map
+    weaver.__build_grant_index__()
+    return weaver
+
+
+class TestSnowflakePermissionObjects(unittest.TestCase):
+    def setUp(self):
+        self.ann = SnowflakeUser(id=1, name="ANN", login_name="ann@contoso.com")
+        self.bob = SnowflakeUser(id=2, name="BOB", login_name="bob@contoso.com")
+        self.reader = SnowflakeRole(name="READER", members_user=[self.ann, self.bob, self.ann])
+
+    def test_role_expansion_is_computed_once_per_role(self):
+        weaver = _weaver(SnowflakeDatabaseMap(users=[self.ann, self.bob], roles=[self.reader]))
+        weaver.valid_grants = [SnowflakeGrant(grantee_name=grantee, granted_on="TABLE", privilege="SELECT",
+                                              table_catalog="DB", table_schema="SALES", name=f"T{i}")
+                               for i in range(50) for grantee in ("READER", "ANN")]
+        built = []
+        build_permission_object = weaver.__build_permission_object__
+        weaver.__build_permission_object__ = lambda user: built.append(user.name) or build_permission_object(user)
+
+        export = weaver.__build_table_based_policy_export__()
+
+        self.assertEqual(["ANN", "BOB", "ANN"], built)
+        self.assertEqual(50, len(export.policies))
+        for policy in export.policies:
+            self.assertEqual(["ann@contoso.com", "bob@contoso.com"],
+                             [o.email for o in policy.permissions[0].objects])
+
+    def test_cached_expansion_is_not_shared_with_callers(self):
+        weaver = _weaver(SnowflakeDatabaseMap(users=[self.ann, self.bob], roles=[self.reader]))
+
+        weaver.__get_all_permission_objects__("READER").clear()
+
+        self.assertEqual(2, len(weaver.__get_all_permission_objects__("READER")))
+
+    def test_unknown_grantee_raises(self):
+        weaver = _weaver(SnowflakeDatabaseMap(users=[self.ann], roles=[self.reader]))
+
+        with self.assertRaises(ValueError):
+            weaver.__get_all_permission_objects__("GHOST")
+
+
+if __name__ == "__main__":
+    unittest.main()
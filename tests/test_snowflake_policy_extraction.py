@@ -0,0 +1,102 @@
+import logging
+import unittest
+
+from policyweaver.core.enum import ColumnMaskType, RowFilterType
+from policyweaver.models.config import Source, SourceSchema
+from policyweaver.plugins.snowflake.api import SnowflakeAPIClient
+from policyweaver.plugins.snowflake.parser import SnowflakePolicyParser
+
+MASK_BODY = "CASE WHEN CURRENT_ROLE() IN ('HR') THEN val ELSE '***' END"
+RAP_BODY = "current_role() in ('SALES')"
+POLICY_COLUMNS = ["POLICY_KIND", "POLICY_BODY", "POLICY_ID", "POLICY_NAME", "ref_database_name",
+                  "ref_schema_name", "ref_entity_name", "ref_column_name"]
+
+
+def _ref(kind, body, policy_id, name, schema, table, column=None):
+    return dict(zip(POLICY_COLUMNS, [kind, body, policy_id, name, "DB", schema, table, column]))
+
+
+class _FakeQueries:
+    def __init__(self, columns):
+        self.columns = columns
+        self.queries = []
+        self.params = []
+
+    def __call__(self, query, columns, params=None):
+        self.queries.append(query)
+        self.params.append(params)
+
+        if "ACCOUNT_USAGE.COLUMNS" in query:
+            return [dict(zip(columns, row)) for row in self.columns]
+        return []
+
+
+def _client(queries):
+    # Bypass __init__ to avoid environment requirements.
+    client = SnowflakeAPIClient.__new__(SnowflakeAPIClient)
+    client.logger = logging.getLogger("POLICY_WEAVER")
+    client.policy_parser = SnowflakePolicyParser()
+    client.__run_query__ = queries
+    return client
+
+
+class TestSnowflakePolicyExtraction(unittest.TestCase):
+    def test_columns_are_fetched_once_per_database(self):
+        queries = _FakeQueries(
+            columns=[("DB", "HR", "CONTRACTORS", "ID"), ("DB", "HR", "CONTRACTORS", "SSN"),
+                     ("DB", "HR", "EMPLOYEES", "ID"), ("DB", "HR", "EMPLOYEES", "SSN"),
+                     ("DB", "HR", "EMPLOYEES", "SALARY"), ("DB", "HR", "OTHER", "ID")])
+        client = _client(queries)
+
+        client.__get_column_masks__([_ref("MASKING_POLICY", MASK_BODY, 1, "MASK_SSN", "HR", "EMPLOYEES", "SSN"),
+                                     _ref("MASKING_POLICY", MASK_BODY, 1, "MASK_SSN", "HR", "EMPLOYEES", "SALARY"),
+                                     _ref("MASKING_POLICY", MASK_BODY, 1, "MASK_SSN", "HR", "CONTRACTORS", "SSN")])
+        client.__get_row_access_policies__([_ref("ROW_ACCESS_POLICY", RAP_BODY, 2, "RAP_SALES", "HR", "EMPLOYEES")])
+        client.__get_tables_with_policies__()
+
+        self.assertEqual(1, len([q for q in queries.queries if "ACCOUNT_USAGE.COLUMNS" in q]))
+        self.assertEqual([("EMPLOYEES", ["ID", "SSN", "SALARY"]), ("CONTRACTORS", ["ID", "SSN"])],
+                         [(t.table_name, t.column_names) for t in client.tables_with_masks])
+        self.assertEqual([("EMPLOYEES", ["ID", "SSN", "SALARY"])],
+                         [(t.table_name, t.column_names) for t in client.tables_with_raps])
+        self.assertEqual(3, len(client.masking_policies))
+        self.assertEqual(ColumnMaskType.UNMASK_FOR_GROUP, client.masking_policies[0].column_mask_type)
+        self.assertEqual(RowFilterType.EXPLICIT_GROUP_MEMBERSHIP, client.row_access_policies[0].details.row_filter_type)
+
+    def test_no_policies_issue_no_columns_query(self):
+        queries = _FakeQueries(columns=[])
+        client = _client(queries)
+
+        client.__get_column_masks__([])
+        client.__get_row_access_policies__([])
+        client.__get_tables_with_policies__()
+
+        self.assertFalse([q for q in queries.queries if "ACCOUNT_USAGE.COLUMNS" in q])
+        self.assertEqual([], client.tables_with_masks)
+        self.assertEqual([], client.tables_with_raps)
+
+    def test_table_names_are_bound(self):
+        queries = _FakeQueries(columns=[])
+        client = _client(queries)
+
+        client.__get_table_columns__([("DB", "HR", "O'BRIEN")])
+
+        self.assertNotIn("O'BRIEN", queries.queries[0])
+        self.assertEqual(["DB", "HR", "O'BRIEN"], queries.params[0])
+        self.assertEqual(3, queries.queries[0].count("%s"))
+
+    def test_policy_references_are_narrowed_to_source_schemas(self):
+        queries = _FakeQueries(columns=[])
+        client = _client(queries)
+        client.sf_unsupported_policy_kinds = []
+
+        client.__get_policy_references__(Source(name="db", schemas=[SourceSchema(name="HR", tables=["STAFF", "PAY"]),
+                                                                    SourceSchema(name="SALES")]))
+
+        self.assertNotIn("SALES", queries.queries[0])
+        self.assertEqual(["MASKING_POLICY", "ROW_ACCESS_POLICY", "DB", "HR", "STAFF", "PAY", "SALES"], queries.params[0])
+        self.assertEqual(len(queries.params[0]), queries.queries[0].count("%s"))
+
+
+if __name__ == "__main__":
+    unittest.main()
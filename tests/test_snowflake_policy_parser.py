@@ -0,0 +1,141 @@
+import unittest
+from unittest.mock import patch
+
+from policyweaver.core.enum import ColumnMaskType, RowFilterType
+from policyweaver.plugins.snowflake.parser import SnowflakePolicyParser
+
+
+class TestSnowflakeMaskingPolicyParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = SnowflakePolicyParser()
+
+    def test_unmask_for_roles(self):
+        extraction = self.parser.parse_masking_policy(
+            "CASE WHEN CURRENT_ROLE() IN ('HR', 'AUDIT') THEN val ELSE '***-**-****' END")
+
+        self.assertEqual(["HR", "AUDIT"], extraction.group_names)
+        self.assertEqual("***-**-****", extraction.mask_pattern)
+        self.assertEqual(ColumnMaskType.UNMASK_FOR_GROUP, extraction.column_mask_type)
+
+    def test_mask_for_role_across_lines(self):
+        extraction = self.parser.parse_masking_policy(
+            "case\n  when current_role() = 'CONTRACTOR'\r\n  then 'XX XX'\n  else \"VAL\"\nend")
+
+        self.assertEqual(["CONTRACTOR"], extraction.group_names)
+        self.assertEqual("XX XX", extraction.mask_pattern)
+        self.assertEqual(ColumnMaskType.MASK_FOR_GROUP, extraction.column_mask_type)
+
+    def test_null_mask_unmasks_for_roles(self):
+        extraction = self.parser.parse_masking_policy(
+            "CASE WHEN CURRENT_ROLE() IN ('FINANCE') THEN val ELSE NULL END")
+
+        self.assertEqual(["FINANCE"], extraction.group_names)
+        self.assertEqual("NULL", extraction.mask_pattern)
+        self.assertEqual(ColumnMaskType.UNMASK_FOR_GROUP, extraction.column_mask_type)
+
+    def test_literal_masks_are_not_columns(self):
+        for mask in ["null", "0", "-1", "1.5", "FALSE"]:
+            extraction = self.parser.parse_masking_policy(
+                f"CASE WHEN CURRENT_ROLE() IN ('HR') THEN {mask} ELSE val END")
+
+            self.assertEqual(mask, extraction.mask_pattern)
+            self.assertEqual(ColumnMaskType.MASK_FOR_GROUP, extraction.column_mask_type, mask)
+
+    def test_column_in_both_branches_is_unsupported(self):
+        extraction = self.parser.parse_masking_policy(
+            "CASE WHEN CURRENT_ROLE() IN ('HR') THEN val ELSE val END")
+
+        self.assertEqual(ColumnMaskType.UNSUPPORTED, extraction.column_mask_type)
+
+    def test_expression_values_are_unsupported(self):
+        extraction = self.parser.parse_masking_policy(
+            "CASE WHEN CURRENT_ROLE() IN ('HR') THEN sha2(val) ELSE '***' END")
+
+        self.assertEqual(["HR"], extraction.group_names)
+        self.assertEqual(ColumnMaskType.UNSUPPORTED, extraction.column_mask_type)
+
+    def test_unexpected_format_is_unsupported(self):
+        for body in ["val", "CASE WHEN CURRENT_USER() = 'A' THEN val ELSE '*' END",
+                     "CASE WHEN CURRENT_ROLE() IN ('HR') THEN val END",
+                     "CASE WHEN CURRENT_ROLE() IN (HR) THEN val ELSE '*' END",
+                     "CASE WHEN CURRENT_ROLE() IN ('HR THEN val ELSE '*' END", None]:
+            extraction = self.parser.parse_masking_policy(body)
+
+            self.assertEqual(ColumnMaskType.UNSUPPORTED, extraction.column_mask_type, body)
+            self.assertIsNone(extraction.group_names)
+
+
+class TestSnowflakeRowAccessPolicyParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = SnowflakePolicyParser()
+
+    def test_role_list(self):
+        details = self.parser.parse_row_access_policy("current_role() in ('READER', 'WRITER')")
+
+        self.assertEqual(RowFilterType.EXPLICIT_GROUP_MEMBERSHIP, details.row_filter_type)
+        self.assertEqual([("READER", "true"), ("WRITER", "true")],
+                         [(g.group_name, g.return_value) for g in details.groups])
+        self.assertEqual("false", details.default_value)
+
+    def test_role_equality(self):
+        details = self.parser.parse_row_access_policy("CURRENT_ROLE() = ('ADMIN')")
+
+        self.assertEqual([("ADMIN", "true")], [(g.group_name, g.return_value) for g in details.groups])
+
+    def test_case_when(self):
+        details = self.parser.parse_row_access_policy(
+            "CASE WHEN current_role() IN ('ADMIN', 'OWNER') THEN TRUE\n"
+            "     WHEN current_role() = 'EMEA' THEN region = 'EMEA'\n"
+            "     WHEN current_user() = 'X' THEN true ELSE FALSE END")
+
+        self.assertEqual([("ADMIN", "true"), ("OWNER", "true"), ("EMEA", "region = 'EMEA'")],
+                         [(g.group_name, g.return_value) for g in details.groups])
+        self.assertEqual("false", details.default_value)
+
+    def test_unexpected_format_is_unsupported(self):
+        for body in ["region = 'EMEA'", "current_role() in ('READER') and region = 'EMEA'",
+                     "CASE WHEN region = 'EMEA' THEN true ELSE false END",
+                     "CASE WHEN current_role() in ('READER') THEN true END"]:
+            details = self.parser.parse_row_access_policy(body)
+
+            self.assertEqual(RowFilterType.UNSUPPORTED, details.row_filter_type, body)
+
+
+class TestSnowflakePolicyParserCache(unittest.TestCase):
+    def test_results_are_cached_and_copied(self):
+        parser = SnowflakePolicyParser()
+        body = "current_role() in ('READER')"
+
+        first = parser.parse_row_access_policy(body, 1)
+        first.groups.append(None)
+        second = parser.parse_row_access_policy(body, 1)
+
+        self.assertEqual(1, len(second.groups))
+        self.assertIsNot(first, second)
+
+    def test_policies_are_parsed_once_per_id_and_body(self):
+        parser = SnowflakePolicyParser()
+        references = [(1, "current_role() in ('A')"), (1, "current_role() in ('A')"),
+                      (2, "current_role() in ('A')"), (1, "current_role() in ('B')")]
+
+        with patch.object(SnowflakePolicyParser, "__parse_row_access_policy__", autospec=True,
+                          side_effect=SnowflakePolicyParser.__parse_row_access_policy__) as parse:
+            for policy_id, body in references:
+                parser.parse_row_access_policy(body, policy_id)
+
+        self.assertEqual(3, parse.call_count)
+
+    def test_cache_is_bounded(self):
+        parser = SnowflakePolicyParser(maxsize=2)
+        bodies = [f"CASE WHEN CURRENT_ROLE() IN ('{r}') THEN val ELSE '*' END" for r in ["A", "B", "A", "C", "B"]]
+
+        with patch.object(SnowflakePolicyParser, "__parse_masking_policy__", autospec=True,
+                          side_effect=SnowflakePolicyParser.__parse_masking_policy__) as parse:
+            for body in bodies:
+                parser.parse_masking_policy(body)
+
+        self.assertEqual(["A", "B", "C", "B"], [c.args[1].split("'")[1] for c in parse.call_args_list])
+
+
+if __name__ == "__main__":
+    unittest.main()
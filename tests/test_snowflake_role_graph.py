@@ -0,0 +1,70 @@
+import random
+import unittest
+
+from policyweaver.plugins.snowflake.rolegraph import SnowflakeRoleGraph
+
+
+def _grant(role, grantee):
+    return {"NAME": role, "GRANTEE_NAME": grantee}
+
+
+def _recursive_members(role_assignments, user_assignments, role_name):
+    # The original recursive expansion, used as the reference on acyclic graphs.
+    users = [a["GRANTEE_NAME"] for a in user_assignments if a["NAME"] == role_name]
+    roles = [a["GRANTEE_NAME"] for a in role_assignments if a["NAME"] == role_name]
+
+    for role in list(roles):
+        member_users, member_roles = _recursive_members(role_assignments, user_assignments, role)
+        users.extend(member_users)
+        roles.extend(member_roles)
+
+    return users, roles
+
+
+class TestSnowflakeRoleGraph(unittest.TestCase):
+    def test_matches_recursive_expansion_on_random_hierarchies(self):
+        rng = random.Random(7)
+        roles = [f"ROLE_{i}" for i in range(30)]
+        # Roles are only granted to roles with a higher index, so the hierarchy is acyclic.
+        role_assignments = [_grant(roles[i], roles[j]) for i in range(30) for j in range(i + 1, 30) if rng.random() < 0.1]
+        user_assignments = [_grant(rng.choice(roles), f"USER_{u}") for u in range(40)]
+
+        graph = SnowflakeRoleGraph(role_assignments, user_assignments)
+
+        for role in roles:
+            users, member_roles = _recursive_members(role_assignments, user_assignments, role)
+            self.assertEqual(set(users), set(graph.get_member_users(role)))
+            self.assertEqual(set(member_roles), set(graph.get_member_roles(role)))
+
+    def test_cyclic_grants_terminate(self):
+        graph = SnowflakeRoleGraph([_grant("A", "B"), _grant("B", "C"), _grant("C", "A")], [_grant("C", "ann")])
+
+        self.assertEqual({"B", "C"}, set(graph.get_member_roles("A")))
+        self.assertEqual(["ann"], graph.get_member_users("A"))
+        self.assertEqual({"A", "B"}, set(graph.get_inherited_roles("C")))
+
+    def test_shared_parent_is_reported_once(self):
+        # READER is granted to ANALYST and ENGINEER, both of which are granted to LEAD.
+        graph = SnowflakeRoleGraph(
+            [_grant("READER", "ANALYST"), _grant("READER", "ENGINEER"),
+             _grant("ANALYST", "LEAD"), _grant("ENGINEER", "LEAD")],
+            [_grant("LEAD", "ann"), _grant("ANALYST", "ann")])
+
+        self.assertEqual(["ANALYST", "ENGINEER", "LEAD"], sorted(graph.get_member_roles("READER")))
+        self.assertEqual(["ann"], graph.get_member_users("READER"))
+        self.assertEqual(["READER"], graph.get_inherited_roles("ANALYST"))
+
+    def test_user_roles_include_inherited_roles(self):
+        graph = SnowflakeRoleGraph([_grant("READER", "ANALYST"), _grant("PUBLIC", "READER")],
+                                   [_grant("ANALYST", "ann"), _grant("READER", "ann")])
+
+        roles = graph.get_user_roles("ann")
+
+        self.assertEqual(["ANALYST", "READER"], roles[:2])
+        self.assertEqual({"ANALYST", "READER", "PUBLIC"}, set(roles))
+        self.assertEqual(len(roles), len(set(roles)))
+        self.assertEqual([], graph.get_user_roles("bob"))
+
+
+if __name__ == "__main__":
+    unittest.main()
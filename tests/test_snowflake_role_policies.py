@@ -0,0 +1,92 @@
+import logging
+import random
+import unittest
+
+from policyweaver.core.enum import ColumnMaskType, RowFilterType
+from policyweaver.models.config import ColumnConstraintsConfig, ConstraintsConfig, RowConstraintsConfig, Source
+from policyweaver.plugins.snowflake.client import SnowflakePolicyWeaver
+from policyweaver.plugins.snowflake.model import (
+    RowFilterDetailGroup, RowFilterDetails, SnowflakeDatabaseMap, SnowflakeGrant, SnowflakeMaskingPolicy,
+    SnowflakeRole, SnowflakeRowFilter, SnowflakeSourceConfig, SnowflakeSourceMap, SnowflakeTableWithPolicy,
+    SnowflakeUser
+)
+
+
+def _grant(grantee, table):
+    return SnowflakeGrant(grantee_name=grantee, granted_on="TABLE", privilege="SELECT",
+                          table_catalog="DB", table_schema="SALES", name=table)
+
+
+def _random_map(rng):
+    tables = [f"T{i}" for i in range(8)]
+    users = [SnowflakeUser(id=i, name=f"U{i}", login_name=f"u{i}@contoso.com") for i in range(12)]
+    roles = [SnowflakeRole(name=f"R{i}", members_user=rng.sample(users, 3)) for i in range(10)]
+    for role in roles:
+        role.role_assignments = rng.sample([r for r in roles if r is not role], 2)
+
+    return SnowflakeDatabaseMap(
+        users=users,
+        roles=roles,
+        masking_policies=[SnowflakeMaskingPolicy(name=f"MASK_{t}", database_name="DB", schema_name="SALES",
+                                                 table_name=t, column_name="SSN",
+                                                 column_mask_type=ColumnMaskType.UNMASK_FOR_GROUP,
+                                                 group_names=[rng.choice(roles).name])
+                          for t in tables[:4]],
+        tables_with_masks=[SnowflakeTableWithPolicy(database_name="DB", schema_name="SALES", table_name=t,
+                                                    column_names=["ID", "SSN"]) for t in tables[:4]],
+        row_access_policies=[SnowflakeRowFilter(name=f"RAP_{t}", database_name="DB", schema_name="SALES", table_name=t,
+                                                details=RowFilterDetails(
+                                                    row_filter_type=RowFilterType.EXPLICIT_GROUP_MEMBERSHIP,
+                                                    groups=[RowFilterDetailGroup(group_name=rng.choice(roles).name,
+                                                                                 return_value="REGION = 'EMEA'")],
+                                                    default_value="false"))
+                             for t in tables[2:6]],
+        unsupported_tables=[],
+    ), [_grant(rng.choice(roles + users).name, rng.choice(tables)) for _ in range(60)]
+
+
+def _weaver(database_map, valid_grants, workers=None):
+    # Bypass __init__ to avoid the Snowflake connection and environment requirements.
+    weaver = SnowflakePolicyWeaver.__new__(SnowflakePolicyWeaver)
+    weaver.logger = logging.getLogger("POLICY_WEAVER")
+    weaver.config = SnowflakeSourceMap(
+        source=Source(name="DB"),
+        snowflake=SnowflakeSourceConfig(role_policy_workers=workers),
+        constraints=ConstraintsConfig(columns=ColumnConstraintsConfig(columnlevelsecurity=True),
+                                      rows=RowConstraintsConfig(rowlevelsecurity=True)))
+    weaver.map = database_map
+    weaver.__build_grant_index__()
+    weaver.__build_policy_index__()
+    weaver.valid_grants = valid_grants
+    return weaver
+
+
+def _export(weaver):
+    return [p.model_dump() for p in weaver.__build_role_based_policy_export__().policies]
+
+
+class TestSnowflakeRolePolicies(unittest.TestCase):
+    def test_policies_follow_the_first_grant_of_each_role(self):
+        ann = SnowflakeUser(id=1, name="ANN", login_name="ann@contoso.com")
+        database_map = SnowflakeDatabaseMap(users=[ann], roles=[SnowflakeRole(name="WRITER", members_user=[ann]),
+                                                                SnowflakeRole(name="READER", members_user=[ann])])
+
+        policies = _export(_weaver(database_map, [_grant("READER", "ORDERS"), _grant("ANN", "ORDERS"),
+                                                  _grant("WRITER", "ORDERS"), _grant("READER", "RETURNS")]))
+
+        self.assertEqual(["READER", "WRITER"], [p["name"] for p in policies])
+        self.assertEqual(["ORDERS", "RETURNS"], [ps["table"] for ps in policies[0]["permissionscopes"]])
+
+    def test_parallel_build_matches_serial_order(self):
+        rng = random.Random(7)
+
+        for _ in range(3):
+            database_map, valid_grants = _random_map(rng)
+
+            serial = _export(_weaver(database_map, valid_grants))
+            self.assertTrue(serial)
+            self.assertEqual(serial, _export(_weaver(database_map, valid_grants, workers=2)))
+
+
+if __name__ == "__main__":
+    unittest.main()